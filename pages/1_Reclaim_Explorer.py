@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import gzip
+import tempfile
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import streamlit as st
+
+from ramp_data import (
+    ALL,
+    CURRENCY_COLUMN,
+    db_file_version,
+    filter_clause,
+    get_connection_pool,
+    get_db_path,
+    load_filter_options,
+    query_arrow,
+    render_trace,
+    traced_cache_data,
+)
+
+PAGES_TABLE = "analytics.mart_reclaim_candidate_pages"
+# Sort option label -> key column of mart_reclaim_candidate_pages numbering that order.
+SORT_KEYS = {
+    "Organization / app / user": "row_key",
+    "Potential savings (highest first)": "potential_savings_key",
+    "Inactivity (never used, then longest)": "inactivity_days_key",
+}
+PAGE_SIZES = [50, 100, 500]
+PAGE_COLUMNS = [
+    "org_name",
+    "app_name",
+    "category",
+    "email",
+    "department",
+    "status",
+    "last_activity_at",
+    "inactivity_days",
+    "inactivity_reason",
+    "potential_savings",
+]
+EXPORT_COLUMNS = ["org_id", "app_id", "user_id"] + PAGE_COLUMNS
+EXPORT_BATCH_ROWS = 100_000
+EXPORT_FILE_NAME = "reclaim_candidates.csv.gz"
+FIRST_PAGE = ("after", 0)
+
+
+@traced_cache_data(ttl=300, max_entries=256)
+def load_page(
+    db_path: Path,
+    db_version: tuple[int, int, int],
+    sort_key: str,
+    org: str,
+    app: str,
+    category: str,
+    cursor: tuple[str, int],
+    page_size: int,
+) -> pa.Table:
+    """Up to page_size + 1 rows after (or before) a sort_key value, in sort_key order.
+
+    The key comes back as `page_key`. The extra row only tells the caller whether
+    another page exists in that direction.
+    """
+    direction, key = cursor
+    comparison, order = (">", "asc") if direction == "after" else ("<", "desc")
+    where, params = filter_clause(org, app, category, [f"{sort_key} {comparison} ?"], [key])
+    return query_arrow(
+        db_path,
+        f"""
+        select {sort_key} as page_key, {", ".join(PAGE_COLUMNS)}
+        from {PAGES_TABLE}
+        {where}
+        order by {sort_key} {order}
+        limit ?
+        """,
+        params + [page_size + 1],
+    )
+
+
+@traced_cache_data(ttl=300, max_entries=64)
+def load_totals(
+    db_path: Path, db_version: tuple[int, int, int], org: str, app: str, category: str
+) -> tuple[int, float]:
+    where, params = filter_clause(org, app, category)
+    with get_connection_pool(db_path).cursor() as cursor:
+        candidates, savings = cursor.execute(
+            f"select count(*), sum(potential_savings) from {PAGES_TABLE} {where}", params
+        ).fetchone()
+    return candidates, savings or 0.0
+
+
+def session_export_dir() -> Path:
+    """This session's scratch directory for exports.
+
+    It is removed when the TemporaryDirectory is garbage-collected, i.e. once Streamlit
+    drops the session state of a closed or abandoned session.
+    """
+    if "reclaim_export_dir" not in st.session_state:
+        st.session_state.reclaim_export_dir = tempfile.TemporaryDirectory(
+            prefix="reclaim_export_"
+        )
+    return Path(st.session_state.reclaim_export_dir.name)
+
+
+def export_csv(
+    db_path: Path, export_dir: Path, sort_key: str, org: str, app: str, category: str
+) -> Path:
+    """Write every matching candidate to a gzipped CSV in sort_key order.
+
+    Rows stream out EXPORT_BATCH_ROWS at a time. Each key is unique, so the order is
+    fully determined. The file replaces this session's previous export.
+    """
+    where, params = filter_clause(org, app, category)
+    path = export_dir / EXPORT_FILE_NAME
+    with get_connection_pool(db_path).cursor() as cursor, gzip.open(path, "wb") as sink:
+        reader = cursor.execute(
+            f"select {', '.join(EXPORT_COLUMNS)} from {PAGES_TABLE} {where} order by {sort_key}",
+            params,
+        ).fetch_record_batch(EXPORT_BATCH_ROWS)
+        with pa_csv.CSVWriter(sink, reader.schema) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+    return path
+
+
+def render_explorer() -> None:
+    st.set_page_config(page_title="Reclaim Explorer", layout="wide")
+    st.title("Reclaim Candidate Explorer")
+
+    db_path = get_db_path()
+    if not db_path.exists():
+        st.error(
+            f"DuckDB file not found: {db_path}. "
+            "Run dbt to build models or set RAMP_DUCKDB_PATH."
+        )
+        return
+
+    db_version = db_file_version(db_path)
+    try:
+        filter_options = load_filter_options(db_path, db_version)
+    except (duckdb.Error, OSError) as exc:  # pragma: no cover - surface to UI
+        st.error(f"Failed to load data: {exc}")
+        return
+
+    st.sidebar.header("Filters")
+    selected_org = st.sidebar.selectbox("Organization", [ALL] + filter_options["org_name"])
+    selected_app = st.sidebar.selectbox("Application", [ALL] + filter_options["app_name"])
+    selected_category = st.sidebar.selectbox("Category", [ALL] + filter_options["category"])
+    sort_label = st.sidebar.selectbox("Sort by", list(SORT_KEYS))
+    page_size = st.sidebar.selectbox("Rows per page", PAGE_SIZES)
+    sort_key = SORT_KEYS[sort_label]
+    filters = (selected_org, selected_app, selected_category)
+
+    # Any change to the query (or a new build) starts again from the first page.
+    query = (db_version, sort_key, filters, page_size)
+    if st.session_state.get("reclaim_query") != query:
+        st.session_state.reclaim_query = query
+        st.session_state.reclaim_cursor = FIRST_PAGE
+        stale_export = st.session_state.pop("reclaim_export", None)
+        if stale_export is not None:
+            stale_export.unlink(missing_ok=True)
+    cursor = st.session_state.reclaim_cursor
+
+    try:
+        candidates, savings = load_totals(db_path, db_version, *filters)
+        page = load_page(db_path, db_version, sort_key, *filters, cursor, page_size)
+    except (duckdb.Error, OSError) as exc:  # pragma: no cover - surface to UI
+        st.error(f"Failed to load data: {exc}")
+        return
+
+    more = page.num_rows > page_size
+    page = page.slice(0, page_size)
+    if cursor[0] == "before":
+        page = page.sort_by("page_key")
+        has_previous, has_next = more, True
+    else:
+        has_previous, has_next = cursor != FIRST_PAGE, more
+
+    totals = st.columns(2)
+    totals[0].metric("Reclaim Candidates", f"{candidates:,}")
+    totals[1].metric("Potential Savings", f"${savings:,.0f}")
+
+    if page.num_rows == 0:
+        st.info("No reclaim candidates match the selected filters.")
+    else:
+        st.dataframe(
+            page.drop_columns(["page_key"]),
+            column_config={"potential_savings": CURRENCY_COLUMN},
+            hide_index=True,
+            use_container_width=True,
+        )
+        page_keys = page["page_key"]
+        nav = st.columns([1, 1, 1, 5])
+        if nav[0].button("First", disabled=not has_previous):
+            st.session_state.reclaim_cursor = FIRST_PAGE
+            st.rerun()
+        if nav[1].button("Previous", disabled=not has_previous):
+            st.session_state.reclaim_cursor = ("before", page_keys[0].as_py())
+            st.rerun()
+        if nav[2].button("Next", disabled=not has_next):
+            st.session_state.reclaim_cursor = ("after", page_keys[-1].as_py())
+            st.rerun()
+
+    st.subheader("Export")
+    st.caption(
+        f"Writes all {candidates:,} matching candidates, sorted as above, "
+        f"{EXPORT_BATCH_ROWS:,} rows at a time."
+    )
+    if st.button("Prepare CSV", disabled=candidates == 0):
+        previous = st.session_state.pop("reclaim_export", None)
+        if previous is not None:
+            previous.unlink(missing_ok=True)
+        with st.spinner("Exporting…"):
+            st.session_state.reclaim_export = export_csv(
+                db_path, session_export_dir(), sort_key, *filters
+            )
+    export = st.session_state.get("reclaim_export")
+    if export is not None and export.exists():
+        with export.open("rb") as data:
+            st.download_button(
+                "Download CSV (gzip)",
+                data,
+                file_name=EXPORT_FILE_NAME,
+                mime="application/gzip",
+            )
+
+
+def main() -> None:
+    with render_trace("reclaim_explorer.main"):
+        render_explorer()
+
+
+main()
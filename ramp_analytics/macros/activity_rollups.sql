@@ -0,0 +1,93 @@
+{#
+    Event rollups shared by the incremental activity models and their opt-in
+    full-refresh equivalence tests (tag `equivalence`, off by default). Logins
+    and usage are scanned once into a compact per-(org, app, user, day) rollup;
+    user state and monthly activity are re-aggregations of it. Passing `since`
+    restricts the event scan to that range; leaving it unset rebuilds from full
+    history. `rollup_loaded_at` stamps each rollup row so downstream models can
+    pick up exactly the rows that changed since their own last run.
+#}
+
+{% macro user_app_daily_events(logins, usage, since=none) %}
+with logins as (
+    select
+        org_id,
+        app_id,
+        user_id,
+        cast(login_at as date) as activity_date,
+        count(*) as login_events,
+        max(login_at) as last_login_at
+    from {{ logins }}
+    {% if since is not none %}
+    where login_at >= ({{ since }})
+    {% endif %}
+    group by 1, 2, 3, 4
+),
+
+usage as (
+    select
+        org_id,
+        app_id,
+        user_id,
+        cast(activity_at as date) as activity_date,
+        count(*) as usage_events,
+        sum(duration_minutes) as usage_minutes,
+        max(activity_at) as last_usage_at
+    from {{ usage }}
+    {% if since is not none %}
+    where activity_at >= ({{ since }})
+    {% endif %}
+    group by 1, 2, 3, 4
+)
+
+select
+    coalesce(logins.org_id, usage.org_id) as org_id,
+    coalesce(logins.app_id, usage.app_id) as app_id,
+    coalesce(logins.user_id, usage.user_id) as user_id,
+    coalesce(logins.activity_date, usage.activity_date) as activity_date,
+    coalesce(logins.login_events, 0) as login_events,
+    coalesce(usage.usage_events, 0) as usage_events,
+    coalesce(usage.usage_minutes, 0) as usage_minutes,
+    logins.last_login_at,
+    usage.last_usage_at,
+    greatest(logins.last_login_at, usage.last_usage_at) as last_event_at,
+    current_timestamp as rollup_loaded_at
+from logins
+full outer join usage
+    on logins.org_id = usage.org_id
+    and logins.app_id = usage.app_id
+    and logins.user_id = usage.user_id
+    and logins.activity_date = usage.activity_date
+{% endmacro %}
+
+
+{% macro user_app_event_state(daily) %}
+select
+    org_id,
+    app_id,
+    user_id,
+    max(last_login_at) as last_login_at,
+    max(last_usage_at) as last_usage_at,
+    cast(sum(login_events) as bigint) as login_events,
+    cast(sum(usage_events) as bigint) as usage_events,
+    sum(usage_minutes) as usage_minutes,
+    max(rollup_loaded_at) as rollup_loaded_at
+from {{ daily }}
+group by 1, 2, 3
+{% endmacro %}
+
+
+{% macro app_monthly_activity(daily) %}
+select
+    org_id,
+    app_id,
+    date_trunc('month', activity_date) as month,
+    count(distinct user_id) as active_users,
+    sum(login_events) as login_events,
+    sum(usage_events) as usage_events,
+    sum(usage_minutes) as usage_minutes,
+    max(last_event_at) as last_event_at,
+    max(rollup_loaded_at) as rollup_loaded_at
+from {{ daily }}
+group by 1, 2, 3
+{% endmacro %}
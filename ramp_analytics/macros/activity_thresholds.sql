@@ -0,0 +1,15 @@
+{#-
+    Inactivity thresholds (days) evaluated side by side: `activity_threshold_days`
+    plus `active_user_days`, so the default definition is always one of them.
+-#}
+{% macro activity_threshold_days() -%}
+{%- set thresholds = var('activity_threshold_days', [30, 60, 90]) + [var('active_user_days', 60)] -%}
+{%- for days in thresholds -%}
+{%- if days is not number or days != days | int or days < 1 -%}
+{{ exceptions.raise_compiler_error(
+    "activity_threshold_days and active_user_days must be positive whole days; got " ~ days
+) }}
+{%- endif -%}
+{%- endfor -%}
+{{ return(thresholds | map('int') | unique | sort | list) }}
+{%- endmacro %}
@@ -0,0 +1,17 @@
+{#-
+    Invoices rolled up per (org, app, month) through the as-of date. Shared by
+    `int_app_spend_monthly` (full history) and `mart_spend_vs_usage`, which passes
+    invoices already cut to its lookback so the range is pruned at the raw scan.
+-#}
+{% macro app_spend_monthly(invoices) %}
+select
+    org_id,
+    app_id,
+    date_trunc('month', invoice_date) as month,
+    sum(total_amount) as total_amount,
+    sum(seats_billed) as seats_billed,
+    max(currency) as currency
+from {{ invoices }}
+where invoice_date <= {{ as_of_date() }}
+group by 1, 2, 3
+{% endmacro %}
@@ -0,0 +1,61 @@
+{#-
+    The date every time-relative model is evaluated at: the `as_of_date` var, or the
+    UTC date the dbt invocation started. Rendered as a literal so a run's SQL (and its
+    results) depends only on its inputs and this date, never on the wall clock.
+-#}
+{% macro as_of_date_string() -%}
+{%- set as_of = var('as_of_date', none) -%}
+{%- if as_of is none -%}
+{{ return(run_started_at.strftime('%Y-%m-%d')) }}
+{%- endif -%}
+{{ return(modules.datetime.date.fromisoformat(as_of | string).isoformat()) }}
+{%- endmacro %}
+
+
+{% macro as_of_date() -%}
+date '{{ as_of_date_string() }}'
+{%- endmacro %}
+
+
+{#- End of the as-of date (exclusive): events stamped on the as-of date count as seen. -#}
+{% macro as_of_timestamp() -%}
+(timestamp '{{ as_of_date_string() }}' + interval 1 day)
+{%- endmacro %}
+
+
+{#- True when `as_of_date` is before the invocation date, i.e. a backfill of past state. -#}
+{% macro as_of_is_backdated() -%}
+{{ return(as_of_date_string() < run_started_at.strftime('%Y-%m-%d')) }}
+{%- endmacro %}
+
+
+{#-
+    Snapshot versions are stamped with the as-of date plus the current time of day, so
+    a backfilled date lands on that day while repeated runs still get distinct
+    dbt_valid_from values (the check strategy hashes them into dbt_scd_id).
+-#}
+{% macro duckdb__snapshot_get_time() -%}
+(timestamp '{{ as_of_date_string() }}' + (now()::timestamp - date_trunc('day', now()::timestamp)))
+{%- endmacro %}
+
+
+{#-
+    Snapshot pre-hook: fail unless this run's snapshot time is after every stored
+    `dbt_valid_from`. A backdated `as_of_date` would otherwise close current versions
+    before they start (dbt_valid_to < dbt_valid_from). Past dates belong in a fresh copy
+    of the warehouse, or in a build that excludes snapshots.
+-#}
+{% macro assert_snapshot_time_after_versions() -%}
+{%- if execute and load_relation(this) is not none -%}
+{%- set latest = run_query(
+    "select max(dbt_valid_from), max(dbt_valid_from) >= " ~ snapshot_get_time() ~ " from " ~ this
+).rows[0] -%}
+{%- if latest[1] -%}
+{{ exceptions.raise_compiler_error(
+    this.identifier ~ " already holds versions from " ~ latest[0] ~ "; as_of_date "
+    ~ as_of_date_string() ~ " would close them before they start. Build past dates into a "
+    ~ "fresh copy of the warehouse, or pass --exclude resource_type:snapshot."
+) }}
+{%- endif -%}
+{%- endif -%}
+{%- endmacro %}
@@ -0,0 +1,113 @@
+{#-
+    Benchmark quantiles come in three modes, picked with `benchmark_quantile_mode`:
+
+    - exact  (default): quantile_cont over every (org, app) row of the cohort.
+    - approx: DuckDB's approx_quantile (t-digest). Cheaper per cohort, but the
+      digest is not persisted, so coarser cohorts still rescan the rows.
+    - sketch: quantiles read from `int_benchmark_sketches`, a log-bucket histogram
+      per cohort and metric. Buckets are mergeable by summing their counts, so any
+      coarser cohort can be rolled up from them without touching int_app_metrics.
+-#}
+{% macro benchmark_quantile_mode() -%}
+{%- set mode = var('benchmark_quantile_mode', 'exact') -%}
+{%- if mode not in ['exact', 'approx', 'sketch'] -%}
+{{ exceptions.raise_compiler_error(
+    "benchmark_quantile_mode must be one of exact, approx, sketch; got " ~ mode
+) }}
+{%- endif -%}
+{{ return(mode) }}
+{%- endmacro %}
+
+
+{% macro benchmark_quantile(column, q) -%}
+{%- if benchmark_quantile_mode() == 'approx' -%}
+approx_quantile({{ column }}, {{ q }})
+{%- else -%}
+quantile_cont({{ column }}, {{ q }})
+{%- endif -%}
+{%- endmacro %}
+
+
+{#-
+    Bucket width of the sketches. Bucket i holds values in (gamma^(i-1), gamma^i] and
+    reports 2 * gamma^i / (gamma + 1), which is within `benchmark_sketch_relative_accuracy`
+    (alpha, default 1%) of every value in the bucket: gamma = (1 + alpha) / (1 - alpha).
+-#}
+{% macro sketch_gamma() -%}
+{%- set alpha = var('benchmark_sketch_relative_accuracy', 0.01) -%}
+{{ (1 + alpha) / (1 - alpha) }}
+{%- endmacro %}
+
+
+{#- Log bucket of a non-negative value; zero (and below) share the null bucket. -#}
+{% macro sketch_bucket(value) -%}
+case
+    when {{ value }} > 0 then cast(ceil(ln({{ value }}) / ln({{ sketch_gamma() }})) as integer)
+end
+{%- endmacro %}
+
+
+{% macro sketch_bucket_value(bucket) -%}
+coalesce(2 * pow({{ sketch_gamma() }}, {{ bucket }}) / ({{ sketch_gamma() }} + 1), 0)
+{%- endmacro %}
+
+
+{#-
+    Interpolated quantile over a cumulative bucket table (see benchmark_sketch_quantiles).
+    Mirrors quantile_cont: the values at ranks floor/ceil(q * (n - 1)) are read from the
+    first bucket whose cumulative count passes them, then interpolated.
+-#}
+{% macro sketch_quantile(metric, q) -%}
+{%- set in_metric = "metric = '" ~ metric ~ "'" -%}
+{%- set position = q ~ " * (total_count - 1)" -%}
+min(bucket_value) filter (where {{ in_metric }} and cumulative_count > floor({{ position }}))
+    + max({{ position }} - floor({{ position }})) filter (where {{ in_metric }})
+    * (
+        min(bucket_value) filter (where {{ in_metric }} and cumulative_count > ceil({{ position }}))
+        - min(bucket_value) filter (where {{ in_metric }} and cumulative_count > floor({{ position }}))
+    )
+{%- endmacro %}
+
+
+{#-
+    p25/p50/p75 of every sketch metric, merged up to `group_columns` (any subset of the
+    sketch's cohort columns; an empty list gives the global quantiles).
+-#}
+{% macro benchmark_sketch_quantiles(sketches, group_columns) -%}
+{%- set partition = (group_columns + ['metric']) | join(', ') -%}
+with merged as (
+    select
+        {{ partition }},
+        bucket_value,
+        cast(sum(bucket_count) as bigint) as bucket_count
+    from {{ sketches }}
+    group by {{ partition }}, bucket_value
+),
+
+cumulative as (
+    select
+        *,
+        sum(bucket_count) over (
+            partition by {{ partition }}
+            order by bucket_value
+            rows between unbounded preceding and current row
+        ) as cumulative_count,
+        sum(bucket_count) over (partition by {{ partition }}) as total_count
+    from merged
+)
+
+select
+    {%- for column in group_columns %}
+    {{ column }},
+    {%- endfor %}
+    {%- for metric in ['utilization', 'cost_per_active_seat'] %}
+    {%- for q in [0.25, 0.5, 0.75] %}
+    {{ sketch_quantile(metric, q) }} as {{ metric }}_p{{ (q * 100) | int }}
+    {{- "," if not loop.last or metric != 'cost_per_active_seat' }}
+    {%- endfor %}
+    {%- endfor %}
+from cumulative
+{%- if group_columns %}
+group by {{ group_columns | join(', ') }}
+{%- endif %}
+{%- endmacro %}
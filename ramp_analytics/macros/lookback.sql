@@ -0,0 +1,17 @@
+{#- First month of a trailing window of `months` calendar months, including the as-of month. -#}
+{% macro lookback_month_start(months) -%}
+cast(date_trunc('month', {{ as_of_date() }}) - interval '{{ months - 1 }} months' as date)
+{%- endmacro %}
+
+
+{#-
+    Where-clause keeping only rows dated inside `spend_lookback_months` (default 24).
+    The window starts on a month start, so `date_column` can be a day or a month.
+    Set the var to null to keep the full invoice history.
+-#}
+{% macro spend_lookback_filter(date_column) -%}
+{%- set months = var('spend_lookback_months', 24) -%}
+{%- if months is not none -%}
+where {{ date_column }} >= {{ lookback_month_start(months) }}
+{%- endif -%}
+{%- endmacro %}
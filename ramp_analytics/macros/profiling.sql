@@ -0,0 +1,23 @@
+{#-
+    Build profiling for scripts/profile_dbt_build.py, which builds with the `profile`
+    target: JSON profiling on for dbt's own connection, written to DBT_PROFILING_DIR.
+    Every model and snapshot builds its relation (incrementals and snapshots their
+    staging table) through create_table_as, so that statement's profile goes to a file
+    named after the node. Everything else dbt runs (introspection, merges, tests) goes
+    back to unattributed.json, so it cannot overwrite the node's profile.
+-#}
+{% macro profiling_output(name) -%}
+set profiling_output = '{{ env_var('DBT_PROFILING_DIR') }}/{{ name }}.json';
+{%- endmacro %}
+
+
+{% macro duckdb__create_table_as(temporary, relation, compiled_code, language='sql') -%}
+{%- set profiled = target.name == 'profile' and language == 'sql' -%}
+{%- if profiled %}
+{{ profiling_output(model.unique_id) }}
+{%- endif %}
+{{ dbt.duckdb__create_table_as(temporary, relation, compiled_code, language) }}
+{%- if profiled %}
+{{ profiling_output('unattributed') }}
+{%- endif %}
+{%- endmacro %}
@@ -9,4 +9,5 @@ select
     min(assigned_at) as first_assigned_at,
     max(assigned_at) as last_assigned_at
 from assignments
+where assigned_at < {{ as_of_timestamp() }}
 group by 1, 2, 3
@@ -10,6 +10,7 @@ ranked as (
             order by start_date desc, end_date desc
         ) as row_num
     from contracts
+    where start_date <= {{ as_of_date() }}
 )
 
 select
@@ -1,50 +1,37 @@
-with login_events as (
-    select
-        org_id,
-        app_id,
-        user_id,
-        date_trunc('month', login_at) as month,
-        count(*) as login_events
-    from {{ ref('stg_okta_logins') }}
-    group by 1, 2, 3, 4
-),
+{{
+    config(
+        materialized='incremental',
+        unique_key=['org_id', 'app_id', 'month'],
+        incremental_strategy='delete+insert'
+    )
+}}
+
+{% if is_incremental() %}
 
-usage_events as (
-    select
+{#- Distinct users are not additive, so each touched org/app/month is re-aggregated from all its days. -#}
+with touched as (
+    select distinct
         org_id,
         app_id,
-        user_id,
-        date_trunc('month', activity_at) as month,
-        count(*) as usage_events,
-        sum(duration_minutes) as usage_minutes
-    from {{ ref('stg_saas_usage') }}
-    group by 1, 2, 3, 4
+        date_trunc('month', activity_date) as month
+    from {{ ref('int_user_app_daily_events') }}
+    where rollup_loaded_at > (select max(rollup_loaded_at) from {{ this }})
 ),
 
-combined as (
-    select
-        coalesce(login_events.org_id, usage_events.org_id) as org_id,
-        coalesce(login_events.app_id, usage_events.app_id) as app_id,
-        coalesce(login_events.user_id, usage_events.user_id) as user_id,
-        coalesce(login_events.month, usage_events.month) as month,
-        coalesce(login_events.login_events, 0) as login_events,
-        coalesce(usage_events.usage_events, 0) as usage_events,
-        coalesce(usage_events.usage_minutes, 0) as usage_minutes
-    from login_events
-    full outer join usage_events
-        on login_events.org_id = usage_events.org_id
-        and login_events.app_id = usage_events.app_id
-        and login_events.user_id = usage_events.user_id
-        and login_events.month = usage_events.month
+touched_days as (
+    select daily.*
+    from {{ ref('int_user_app_daily_events') }} as daily
+    inner join touched
+        on daily.org_id = touched.org_id
+        and daily.app_id = touched.app_id
+        and daily.activity_date >= touched.month
+        and daily.activity_date < touched.month + interval '1 month'
 )
 
-select
-    org_id,
-    app_id,
-    month,
-    count(distinct user_id) as active_users,
-    sum(login_events) as login_events,
-    sum(usage_events) as usage_events,
-    sum(usage_minutes) as usage_minutes
-from combined
-group by 1, 2, 3
+{{ app_monthly_activity('touched_days') }}
+
+{% else %}
+
+{{ app_monthly_activity(ref('int_user_app_daily_events')) }}
+
+{% endif %}
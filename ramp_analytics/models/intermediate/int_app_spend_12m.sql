@@ -10,5 +10,5 @@ select
     avg(seats_billed) as avg_seats_billed_12m,
     max(currency) as currency
 from monthly
-where month >= (date_trunc('month', current_date) - interval '11 months')
+where month >= {{ lookback_month_start(12) }}
 group by 1, 2
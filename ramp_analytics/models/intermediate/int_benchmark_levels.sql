@@ -0,0 +1,125 @@
+-- depends_on: {{ ref('int_benchmark_sketches') }}
+-- Benchmarks at every level of the cohort hierarchy. The cohort level follows
+-- benchmark_quantile_mode; coarser levels merge the cohort sketches, so they never
+-- rescan int_app_metrics. Rolled-up cohort columns are null.
+{{ config(materialized='table') }}
+
+{%- set quantile_mode = benchmark_quantile_mode() %}
+{%- set rollups = {
+    'industry_band': ['industry', 'employee_band'],
+    'industry': ['industry'],
+    'global': [],
+} %}
+{%- set quantile_columns = [
+    'utilization_p25', 'utilization_p50', 'utilization_p75',
+    'cost_per_active_seat_p25', 'cost_per_active_seat_p50', 'cost_per_active_seat_p75',
+] %}
+
+with app_metrics as (
+    select * from {{ ref('int_app_metrics') }}
+),
+
+orgs as (
+    select * from {{ ref('stg_orgs') }}
+),
+
+cohorts as (
+    select
+        orgs.industry,
+        orgs.employee_band,
+        orgs.region,
+        count(*) as app_count,
+        count(distinct app_metrics.org_id) as org_count
+        {%- if quantile_mode != 'sketch' %},
+        {{ benchmark_quantile('app_metrics.utilization_rate', 0.25) }} as utilization_p25,
+        {{ benchmark_quantile('app_metrics.utilization_rate', 0.5) }} as utilization_p50,
+        {{ benchmark_quantile('app_metrics.utilization_rate', 0.75) }} as utilization_p75,
+        {{ benchmark_quantile('app_metrics.cost_per_active_seat', 0.25) }} as cost_per_active_seat_p25,
+        {{ benchmark_quantile('app_metrics.cost_per_active_seat', 0.5) }} as cost_per_active_seat_p50,
+        {{ benchmark_quantile('app_metrics.cost_per_active_seat', 0.75) }} as cost_per_active_seat_p75
+        {%- endif %}
+    from app_metrics
+    left join orgs
+        on app_metrics.org_id = orgs.org_id
+    where app_metrics.utilization_rate is not null
+    group by 1, 2, 3
+),
+
+{%- if quantile_mode == 'sketch' %}
+
+cohort_quantiles as (
+    {{ benchmark_sketch_quantiles(ref('int_benchmark_sketches'), ['industry', 'employee_band', 'region']) | indent(4) }}
+),
+{%- endif %}
+
+-- Every org sits in exactly one cohort, so org and app counts roll up by summing.
+rollup_counts as (
+    select
+        case grouping(industry, employee_band)
+            when 0 then 'industry_band'
+            when 1 then 'industry'
+            else 'global'
+        end as benchmark_level,
+        industry,
+        employee_band,
+        cast(null as varchar) as region,
+        sum(app_count) as app_count,
+        sum(org_count) as org_count
+    from cohorts
+    group by grouping sets ((industry, employee_band), (industry), ())
+),
+
+{%- for level, columns in rollups.items() %}
+
+{{ level }}_quantiles as (
+    {{ benchmark_sketch_quantiles(ref('int_benchmark_sketches'), columns) | indent(4) }}
+),
+{%- endfor %}
+
+levels as (
+    select
+        'cohort' as benchmark_level,
+        cohorts.industry,
+        cohorts.employee_band,
+        cohorts.region,
+        cohorts.app_count,
+        cohorts.org_count,
+        {%- set quantiles = 'cohort_quantiles' if quantile_mode == 'sketch' else 'cohorts' %}
+        {%- for column in quantile_columns %}
+        {{ quantiles }}.{{ column }}{{ "," if not loop.last }}
+        {%- endfor %}
+    from cohorts
+    {%- if quantile_mode == 'sketch' %}
+    left join cohort_quantiles
+        on cohorts.industry = cohort_quantiles.industry
+        and cohorts.employee_band = cohort_quantiles.employee_band
+        and cohorts.region = cohort_quantiles.region
+    {%- endif %}
+    {%- for level, columns in rollups.items() %}
+
+    union all
+
+    select
+        rollup_counts.benchmark_level,
+        rollup_counts.industry,
+        rollup_counts.employee_band,
+        rollup_counts.region,
+        cast(rollup_counts.app_count as bigint),
+        cast(rollup_counts.org_count as bigint),
+        {%- for column in quantile_columns %}
+        {{ level }}_quantiles.{{ column }}{{ "," if not loop.last }}
+        {%- endfor %}
+    from rollup_counts
+    {%- if columns %}
+    left join {{ level }}_quantiles
+        on {% for column in columns %}{{ "\n        and " if not loop.first }}rollup_counts.{{ column }} = {{ level }}_quantiles.{{ column }}{% endfor %}
+    {%- else %}
+    cross join {{ level }}_quantiles
+    {%- endif %}
+    where rollup_counts.benchmark_level = '{{ level }}'
+    {%- endfor %}
+)
+
+select *
+from levels
+order by industry nulls last, employee_band nulls last, region nulls last
@@ -0,0 +1,74 @@
+-- Benchmarks for apps of the same category and of the same app_key, at every level of
+-- the cohort hierarchy (see int_benchmark_levels). All eight grouping sets come out of
+-- one aggregate over int_app_metrics rather than one query per segment and level.
+-- Quantiles are exact, or approx_quantile under benchmark_quantile_mode = 'approx'.
+{{ config(materialized='table') }}
+
+{%- set levels = {
+    'cohort': ['industry', 'employee_band', 'region'],
+    'industry_band': ['industry', 'employee_band'],
+    'industry': ['industry'],
+    'global': [],
+} %}
+
+with app_metrics as (
+    select * from {{ ref('int_app_metrics') }}
+),
+
+apps as (
+    select * from {{ ref('stg_okta_apps') }}
+),
+
+orgs as (
+    select * from {{ ref('stg_orgs') }}
+),
+
+segment_values as (
+    select
+        orgs.industry,
+        orgs.employee_band,
+        orgs.region,
+        apps.category,
+        apps.app_key,
+        app_metrics.org_id,
+        app_metrics.utilization_rate,
+        app_metrics.cost_per_active_seat
+    from app_metrics
+    left join apps
+        on app_metrics.org_id = apps.org_id
+        and app_metrics.app_id = apps.app_id
+    left join orgs
+        on app_metrics.org_id = orgs.org_id
+    where app_metrics.utilization_rate is not null
+)
+
+select
+    case when grouping(category) = 0 then 'category' else 'app_key' end as segment,
+    case when grouping(category) = 0 then category else app_key end as segment_key,
+    case grouping(industry, employee_band, region)
+        when 0 then 'cohort'
+        when 1 then 'industry_band'
+        when 3 then 'industry'
+        else 'global'
+    end as benchmark_level,
+    industry,
+    employee_band,
+    region,
+    count(*) as app_count,
+    count(distinct org_id) as org_count,
+    {{ benchmark_quantile('utilization_rate', 0.25) }} as utilization_p25,
+    {{ benchmark_quantile('utilization_rate', 0.5) }} as utilization_p50,
+    {{ benchmark_quantile('utilization_rate', 0.75) }} as utilization_p75,
+    {{ benchmark_quantile('cost_per_active_seat', 0.25) }} as cost_per_active_seat_p25,
+    {{ benchmark_quantile('cost_per_active_seat', 0.5) }} as cost_per_active_seat_p50,
+    {{ benchmark_quantile('cost_per_active_seat', 0.75) }} as cost_per_active_seat_p75
+from segment_values
+group by grouping sets (
+    {%- for segment in ['category', 'app_key'] %}
+    {%- set outer_loop = loop %}
+    {%- for level, columns in levels.items() %}
+    ({{ (columns + [segment]) | join(', ') }}){{ "," if not (loop.last and outer_loop.last) }}
+    {%- endfor %}
+    {%- endfor %}
+)
+order by segment, segment_key, industry nulls last, employee_band nulls last, region nulls last
@@ -0,0 +1,43 @@
+{{ config(materialized='table') }}
+
+with app_metrics as (
+    select * from {{ ref('int_app_metrics') }}
+),
+
+orgs as (
+    select * from {{ ref('stg_orgs') }}
+),
+
+cohort_values as (
+    select
+        orgs.industry,
+        orgs.employee_band,
+        orgs.region,
+        app_metrics.utilization_rate,
+        app_metrics.cost_per_active_seat
+    from app_metrics
+    left join orgs
+        on app_metrics.org_id = orgs.org_id
+    where app_metrics.utilization_rate is not null
+),
+
+metric_values as (
+    select industry, employee_band, region, 'utilization' as metric, utilization_rate as metric_value
+    from cohort_values
+    union all
+    select industry, employee_band, region, 'cost_per_active_seat', cost_per_active_seat
+    from cohort_values
+    where cost_per_active_seat is not null
+)
+
+select
+    industry,
+    employee_band,
+    region,
+    metric,
+    {{ sketch_bucket('metric_value') }} as bucket,
+    {{ sketch_bucket_value(sketch_bucket('metric_value')) }} as bucket_value,
+    count(*) as bucket_count
+from metric_values
+group by all
+order by industry, employee_band, region, metric, bucket
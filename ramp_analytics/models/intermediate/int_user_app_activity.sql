@@ -1,26 +1,20 @@
+-- depends_on: {{ ref('int_user_app_daily_events') }}
 {% set active_days = var('active_user_days', 60) %}
 
-with logins as (
-    select
-        org_id,
-        app_id,
-        user_id,
-        max(login_at) as last_login_at,
-        count(*) as login_events
-    from {{ ref('stg_okta_logins') }}
-    group by 1, 2, 3
-),
-
-usage as (
-    select
-        org_id,
-        app_id,
-        user_id,
-        max(activity_at) as last_usage_at,
-        count(*) as usage_events,
-        sum(duration_minutes) as usage_minutes
-    from {{ ref('stg_saas_usage') }}
-    group by 1, 2, 3
+{#-
+    Activity is judged at the end of the as-of date. The incremental event state only
+    holds all-time maxima, so a backdated as_of_date re-aggregates the daily rollup up
+    to that date instead.
+#}
+with event_state as (
+    {%- if as_of_is_backdated() %}
+    {{ user_app_event_state(
+        "(select * from " ~ ref('int_user_app_daily_events')
+        ~ " where activity_date <= " ~ as_of_date() ~ ")"
+    ) | indent(4) }}
+    {%- else %}
+    select * from {{ ref('int_user_app_event_state') }}
+    {%- endif %}
 ),
 
 users as (
@@ -34,37 +28,33 @@ users as (
 )
 
 select
-    coalesce(logins.org_id, usage.org_id) as org_id,
-    coalesce(logins.app_id, usage.app_id) as app_id,
-    coalesce(logins.user_id, usage.user_id) as user_id,
+    event_state.org_id,
+    event_state.app_id,
+    event_state.user_id,
     users.status,
     users.department,
-    logins.last_login_at,
-    usage.last_usage_at,
+    event_state.last_login_at,
+    event_state.last_usage_at,
     users.user_last_login_at,
-    greatest(logins.last_login_at, usage.last_usage_at) as last_activity_at,
-    coalesce(logins.login_events, 0) as login_events,
-    coalesce(usage.usage_events, 0) as usage_events,
-    coalesce(usage.usage_minutes, 0) as usage_minutes,
+    greatest(event_state.last_login_at, event_state.last_usage_at) as last_activity_at,
+    event_state.login_events,
+    event_state.usage_events,
+    event_state.usage_minutes,
     case
-        when greatest(logins.last_login_at, usage.last_usage_at) is null then 'inactive'
-        when greatest(logins.last_login_at, usage.last_usage_at)
-            >= (current_timestamp - interval '{{ active_days }} day') then 'active'
+        when greatest(event_state.last_login_at, event_state.last_usage_at) is null then 'inactive'
+        when greatest(event_state.last_login_at, event_state.last_usage_at)
+            >= ({{ as_of_timestamp() }} - interval '{{ active_days }} day') then 'active'
         else 'inactive'
     end as activity_status,
     case
-        when greatest(logins.last_login_at, usage.last_usage_at) is null then null
+        when greatest(event_state.last_login_at, event_state.last_usage_at) is null then null
         else date_diff(
             'day',
-            greatest(logins.last_login_at, usage.last_usage_at),
-            current_timestamp
+            greatest(event_state.last_login_at, event_state.last_usage_at),
+            {{ as_of_date() }}
         )
     end as inactivity_days
-from logins
-full outer join usage
-    on logins.org_id = usage.org_id
-    and logins.app_id = usage.app_id
-    and logins.user_id = usage.user_id
+from event_state
 left join users
-    on users.org_id = coalesce(logins.org_id, usage.org_id)
-    and users.user_id = coalesce(logins.user_id, usage.user_id)
+    on users.org_id = event_state.org_id
+    and users.user_id = event_state.user_id
@@ -0,0 +1,31 @@
+{{
+    config(
+        materialized='incremental',
+        unique_key=['org_id', 'app_id', 'user_id', 'activity_date'],
+        incremental_strategy='delete+insert'
+    )
+}}
+
+{% if is_incremental() %}
+
+{#- Rebuild every day from the earliest newly arrived event onward; those days may already hold earlier events. -#}
+{% set touched_from %}
+select cast(min(event_at) as date)
+from (
+    select login_at as event_at
+    from {{ ref('stg_okta_logins') }}
+    where login_at > (select coalesce(max(last_login_at), timestamp '1900-01-01') from {{ this }})
+    union all
+    select activity_at as event_at
+    from {{ ref('stg_saas_usage') }}
+    where activity_at > (select coalesce(max(last_usage_at), timestamp '1900-01-01') from {{ this }})
+)
+{% endset %}
+
+{{ user_app_daily_events(ref('stg_okta_logins'), ref('stg_saas_usage'), since=touched_from) }}
+
+{% else %}
+
+{{ user_app_daily_events(ref('stg_okta_logins'), ref('stg_saas_usage')) }}
+
+{% endif %}
@@ -0,0 +1,35 @@
+{{
+    config(
+        materialized='incremental',
+        unique_key=['org_id', 'app_id', 'user_id'],
+        incremental_strategy='delete+insert'
+    )
+}}
+
+{% if is_incremental() %}
+
+with touched as (
+    select distinct
+        org_id,
+        app_id,
+        user_id
+    from {{ ref('int_user_app_daily_events') }}
+    where rollup_loaded_at > (select max(rollup_loaded_at) from {{ this }})
+),
+
+touched_days as (
+    select daily.*
+    from {{ ref('int_user_app_daily_events') }} as daily
+    inner join touched
+        on daily.org_id = touched.org_id
+        and daily.app_id = touched.app_id
+        and daily.user_id = touched.user_id
+)
+
+{{ user_app_event_state('touched_days') }}
+
+{% else %}
+
+{{ user_app_event_state(ref('int_user_app_daily_events')) }}
+
+{% endif %}
@@ -0,0 +1,79 @@
+{#-
+    Seat activity under every threshold in activity_threshold_days(), one row per
+    org/app/threshold. Assignments and user activity are joined and scanned once:
+    each threshold is a filtered count in the same aggregate, unpivoted afterwards.
+    A user is active at N days on the same terms as int_user_app_activity.
+-#}
+{% set thresholds = activity_threshold_days() %}
+{% set active_days = var('active_user_days', 60) %}
+
+with assignments as (
+    select * from {{ ref('int_app_assignments') }}
+),
+
+activity as (
+    select * from {{ ref('int_user_app_activity') }}
+),
+
+app_overview as (
+    select * from {{ ref('mart_app_overview') }}
+),
+
+seat_activity as materialized (
+    select
+        assignments.org_id,
+        assignments.app_id,
+        count(distinct assignments.user_id) as assigned_seats,
+        {%- for days in thresholds %}
+        count(distinct assignments.user_id) filter (
+            where activity.last_activity_at >= ({{ as_of_timestamp() }} - interval '{{ days }} day')
+        ) as active_seats_{{ days }}d{{ "," if not loop.last }}
+        {%- endfor %}
+    from assignments
+    left join activity
+        on assignments.org_id = activity.org_id
+        and assignments.app_id = activity.app_id
+        and assignments.user_id = activity.user_id
+    group by 1, 2
+),
+
+thresholds as (
+    {%- for days in thresholds %}
+    select
+        org_id,
+        app_id,
+        {{ days }} as active_days,
+        assigned_seats,
+        active_seats_{{ days }}d as active_seats
+    from seat_activity
+    {%- if not loop.last %}
+
+    union all
+    {%- endif %}
+    {%- endfor %}
+)
+
+select
+    thresholds.org_id,
+    app_overview.org_name,
+    thresholds.app_id,
+    app_overview.app_name,
+    app_overview.category,
+    thresholds.active_days,
+    thresholds.active_days = {{ active_days }} as is_default_threshold,
+    thresholds.assigned_seats,
+    thresholds.active_seats,
+    thresholds.assigned_seats - thresholds.active_seats as inactive_seats,
+    thresholds.active_seats * 1.0 / nullif(thresholds.assigned_seats, 0) as utilization_rate,
+    app_overview.total_spend_12m,
+    app_overview.price_per_seat,
+    app_overview.total_spend_12m / nullif(thresholds.active_seats, 0) as cost_per_active_seat,
+    case
+        when app_overview.price_per_seat is null then null
+        else (thresholds.assigned_seats - thresholds.active_seats) * app_overview.price_per_seat
+    end as rightsizing_opportunity
+from thresholds
+left join app_overview
+    on thresholds.org_id = app_overview.org_id
+    and thresholds.app_id = app_overview.app_id
+order by thresholds.org_id, thresholds.app_id, thresholds.active_days
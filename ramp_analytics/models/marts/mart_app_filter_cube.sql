@@ -0,0 +1,49 @@
+{#-
+    KPI aggregates for every org/app/category filter combination the dashboard
+    sidebar can produce, under each activity threshold. 'All' marks a rolled-up
+    dimension, matching the sidebar's "All" option, so each selection is a lookup
+    of one row per threshold.
+-#}
+
+with app_thresholds as (
+    select * from {{ ref('mart_app_activity_thresholds') }}
+),
+
+cube as (
+    select
+        active_days,
+        is_default_threshold,
+        case when grouping(org_name) = 1 then 'All' else org_name end as org_name,
+        case when grouping(app_name) = 1 then 'All' else app_name end as app_name,
+        case when grouping(category) = 1 then 'All' else category end as category,
+        grouping(org_name, app_name, category) as grouping_level,
+        count(*) as app_count,
+        coalesce(sum(total_spend_12m), 0) as total_spend_12m,
+        coalesce(sum(assigned_seats), 0) as assigned_seats,
+        coalesce(sum(active_seats), 0) as active_seats,
+        coalesce(sum(inactive_seats), 0) as inactive_seats,
+        coalesce(sum(rightsizing_opportunity), 0) as rightsizing_opportunity,
+        coalesce(sum(utilization_rate), 0) as utilization_rate_sum,
+        count(utilization_rate) as utilization_rate_count
+    from app_thresholds
+    group by active_days, is_default_threshold, cube (org_name, app_name, category)
+)
+
+select
+    org_name,
+    app_name,
+    category,
+    active_days,
+    is_default_threshold,
+    grouping_level,
+    app_count,
+    total_spend_12m,
+    assigned_seats,
+    active_seats,
+    inactive_seats,
+    rightsizing_opportunity,
+    utilization_rate_sum,
+    utilization_rate_count,
+    utilization_rate_sum / nullif(utilization_rate_count, 0) as avg_utilization_rate
+from cube
+order by org_name, app_name, category, active_days
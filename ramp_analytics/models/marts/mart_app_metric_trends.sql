@@ -0,0 +1,41 @@
+{#-
+    Daily utilization and spend per org/app, read from the SCD2 snapshot. A view, so the
+    snapshot stays compact and each trend query only expands the rows it filters to.
+    A day shows the last version snapshotted on or before it.
+-#}
+{{ config(materialized='view') }}
+
+with snapshots as (
+    select * from {{ ref('snap_app_overview') }}
+),
+
+days as (
+    select cast(day as date) as snapshot_date
+    from range(
+        (select cast(min(dbt_valid_from) as date) from snapshots),
+        {{ as_of_date() }} + 1,
+        interval 1 day
+    ) as days(day)
+)
+
+select
+    days.snapshot_date,
+    snapshots.org_id,
+    snapshots.org_name,
+    snapshots.app_id,
+    snapshots.app_name,
+    snapshots.category,
+    snapshots.assigned_seats,
+    snapshots.active_seats,
+    snapshots.inactive_seats,
+    snapshots.utilization_rate,
+    snapshots.total_spend_12m,
+    snapshots.cost_per_active_seat,
+    snapshots.rightsizing_opportunity
+from days
+inner join snapshots
+    on cast(snapshots.dbt_valid_from as date) <= days.snapshot_date
+    and (
+        snapshots.dbt_valid_to is null
+        or cast(snapshots.dbt_valid_to as date) > days.snapshot_date
+    )
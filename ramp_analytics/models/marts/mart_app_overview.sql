@@ -12,6 +12,10 @@ orgs as (
 
 benchmarks as (
     select * from {{ ref('mart_benchmarks') }}
+),
+
+segment_benchmarks as (
+    select * from {{ ref('mart_segment_benchmarks') }}
 )
 
 select
@@ -38,6 +42,15 @@ select
     benchmarks.utilization_p25 as cohort_utilization_p25,
     benchmarks.utilization_p50 as cohort_utilization_p50,
     benchmarks.utilization_p75 as cohort_utilization_p75,
+    benchmarks.benchmark_level as cohort_benchmark_level,
+    category_benchmarks.utilization_p25 as category_utilization_p25,
+    category_benchmarks.utilization_p50 as category_utilization_p50,
+    category_benchmarks.cost_per_active_seat_p50 as category_cost_per_active_seat_p50,
+    category_benchmarks.benchmark_level as category_benchmark_level,
+    app_benchmarks.utilization_p25 as app_utilization_p25,
+    app_benchmarks.utilization_p50 as app_utilization_p50,
+    app_benchmarks.cost_per_active_seat_p50 as app_cost_per_active_seat_p50,
+    app_benchmarks.benchmark_level as app_benchmark_level,
     case
         when benchmarks.utilization_p25 is null then false
         when app_metrics.utilization_rate < benchmarks.utilization_p25 then true
@@ -58,3 +71,16 @@ left join benchmarks
     on orgs.industry = benchmarks.industry
     and orgs.employee_band = benchmarks.employee_band
     and orgs.region = benchmarks.region
+left join segment_benchmarks as category_benchmarks
+    on orgs.industry = category_benchmarks.industry
+    and orgs.employee_band = category_benchmarks.employee_band
+    and orgs.region = category_benchmarks.region
+    and category_benchmarks.segment = 'category'
+    and apps.category = category_benchmarks.segment_key
+left join segment_benchmarks as app_benchmarks
+    on orgs.industry = app_benchmarks.industry
+    and orgs.employee_band = app_benchmarks.employee_band
+    and orgs.region = app_benchmarks.region
+    and app_benchmarks.segment = 'app_key'
+    and apps.app_key = app_benchmarks.segment_key
+order by app_metrics.org_id, app_metrics.app_id
@@ -1,25 +1,68 @@
-with app_metrics as (
-    select * from {{ ref('int_app_metrics') }}
-),
+-- One benchmark per cohort: the finest level of int_benchmark_levels
+-- (cohort -> industry + band -> industry -> global) backed by at least
+-- `benchmark_min_orgs` orgs. The default of 1 keeps every cohort on its own quantiles;
+-- raise it so sparse cohorts borrow a coarser, sketch-merged benchmark instead.
+{%- set min_orgs = var('benchmark_min_orgs', 1) %}
 
-orgs as (
+with orgs as (
     select * from {{ ref('stg_orgs') }}
+),
+
+levels as (
+    select * from {{ ref('int_benchmark_levels') }}
+),
+
+cohorts as (
+    select distinct
+        industry,
+        employee_band,
+        region
+    from orgs
+),
+
+resolved as (
+    select
+        cohorts.industry,
+        cohorts.employee_band,
+        cohorts.region,
+        case
+            when cohort_level.org_count >= {{ min_orgs }} then 'cohort'
+            when industry_band_level.org_count >= {{ min_orgs }} then 'industry_band'
+            when industry_level.org_count >= {{ min_orgs }} then 'industry'
+            else 'global'
+        end as benchmark_level
+    from cohorts
+    left join levels as cohort_level
+        on cohort_level.benchmark_level = 'cohort'
+        and cohorts.industry = cohort_level.industry
+        and cohorts.employee_band = cohort_level.employee_band
+        and cohorts.region = cohort_level.region
+    left join levels as industry_band_level
+        on industry_band_level.benchmark_level = 'industry_band'
+        and cohorts.industry = industry_band_level.industry
+        and cohorts.employee_band = industry_band_level.employee_band
+    left join levels as industry_level
+        on industry_level.benchmark_level = 'industry'
+        and cohorts.industry = industry_level.industry
 )
 
 select
-    orgs.industry,
-    orgs.employee_band,
-    orgs.region,
-    count(*) as app_count,
-    count(distinct app_metrics.org_id) as org_count,
-    quantile_cont(app_metrics.utilization_rate, 0.25) as utilization_p25,
-    quantile_cont(app_metrics.utilization_rate, 0.5) as utilization_p50,
-    quantile_cont(app_metrics.utilization_rate, 0.75) as utilization_p75,
-    quantile_cont(app_metrics.cost_per_active_seat, 0.25) as cost_per_active_seat_p25,
-    quantile_cont(app_metrics.cost_per_active_seat, 0.5) as cost_per_active_seat_p50,
-    quantile_cont(app_metrics.cost_per_active_seat, 0.75) as cost_per_active_seat_p75
-from app_metrics
-left join orgs
-    on app_metrics.org_id = orgs.org_id
-where app_metrics.utilization_rate is not null
-group by 1, 2, 3
+    resolved.industry,
+    resolved.employee_band,
+    resolved.region,
+    resolved.benchmark_level,
+    levels.app_count,
+    levels.org_count,
+    levels.utilization_p25,
+    levels.utilization_p50,
+    levels.utilization_p75,
+    levels.cost_per_active_seat_p25,
+    levels.cost_per_active_seat_p50,
+    levels.cost_per_active_seat_p75
+from resolved
+left join levels
+    on resolved.benchmark_level = levels.benchmark_level
+    and coalesce(levels.industry, resolved.industry) = resolved.industry
+    and coalesce(levels.employee_band, resolved.employee_band) = resolved.employee_band
+    and coalesce(levels.region, resolved.region) = resolved.region
+order by resolved.industry, resolved.employee_band, resolved.region
@@ -0,0 +1,46 @@
+{#-
+    mart_user_reclaim_candidates with one integer key per explorer sort order, stored
+    once. Each key numbers the rows in its order (ties broken by org_id, app_id,
+    user_id), so a page is `<key> > last_key order by <key> limit n` for any order.
+    The table is written sorted by row_key (org/app/user), which DuckDB answers from
+    the zone maps of a few row groups at any depth. The other keys scan one integer
+    column and keep a top-n. That is still far cheaper than a composite keyset on the
+    mart's own columns, and unlike one copy per order it does not multiply storage.
+-#}
+{%- set sort_keys = {
+    'row_key': [],
+    'potential_savings_key': ['potential_savings desc nulls last'],
+    'inactivity_days_key': ['inactivity_days desc nulls first'],
+} %}
+
+with candidates as (
+    select * from {{ ref('mart_user_reclaim_candidates') }}
+),
+
+orgs as (
+    select * from {{ ref('stg_orgs') }}
+)
+
+select
+    {%- for key, sort_columns in sort_keys.items() %}
+    row_number() over (
+        order by {{ (sort_columns + ['candidates.org_id', 'candidates.app_id', 'candidates.user_id']) | join(', ') }}
+    ) as {{ key }},
+    {%- endfor %}
+    candidates.org_id,
+    orgs.org_name,
+    candidates.app_id,
+    candidates.app_name,
+    candidates.category,
+    candidates.user_id,
+    candidates.email,
+    candidates.department,
+    candidates.status,
+    candidates.last_activity_at,
+    candidates.inactivity_days,
+    candidates.inactivity_reason,
+    candidates.potential_savings
+from candidates
+left join orgs
+    on candidates.org_id = orgs.org_id
+order by row_key
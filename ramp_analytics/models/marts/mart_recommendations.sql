@@ -18,6 +18,19 @@ with reclaim as (
     from {{ ref('mart_user_reclaim_candidates') }}
 ),
 
+app_overview as materialized (
+    select
+        org_id,
+        app_id,
+        app_name,
+        category,
+        utilization_rate,
+        cohort_utilization_p25,
+        over_licensed_flag,
+        rightsizing_opportunity
+    from {{ ref('mart_app_overview') }}
+),
+
 right_size as (
     select
         org_id,
@@ -33,101 +46,99 @@ right_size as (
         null as user_id,
         null as user_email,
         category
-    from {{ ref('mart_app_overview') }}
+    from app_overview
     where over_licensed_flag = true
         and rightsizing_opportunity is not null
         and rightsizing_opportunity > 0
 ),
 
-spend_base as (
-    select * from {{ ref('mart_spend_vs_usage') }}
-),
-
-latest as (
+-- One pass over the monthly spend: a top-4 aggregate keeps each org/app's latest
+-- month plus the three before it, so no sort or self-join over the full history.
+-- Months are month starts, so every month in [latest - 3 months, latest) is among
+-- those four.
+recent_spend as (
     select
         org_id,
         app_id,
-        max(month) as latest_month
-    from spend_base
+        max_by(
+            struct_pack(month, total_amount, active_users, app_name, category),
+            month,
+            4
+        ) as recent_months
+    from {{ ref('mart_spend_vs_usage') }}
+    {{ spend_lookback_filter('month') }}
     group by 1, 2
 ),
 
-last_month as (
-    select spend_base.*
-    from spend_base
-    inner join latest
-        on spend_base.org_id = latest.org_id
-        and spend_base.app_id = latest.app_id
-        and spend_base.month = latest.latest_month
+prior_spend as (
+    select
+        org_id,
+        app_id,
+        recent_months[1] as latest,
+        list_sort(
+            list_filter(
+                recent_months,
+                spend_month -> spend_month.month < recent_months[1].month
+                    and spend_month.month >= recent_months[1].month - interval '3 months'
+            )
+        ) as prior_months
+    from recent_spend
 ),
 
-prior_window as (
+last_month as (
     select
-        spend_base.org_id,
-        spend_base.app_id,
-        avg(spend_base.total_amount) as prior_avg_spend,
-        avg(spend_base.active_users) as prior_avg_active
-    from spend_base
-    inner join latest
-        on spend_base.org_id = latest.org_id
-        and spend_base.app_id = latest.app_id
-    where spend_base.month < latest.latest_month
-        and spend_base.month >= (latest.latest_month - interval '3 months')
-    group by 1, 2
+        org_id,
+        app_id,
+        latest.app_name,
+        latest.category,
+        latest.total_amount,
+        latest.active_users,
+        list_avg(list_transform(prior_months, spend_month -> spend_month.total_amount))
+            as prior_avg_spend,
+        list_avg(list_transform(prior_months, spend_month -> spend_month.active_users))
+            as prior_avg_active,
+        len(prior_months) as prior_month_count
+    from prior_spend
 ),
 
 spend_spike as (
     select
-        last_month.org_id,
-        'spend_spike_' || last_month.org_id || '_' || last_month.app_id as recommendation_id,
+        org_id,
+        'spend_spike_' || org_id || '_' || app_id as recommendation_id,
         'investigate_spend_spike' as recommendation_type,
         'investigate_spend_spike' as action,
         'Spend increased with flat usage' as reason,
         'Last month spend: '
-            || cast(last_month.total_amount as varchar)
+            || cast(total_amount as varchar)
             || ' vs prior avg: '
-            || cast(prior_window.prior_avg_spend as varchar) as evidence,
-        last_month.total_amount - prior_window.prior_avg_spend as expected_savings,
+            || cast(prior_avg_spend as varchar) as evidence,
+        total_amount - prior_avg_spend as expected_savings,
         0.5 as confidence,
-        last_month.app_id,
-        last_month.app_name,
+        app_id,
+        app_name,
         null as user_id,
         null as user_email,
-        last_month.category
+        category
     from last_month
-    inner join prior_window
-        on last_month.org_id = prior_window.org_id
-        and last_month.app_id = prior_window.app_id
-    where prior_window.prior_avg_spend is not null
-        and last_month.total_amount > prior_window.prior_avg_spend * 1.25
+    where prior_month_count > 0
+        and prior_avg_spend is not null
+        and total_amount > prior_avg_spend * 1.25
         and (
-            prior_window.prior_avg_active is null
-            or abs(last_month.active_users - prior_window.prior_avg_active)
-                <= (prior_window.prior_avg_active * 0.1)
+            prior_avg_active is null
+            or abs(active_users - prior_avg_active) <= (prior_avg_active * 0.1)
         )
 ),
 
-low_util_apps as (
-    select
-        org_id,
-        category,
-        app_id,
-        app_name,
-        utilization_rate,
-        rightsizing_opportunity
-    from {{ ref('mart_app_overview') }}
-    where cohort_utilization_p25 is not null
-        and utilization_rate < cohort_utilization_p25
-),
-
 consolidate as (
     select
         org_id,
         category,
-        string_agg(app_name, ', ') as app_list,
+        string_agg(app_name, ', ' order by app_id) as app_list,
         count(*) as low_util_app_count,
         sum(rightsizing_opportunity) as total_rightsizing_opportunity
-    from low_util_apps
+    from app_overview
+    where cohort_utilization_p25 is not null
+        and utilization_rate < cohort_utilization_p25
     group by 1, 2
     having count(*) >= 2
 )
@@ -146,7 +157,7 @@ select
     user_id,
     user_email,
     category,
-    current_timestamp as created_at
+    cast({{ as_of_date() }} as timestamptz) as created_at
 from reclaim
 
 union all
@@ -165,7 +176,7 @@ select
     user_id,
     user_email,
     category,
-    current_timestamp as created_at
+    cast({{ as_of_date() }} as timestamptz) as created_at
 from right_size
 
 union all
@@ -184,7 +195,7 @@ select
     user_id,
     user_email,
     category,
-    current_timestamp as created_at
+    cast({{ as_of_date() }} as timestamptz) as created_at
 from spend_spike
 
 union all
@@ -203,5 +214,6 @@ select
     null as user_id,
     null as user_email,
     consolidate.category,
-    current_timestamp as created_at
+    cast({{ as_of_date() }} as timestamptz) as created_at
 from consolidate
+order by org_id, app_id, recommendation_id
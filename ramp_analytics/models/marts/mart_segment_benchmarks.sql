@@ -0,0 +1,97 @@
+-- Category and app_key benchmarks per cohort, resolved like mart_benchmarks: the finest
+-- level of int_benchmark_segments backed by at least `benchmark_min_orgs` orgs.
+{%- set min_orgs = var('benchmark_min_orgs', 1) %}
+
+with apps as (
+    select * from {{ ref('stg_okta_apps') }}
+),
+
+orgs as (
+    select * from {{ ref('stg_orgs') }}
+),
+
+segments as (
+    select * from {{ ref('int_benchmark_segments') }}
+),
+
+cohort_segments as (
+    select
+        orgs.industry,
+        orgs.employee_band,
+        orgs.region,
+        'category' as segment,
+        apps.category as segment_key
+    from apps
+    inner join orgs
+        on apps.org_id = orgs.org_id
+    union
+    select
+        orgs.industry,
+        orgs.employee_band,
+        orgs.region,
+        'app_key',
+        apps.app_key
+    from apps
+    inner join orgs
+        on apps.org_id = orgs.org_id
+),
+
+resolved as (
+    select
+        cohort_segments.*,
+        case
+            when cohort_level.org_count >= {{ min_orgs }} then 'cohort'
+            when industry_band_level.org_count >= {{ min_orgs }} then 'industry_band'
+            when industry_level.org_count >= {{ min_orgs }} then 'industry'
+            else 'global'
+        end as benchmark_level
+    from cohort_segments
+    left join segments as cohort_level
+        on cohort_level.benchmark_level = 'cohort'
+        and cohort_segments.segment = cohort_level.segment
+        and cohort_segments.segment_key = cohort_level.segment_key
+        and cohort_segments.industry = cohort_level.industry
+        and cohort_segments.employee_band = cohort_level.employee_band
+        and cohort_segments.region = cohort_level.region
+    left join segments as industry_band_level
+        on industry_band_level.benchmark_level = 'industry_band'
+        and cohort_segments.segment = industry_band_level.segment
+        and cohort_segments.segment_key = industry_band_level.segment_key
+        and cohort_segments.industry = industry_band_level.industry
+        and cohort_segments.employee_band = industry_band_level.employee_band
+    left join segments as industry_level
+        on industry_level.benchmark_level = 'industry'
+        and cohort_segments.segment = industry_level.segment
+        and cohort_segments.segment_key = industry_level.segment_key
+        and cohort_segments.industry = industry_level.industry
+)
+
+select
+    resolved.industry,
+    resolved.employee_band,
+    resolved.region,
+    resolved.segment,
+    resolved.segment_key,
+    resolved.benchmark_level,
+    segments.app_count,
+    segments.org_count,
+    segments.utilization_p25,
+    segments.utilization_p50,
+    segments.utilization_p75,
+    segments.cost_per_active_seat_p25,
+    segments.cost_per_active_seat_p50,
+    segments.cost_per_active_seat_p75
+from resolved
+left join segments
+    on resolved.benchmark_level = segments.benchmark_level
+    and resolved.segment = segments.segment
+    and resolved.segment_key = segments.segment_key
+    and coalesce(segments.industry, resolved.industry) = resolved.industry
+    and coalesce(segments.employee_band, resolved.employee_band) = resolved.employee_band
+    and coalesce(segments.region, resolved.region) = resolved.region
+order by
+    resolved.industry,
+    resolved.employee_band,
+    resolved.region,
+    resolved.segment,
+    resolved.segment_key
@@ -1,9 +1,18 @@
-with spend as (
-    select * from {{ ref('int_app_spend_monthly') }}
+-- Invoices and activity are pruned to `spend_lookback_months` at the source, before
+-- the monthly rollup and any join, so build time follows the window rather than the
+-- retained invoice history.
+with invoices as (
+    select * from {{ ref('stg_saas_invoices') }}
+    {{ spend_lookback_filter('invoice_date') }}
+),
+
+spend as (
+    {{ app_spend_monthly('invoices') }}
 ),
 
 activity as (
     select * from {{ ref('int_app_monthly_activity') }}
+    {{ spend_lookback_filter('month') }}
 ),
 
 app_metrics as (
@@ -64,3 +73,4 @@ left join benchmarks
     on orgs.industry = benchmarks.industry
     and orgs.employee_band = benchmarks.employee_band
     and orgs.region = benchmarks.region
+order by spend.org_id, spend.app_id, spend.month
@@ -55,3 +55,4 @@ left join contracts
     on assignments.org_id = contracts.org_id
     and assignments.app_id = contracts.app_id
 where coalesce(activity.activity_status, 'inactive') = 'inactive'
+order by assignments.org_id, assignments.app_id, assignments.user_id
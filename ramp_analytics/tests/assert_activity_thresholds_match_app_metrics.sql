@@ -0,0 +1,50 @@
+-- At the default threshold every app must match int_app_metrics, and a longer
+-- threshold can only count more seats as active.
+
+with thresholds as (
+    select * from {{ ref('mart_app_activity_thresholds') }}
+),
+
+app_metrics as (
+    select * from {{ ref('int_app_metrics') }}
+),
+
+default_mismatches as (
+    select
+        'default_threshold_mismatch' as issue,
+        app_metrics.org_id,
+        app_metrics.app_id,
+        thresholds.active_days
+    from app_metrics
+    left join thresholds
+        on app_metrics.org_id = thresholds.org_id
+        and app_metrics.app_id = thresholds.app_id
+        and thresholds.is_default_threshold
+    where thresholds.active_seats is null
+        or thresholds.assigned_seats != app_metrics.assigned_seats
+        or thresholds.active_seats != app_metrics.active_seats
+        or thresholds.inactive_seats != app_metrics.inactive_seats
+),
+
+not_monotonic as (
+    select
+        'active_seats_decrease_with_threshold' as issue,
+        org_id,
+        app_id,
+        active_days
+    from (
+        select
+            org_id,
+            app_id,
+            active_days,
+            active_seats < lag(active_seats) over (
+                partition by org_id, app_id order by active_days
+            ) as decreased
+        from thresholds
+    )
+    where decreased
+)
+
+select * from default_mismatches
+union all
+select * from not_monotonic
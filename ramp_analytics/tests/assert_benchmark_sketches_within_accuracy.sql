@@ -0,0 +1,64 @@
+-- Quantiles merged from the sketches must stay within the sketch's relative accuracy
+-- of quantile_cont over the raw rows, at the cohort level and when rolled up.
+-- Opt-in, since it recomputes the exact quantiles the sketches exist to avoid:
+-- --vars '{check_benchmark_sketch_accuracy: true}'.
+{{ config(tags=['accuracy'], enabled=var('check_benchmark_sketch_accuracy', false)) }}
+{%- set alpha = var('benchmark_sketch_relative_accuracy', 0.01) %}
+{%- set levels = {
+    'cohort': ['industry', 'employee_band', 'region'],
+    'industry': ['industry'],
+    'region': ['region'],
+} %}
+
+with cohort_values as (
+    select
+        orgs.industry,
+        orgs.employee_band,
+        orgs.region,
+        app_metrics.utilization_rate as utilization,
+        app_metrics.cost_per_active_seat
+    from {{ ref('int_app_metrics') }} as app_metrics
+    left join {{ ref('stg_orgs') }} as orgs
+        on app_metrics.org_id = orgs.org_id
+    where app_metrics.utilization_rate is not null
+),
+
+comparisons as (
+    {%- for level, columns in levels.items() %}
+    select
+        '{{ level }}' as level,
+        {%- for metric in ['utilization', 'cost_per_active_seat'] %}
+        {%- for q in [25, 50, 75] %}
+        sketch.{{ metric }}_p{{ q }} as sketch_{{ metric }}_p{{ q }},
+        exact.{{ metric }}_p{{ q }} as exact_{{ metric }}_p{{ q }}{{ "," if not loop.last or metric != 'cost_per_active_seat' }}
+        {%- endfor %}
+        {%- endfor %}
+    from (
+        {{ benchmark_sketch_quantiles(ref('int_benchmark_sketches'), columns) | indent(8) }}
+    ) as sketch
+    inner join (
+        select
+            {{ columns | join(', ') }},
+            {%- for metric in ['utilization', 'cost_per_active_seat'] %}
+            {%- for q in [25, 50, 75] %}
+            quantile_cont({{ metric }}, {{ q / 100 }}) as {{ metric }}_p{{ q }}{{ "," if not loop.last or metric != 'cost_per_active_seat' }}
+            {%- endfor %}
+            {%- endfor %}
+        from cohort_values
+        group by {{ columns | join(', ') }}
+    ) as exact
+        using ({{ columns | join(', ') }})
+    {{ "union all" if not loop.last }}
+    {%- endfor %}
+)
+
+select *
+from comparisons
+where
+{%- for metric in ['utilization', 'cost_per_active_seat'] %}
+{%- for q in [25, 50, 75] %}
+    {{ "or " if not (loop.first and metric == 'utilization') }}abs(sketch_{{ metric }}_p{{ q }} - exact_{{ metric }}_p{{ q }})
+        > {{ alpha }} * abs(exact_{{ metric }}_p{{ q }}) + 1e-9
+    or (sketch_{{ metric }}_p{{ q }} is null) != (exact_{{ metric }}_p{{ q }} is null)
+{%- endfor %}
+{%- endfor %}
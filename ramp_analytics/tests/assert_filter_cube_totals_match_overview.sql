@@ -0,0 +1,31 @@
+-- The cube's grand-total row at the default threshold must equal the same KPIs aggregated straight from the overview.
+
+with overview_totals as (
+    select
+        count(*) as app_count,
+        coalesce(sum(total_spend_12m), 0) as total_spend_12m,
+        coalesce(sum(inactive_seats), 0) as inactive_seats,
+        coalesce(sum(rightsizing_opportunity), 0) as rightsizing_opportunity,
+        count(utilization_rate) as utilization_rate_count
+    from {{ ref('mart_app_overview') }}
+),
+
+cube_totals as (
+    select *
+    from {{ ref('mart_app_filter_cube') }}
+    where grouping_level = 7
+        and is_default_threshold
+)
+
+select
+    overview_totals.*,
+    cube_totals.app_count as cube_app_count
+from overview_totals
+left join cube_totals
+    on true
+where cube_totals.app_count is null
+    or cube_totals.app_count != overview_totals.app_count
+    or abs(cube_totals.total_spend_12m - overview_totals.total_spend_12m) > 0.01
+    or cube_totals.inactive_seats != overview_totals.inactive_seats
+    or abs(cube_totals.rightsizing_opportunity - overview_totals.rightsizing_opportunity) > 0.01
+    or cube_totals.utilization_rate_count != overview_totals.utilization_rate_count
@@ -0,0 +1,27 @@
+-- Every sort key must number each reclaim candidate exactly once, 1..n.
+
+with candidates as (
+    select count(*) as candidate_count
+    from {{ ref('mart_user_reclaim_candidates') }}
+),
+
+pages as (
+    select
+        count(*) as row_count,
+        count(distinct (org_id, app_id, user_id)) as distinct_candidates,
+        {%- for key in ['row_key', 'potential_savings_key', 'inactivity_days_key'] %}
+        min({{ key }}) as min_{{ key }},
+        max({{ key }}) as max_{{ key }}{{ "," if not loop.last }}
+        {%- endfor %}
+    from {{ ref('mart_reclaim_candidate_pages') }}
+)
+
+select pages.*
+from pages
+cross join candidates
+where pages.row_count != candidates.candidate_count
+    or pages.distinct_candidates != candidates.candidate_count
+    {%- for key in ['row_key', 'potential_savings_key', 'inactivity_days_key'] %}
+    or pages.min_{{ key }} != 1
+    or pages.max_{{ key }} != candidates.candidate_count
+    {%- endfor %}
@@ -0,0 +1,34 @@
+-- Days rebuilt incrementally must equal a rollup of the full event history.
+-- Opt-in, since it rescans every login and usage event: --vars '{check_incremental_equivalence: true}'.
+{{ config(tags=['equivalence'], enabled=var('check_incremental_equivalence', false)) }}
+
+with full_refresh as (
+    select * exclude (rollup_loaded_at) from (
+        {{ user_app_daily_events(ref('stg_okta_logins'), ref('stg_saas_usage')) }}
+    )
+),
+
+incremental as (
+    select * exclude (rollup_loaded_at)
+    from {{ ref('int_user_app_daily_events') }}
+),
+
+missing as (
+    select 'missing_from_incremental' as issue, * from (
+        select * from full_refresh
+        except all
+        select * from incremental
+    )
+),
+
+extra as (
+    select 'extra_in_incremental' as issue, * from (
+        select * from incremental
+        except all
+        select * from full_refresh
+    )
+)
+
+select * from missing
+union all
+select * from extra
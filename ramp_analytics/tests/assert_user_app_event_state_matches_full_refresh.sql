@@ -0,0 +1,46 @@
+-- Incremental merges of per-user event state must equal a rebuild from full history.
+-- Opt-in, since it rescans every login and usage event: --vars '{check_incremental_equivalence: true}'.
+{{ config(tags=['equivalence'], enabled=var('check_incremental_equivalence', false)) }}
+
+with full_daily as (
+    {{ user_app_daily_events(ref('stg_okta_logins'), ref('stg_saas_usage')) }}
+),
+
+full_refresh as (
+    select * exclude (rollup_loaded_at) from (
+        {{ user_app_event_state('full_daily') }}
+    )
+),
+
+incremental as (
+    select
+        org_id,
+        app_id,
+        user_id,
+        last_login_at,
+        last_usage_at,
+        login_events,
+        usage_events,
+        usage_minutes
+    from {{ ref('int_user_app_event_state') }}
+),
+
+missing as (
+    select 'missing_from_incremental' as issue, * from (
+        select * from full_refresh
+        except all
+        select * from incremental
+    )
+),
+
+extra as (
+    select 'extra_in_incremental' as issue, * from (
+        select * from incremental
+        except all
+        select * from full_refresh
+    )
+)
+
+select * from missing
+union all
+select * from extra
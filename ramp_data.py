@@ -0,0 +1,437 @@
+"""Data access shared by the dashboard and its pages.
+
+Streamlit runs the entry script as __main__, so a page importing streamlit_app would
+load it a second time, and every st.cache_resource in it (the connection pool, the
+trace log) would exist twice. Both import from here instead.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+DEFAULT_DB_PATH = Path("../warehouse/ramp.duckdb")
+
+
+def get_db_path() -> Path:
+    env_path = os.getenv("RAMP_DUCKDB_PATH")
+    if env_path:
+        return Path(env_path)
+    return DEFAULT_DB_PATH
+
+
+TRACE_RESOURCE = {"service.name": "ramp-seat-intelligence", "process.pid": os.getpid()}
+TRACE_HISTORY_RENDERS = 500
+# The render's spans and the innermost open span; loader threads get a copy of both.
+_trace_spans: contextvars.ContextVar[list[dict] | None] = contextvars.ContextVar(
+    "trace_spans", default=None
+)
+_current_span: contextvars.ContextVar[dict | None] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class TraceLog:
+    """Spans of the last renders in this process, for the timing panel.
+
+    With an export path, every render's spans are also appended to it as JSON lines,
+    one OTLP-style span per line, so outliers can be analysed offline.
+    """
+
+    def __init__(self, export_path: Path | None, max_renders: int) -> None:
+        self.export_path = export_path
+        self._lock = threading.Lock()
+        self._renders: deque[list[dict]] = deque(maxlen=max_renders)
+
+    def record(self, spans: list[dict]) -> None:
+        with self._lock:
+            self._renders.append(spans)
+            if self.export_path is not None:
+                with self.export_path.open("a") as sink:
+                    for record in spans:
+                        sink.write(json.dumps({"resource": TRACE_RESOURCE} | record, default=str))
+                        sink.write("\n")
+
+    def renders(self) -> list[list[dict]]:
+        with self._lock:
+            return list(self._renders)
+
+
+@st.cache_resource
+def get_trace_log() -> TraceLog:
+    export_path = os.getenv("RAMP_TRACE_PATH")
+    return TraceLog(Path(export_path) if export_path else None, TRACE_HISTORY_RENDERS)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[None]:
+    """Time the block as a child of the current span. A no-op outside render_trace."""
+    spans = _trace_spans.get()
+    if spans is None:
+        yield
+        return
+    parent = _current_span.get()
+    record = {
+        "trace_id": parent["trace_id"] if parent else secrets.token_hex(16),
+        "span_id": secrets.token_hex(8),
+        "parent_span_id": parent["span_id"] if parent else None,
+        "name": name,
+        "start_time_unix_nano": time.time_ns(),
+        "status": {"code": "OK"},
+        "attributes": attributes,
+    }
+    token = _current_span.set(record)
+    started = time.perf_counter_ns()
+    try:
+        yield
+    except Exception as exc:
+        record["status"] = {"code": "ERROR", "message": f"{type(exc).__name__}: {exc}"}
+        raise
+    finally:
+        elapsed = time.perf_counter_ns() - started
+        _current_span.reset(token)
+        record["end_time_unix_nano"] = record["start_time_unix_nano"] + elapsed
+        record["duration_ms"] = elapsed / 1e6
+        spans.append(record)
+
+
+def annotate_span(**attributes) -> None:
+    current = _current_span.get()
+    if current is not None:
+        current["attributes"].update(attributes)
+
+
+@contextmanager
+def render_trace(name: str) -> Iterator[None]:
+    """Root span of one script run; its spans go to the trace log when it ends."""
+    spans: list[dict] = []
+    token = _trace_spans.set(spans)
+    try:
+        with span(name):
+            yield
+    finally:
+        _trace_spans.reset(token)
+        get_trace_log().record(spans)
+
+
+def traced_cache_data(**cache_options):
+    """st.cache_data, with a span per call that records whether it hit the cache.
+
+    The loader body only runs on a miss, so it marks the caller's span as one.
+    __wrapped__ is the undecorated loader, which bypasses the cache.
+    """
+
+    def decorate(func):
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            annotate_span(cache_hit=False)
+            return func(*args, **kwargs)
+
+        cached = st.cache_data(**cache_options)(compute)
+
+        @functools.wraps(func)
+        def load(*args, **kwargs):
+            with span(f"load.{func.__name__}", cache_hit=True):
+                return cached(*args, **kwargs)
+
+        load.clear = cached.clear
+        return load
+
+    return decorate
+
+
+def db_file_version(db_path: Path) -> tuple[int, int, int]:
+    """Identity of the file currently at db_path; changes when dbt swaps in a new build."""
+    stat = db_path.stat()
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+class ConnectionPool:
+    """One read-only DuckDB connection per process, lending a cursor per query.
+
+    Cursors share the parent's database instance, so sessions never reopen the file.
+    When the file at db_path is replaced, the next borrower waits for in-flight
+    cursors to be returned, then reopens the file. DuckDB caches database instances
+    by path, so the old connection must be closed before the new file is visible.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self.db_path = db_path
+        self._cond = threading.Condition()
+        self._conn: duckdb.DuckDBPyConnection | None = None
+        self._version: tuple[int, int, int] | None = None
+        self._in_use = 0
+
+    def _refresh(self, version: tuple[int, int, int]) -> None:
+        while self._conn is not None and version != self._version and self._in_use:
+            self._cond.wait()
+        if self._conn is None or version != self._version:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = duckdb.connect(str(self.db_path), read_only=True)
+            self._version = version
+
+    @contextmanager
+    def cursor(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        version = db_file_version(self.db_path)
+        # Includes waiting for a swapped-in build to be reopened.
+        with span("pool.acquire"), self._cond:
+            self._refresh(version)
+            cursor = self._conn.cursor()
+            self._in_use += 1
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify_all()
+
+
+@st.cache_resource
+def get_connection_pool(db_path: Path) -> ConnectionPool:
+    return ConnectionPool(db_path)
+
+
+ALL = "All"
+FILTER_COLUMNS = ("org_name", "app_name", "category")
+EMPTY_KPIS = {
+    "total_spend": 0.0,
+    "avg_utilization": None,
+    "active_seats": 0,
+    "inactive_seats": 0,
+    "rightsizing": 0.0,
+}
+# Low-cardinality strings stay dictionary-encoded from DuckDB through to the browser.
+DICTIONARY_COLUMNS = (
+    "org_name",
+    "industry",
+    "employee_band",
+    "region",
+    "app_key",
+    "app_name",
+    "category",
+    "vendor",
+    "cohort_benchmark_level",
+    "category_benchmark_level",
+    "app_benchmark_level",
+)
+ARROW_BATCH_ROWS = 1_000_000
+CURRENCY_COLUMN = st.column_config.NumberColumn(format="dollar")
+PERCENT_COLUMN = st.column_config.NumberColumn(format="percent")
+
+
+def query_df(db_path: Path, sql: str, params: list | None = None) -> pd.DataFrame:
+    with get_connection_pool(db_path).cursor() as cursor:
+        with span("duckdb.execute"):
+            result = cursor.execute(sql, params or [])
+        with span("duckdb.df"):
+            return result.df()
+
+
+def dictionary_schema(schema: pa.Schema) -> pa.Schema:
+    return pa.schema(
+        [
+            field.with_type(pa.dictionary(pa.int32(), field.type))
+            if field.name in DICTIONARY_COLUMNS and pa.types.is_string(field.type)
+            else field
+            for field in schema
+        ]
+    )
+
+
+def query_arrow(db_path: Path, sql: str, params: list | None = None) -> pa.Table:
+    """Fetch a result as Arrow, dictionary-encoding batch by batch to keep the peak low."""
+    with get_connection_pool(db_path).cursor() as cursor:
+        with span("duckdb.execute"):
+            reader = cursor.execute(sql, params or []).fetch_record_batch(ARROW_BATCH_ROWS)
+        with span("arrow.fetch"):
+            schema = dictionary_schema(reader.schema)
+            batches = [batch.cast(schema) for batch in reader]
+            table = pa.Table.from_batches(batches, schema=schema).unify_dictionaries()
+            annotate_span(rows=table.num_rows)
+    return table
+
+
+def filter_clause(
+    org: str,
+    app: str,
+    category: str,
+    conditions: list[str] | None = None,
+    params: list | None = None,
+) -> tuple[str, list]:
+    """Sidebar selections, after any given conditions, as a parameterized where clause.
+
+    "All" adds no predicate.
+    """
+    conditions = list(conditions or [])
+    params = list(params or [])
+    for column, value in zip(FILTER_COLUMNS, (org, app, category)):
+        if value != ALL:
+            conditions.append(f"{column} = ?")
+            params.append(value)
+    where = f"where {' and '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+# db_version is part of every cache key so a swapped-in build invalidates cached
+# results; the filter tuple keeps each entry as small as what the page displays.
+@traced_cache_data(ttl=300)
+def load_filter_options(db_path: Path, db_version: tuple[int, int, int]) -> dict:
+    options = query_df(
+        db_path,
+        """
+        select
+          count(*) as row_count,
+          list(distinct org_name order by org_name) filter (where org_name is not null)
+            as org_names,
+          list(distinct app_name order by app_name) filter (where app_name is not null)
+            as app_names,
+          list(distinct category order by category) filter (where category is not null)
+            as categories
+        from analytics.mart_app_overview
+        """,
+    ).iloc[0]
+    thresholds = query_df(
+        db_path,
+        """
+        select
+          list(distinct active_days order by active_days) as active_days,
+          max(active_days) filter (where is_default_threshold) as default_active_days
+        from analytics.mart_app_filter_cube
+        where grouping_level = 7
+        """,
+    ).iloc[0]
+    return {
+        "row_count": int(options["row_count"]),
+        "active_days": [int(days) for days in thresholds["active_days"]],
+        "default_active_days": int(thresholds["default_active_days"]),
+        "org_name": list(options["org_names"] if options["org_names"] is not None else []),
+        "app_name": list(options["app_names"] if options["app_names"] is not None else []),
+        "category": list(options["categories"] if options["categories"] is not None else []),
+    }
+
+
+@traced_cache_data(ttl=300, max_entries=256)
+def load_kpis(
+    db_path: Path, db_version: tuple[int, int, int], org: str, app: str, category: str
+) -> dict[int, dict]:
+    """Per-threshold KPIs from mart_app_filter_cube, which spells rolled-up dimensions "All".
+
+    Every activity threshold comes back at once, so switching thresholds is a dict lookup.
+    """
+    with get_connection_pool(db_path).cursor() as cursor, span("duckdb.execute"):
+        rows = cursor.execute(
+            """
+            select
+              active_days,
+              total_spend_12m,
+              avg_utilization_rate,
+              active_seats,
+              inactive_seats,
+              rightsizing_opportunity
+            from analytics.mart_app_filter_cube
+            where org_name = ? and app_name = ? and category = ?
+            order by active_days
+            """,
+            [org, app, category],
+        ).fetchall()
+    # No rows when no app matches this combination.
+    return {row[0]: dict(zip(EMPTY_KPIS, row[1:])) for row in rows}
+
+
+@traced_cache_data(ttl=300, max_entries=64)
+def load_app_overview(
+    db_path: Path, db_version: tuple[int, int, int], org: str, app: str, category: str
+) -> pa.Table:
+    where, params = filter_clause(org, app, category)
+    return query_arrow(
+        db_path,
+        f"""
+        select
+          org_id,
+          org_name,
+          industry,
+          employee_band,
+          region,
+          app_id,
+          app_name,
+          category,
+          vendor,
+          assigned_seats,
+          active_seats,
+          inactive_seats,
+          utilization_rate,
+          total_spend_12m,
+          avg_monthly_spend_12m,
+          cost_per_active_seat,
+          cohort_utilization_p25,
+          cohort_benchmark_level,
+          category_utilization_p25,
+          category_cost_per_active_seat_p50,
+          category_benchmark_level,
+          app_utilization_p25,
+          app_cost_per_active_seat_p50,
+          app_benchmark_level,
+          rightsizing_opportunity,
+          over_licensed_flag
+        from analytics.mart_app_overview
+        {where}
+        """,
+        params,
+    )
+
+
+@traced_cache_data(ttl=300, max_entries=64)
+def load_utilization_trend(
+    db_path: Path, db_version: tuple[int, int, int], org: str, app: str, category: str
+) -> pa.Table:
+    where, params = filter_clause(org, app, category)
+    return query_arrow(
+        db_path,
+        f"""
+        select
+          snapshot_date,
+          sum(assigned_seats) as assigned_seats,
+          sum(active_seats) as active_seats,
+          sum(active_seats) * 1.0 / nullif(sum(assigned_seats), 0) as utilization_rate,
+          sum(total_spend_12m) as total_spend_12m
+        from analytics.mart_app_metric_trends
+        {where}
+        group by snapshot_date
+        order by snapshot_date
+        """,
+        params,
+    )
+
+
+def load_in_parallel(db_path: Path, loaders: list, *args) -> list:
+    """Run the cached loaders concurrently, each on its own cursor."""
+    db_version = db_file_version(db_path)
+    ctx = get_script_run_ctx()
+
+    def run(loader, context):
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return context.run(loader, db_path, db_version, *args)
+
+    with span("load_in_parallel"), ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+        # One context copy per thread, so each loader's spans nest under this one.
+        contexts = [contextvars.copy_context() for _ in loaders]
+        return list(executor.map(run, loaders, contexts))
+
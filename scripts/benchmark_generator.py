@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from generate_synthetic_data import ENGINES, generate_data
+
+
+def run_generation(
+    engine: str,
+    seed: int,
+    orgs: int,
+    min_employees: int,
+    max_employees: int,
+    months: int,
+) -> dict:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        started = time.perf_counter()
+        row_counts = generate_data(
+            out_dir=Path(tmp_dir),
+            seed=seed,
+            orgs=orgs,
+            min_employees=min_employees,
+            max_employees=max_employees,
+            months=months,
+            engine=engine,
+        )
+        elapsed = time.perf_counter() - started
+
+    total_rows = sum(row_counts.values())
+    return {
+        "engine": engine,
+        "orgs": orgs,
+        "seconds": elapsed,
+        "seconds_per_org": elapsed / orgs if orgs else 0.0,
+        "rows": total_rows,
+        "login_rows": row_counts["raw_okta_logins"],
+        "rows_per_second": total_rows / elapsed if elapsed else float("inf"),
+    }
+
+
+def benchmark_engines(
+    engines: list[str],
+    seed: int,
+    orgs: int,
+    min_employees: int,
+    max_employees: int,
+    months: int,
+) -> list[dict]:
+    return [
+        run_generation(engine, seed, orgs, min_employees, max_employees, months)
+        for engine in engines
+    ]
+
+
+def benchmark_scaling(
+    engines: list[str],
+    seed: int,
+    org_tiers: list[int],
+    min_employees: int,
+    max_employees: int,
+    months: int,
+) -> list[dict]:
+    """Time each engine across org counts; per-org cost should stay flat as orgs grow."""
+    return [
+        run_generation(engine, seed, orgs, min_employees, max_employees, months)
+        for engine in engines
+        for orgs in org_tiers
+    ]
+
+
+def print_engine_comparison(results: list[dict]) -> None:
+    baseline = results[0]["rows_per_second"]
+    print(f"{'engine':<12} {'seconds':>9} {'rows':>12} {'rows/s':>12} {'speedup':>8}")
+    for result in results:
+        print(
+            f"{result['engine']:<12} {result['seconds']:>9.2f} {result['rows']:>12,} "
+            f"{result['rows_per_second']:>12,.0f} {result['rows_per_second'] / baseline:>7.1f}x"
+        )
+
+
+def print_scaling(results: list[dict]) -> None:
+    print(
+        f"{'engine':<12} {'orgs':>6} {'seconds':>9} {'ms/org':>9} {'rows':>12} "
+        f"{'rows/s':>12} {'vs first':>9}"
+    )
+    first_cost: dict[str, float] = {}
+    for result in results:
+        cost = first_cost.setdefault(result["engine"], result["seconds_per_org"])
+        print(
+            f"{result['engine']:<12} {result['orgs']:>6} {result['seconds']:>9.2f} "
+            f"{result['seconds_per_org'] * 1000:>9.1f} {result['rows']:>12,} "
+            f"{result['rows_per_second']:>12,.0f} {result['seconds_per_org'] / cost:>8.2f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare rows/s of the synthetic data generator engines."
+    )
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=ENGINES)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--orgs", type=int, default=12)
+    parser.add_argument(
+        "--scale-orgs",
+        type=int,
+        nargs="+",
+        default=None,
+        help="Run a scaling sweep over these org counts instead (e.g. 10 100 500 2000).",
+    )
+    parser.add_argument("--min-employees", type=int, default=120)
+    parser.add_argument("--max-employees", type=int, default=800)
+    parser.add_argument("--months", type=int, default=12)
+    args = parser.parse_args()
+
+    if args.scale_orgs:
+        print_scaling(
+            benchmark_scaling(
+                engines=args.engines,
+                seed=args.seed,
+                org_tiers=args.scale_orgs,
+                min_employees=args.min_employees,
+                max_employees=args.max_employees,
+                months=args.months,
+            )
+        )
+        return
+
+    print_engine_comparison(
+        benchmark_engines(
+            engines=args.engines,
+            seed=args.seed,
+            orgs=args.orgs,
+            min_employees=args.min_employees,
+            max_employees=args.max_employees,
+            months=args.months,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
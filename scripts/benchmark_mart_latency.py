@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import duckdb
+
+# Dashboard-shaped reads per mart: the full load Streamlit issues today, one org,
+# and one org/app pair. `{org_id}`/`{app_id}` are filled from the mart itself.
+MART_QUERIES = {
+    "mart_app_overview": {
+        "scan": "select * from analytics.mart_app_overview",
+        "org": "select * from analytics.mart_app_overview where org_id = '{org_id}'",
+        "org_app": (
+            "select * from analytics.mart_app_overview "
+            "where org_id = '{org_id}' and app_id = '{app_id}'"
+        ),
+    },
+    "mart_spend_vs_usage": {
+        "scan": "select * from analytics.mart_spend_vs_usage",
+        "org": "select * from analytics.mart_spend_vs_usage where org_id = '{org_id}'",
+        "org_app": (
+            "select * from analytics.mart_spend_vs_usage "
+            "where org_id = '{org_id}' and app_id = '{app_id}'"
+        ),
+    },
+    "mart_benchmarks": {
+        "scan": "select * from analytics.mart_benchmarks",
+        "org": (
+            "select benchmarks.* from analytics.mart_benchmarks as benchmarks "
+            "inner join analytics.stg_orgs as orgs using (industry, employee_band, region) "
+            "where orgs.org_id = '{org_id}'"
+        ),
+    },
+    "mart_recommendations": {
+        "scan": "select * from analytics.mart_recommendations",
+        "org": "select * from analytics.mart_recommendations where org_id = '{org_id}'",
+        "org_app": (
+            "select * from analytics.mart_recommendations "
+            "where org_id = '{org_id}' and app_id = '{app_id}'"
+        ),
+    },
+    "mart_user_reclaim_candidates": {
+        "scan": "select * from analytics.mart_user_reclaim_candidates",
+        "org": (
+            "select * from analytics.mart_user_reclaim_candidates where org_id = '{org_id}'"
+        ),
+        "org_app": (
+            "select * from analytics.mart_user_reclaim_candidates "
+            "where org_id = '{org_id}' and app_id = '{app_id}'"
+        ),
+    },
+}
+
+
+def relation_kind(conn: duckdb.DuckDBPyConnection, table_name: str) -> str:
+    row = conn.execute(
+        "select table_type from information_schema.tables "
+        "where table_schema = 'analytics' and table_name = ?",
+        [table_name],
+    ).fetchone()
+    if row is None:
+        return "missing"
+    return "view" if row[0] == "VIEW" else "table"
+
+
+def time_query(conn: duckdb.DuckDBPyConnection, sql: str, repeats: int) -> dict:
+    conn.execute(sql).fetchall()  # warm the buffer pool before timing
+    timings = []
+    rows = 0
+    for _ in range(repeats):
+        started = time.perf_counter()
+        rows = len(conn.execute(sql).fetchall())
+        timings.append(time.perf_counter() - started)
+    return {
+        "rows": rows,
+        "median_ms": statistics.median(timings) * 1000,
+        "max_ms": max(timings) * 1000,
+    }
+
+
+def benchmark_marts(db_path: Path, repeats: int) -> list[dict]:
+    conn = duckdb.connect(str(db_path), read_only=True)
+    try:
+        org_id, app_id = conn.execute(
+            "select org_id, app_id from analytics.mart_app_overview "
+            "order by org_id, app_id limit 1"
+        ).fetchone()
+        results = []
+        for mart, queries in MART_QUERIES.items():
+            kind = relation_kind(conn, mart)
+            if kind == "missing":
+                continue
+            for query_name, template in queries.items():
+                sql = template.format(org_id=org_id, app_id=app_id)
+                results.append(
+                    {"mart": mart, "kind": kind, "query": query_name}
+                    | time_query(conn, sql, repeats)
+                )
+        return results
+    finally:
+        conn.close()
+
+
+def print_latency_report(results: list[dict]) -> None:
+    print(
+        f"{'mart':<30} {'kind':<6} {'query':<8} {'rows':>9} "
+        f"{'median ms':>10} {'max ms':>9}"
+    )
+    for result in results:
+        print(
+            f"{result['mart']:<30} {result['kind']:<6} {result['query']:<8} "
+            f"{result['rows']:>9,} {result['median_ms']:>10.2f} {result['max_ms']:>9.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Time dashboard-shaped reads against each mart in the warehouse."
+    )
+    parser.add_argument("--db-path", default="warehouse/ramp.duckdb")
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    print_latency_report(benchmark_marts(Path(args.db_path), args.repeats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from benchmark_result_formats import peak_rss_mb
+
+ROOT = Path(__file__).resolve().parents[1]
+PROJECT_DIR = ROOT / "ramp_analytics"
+DEFAULT_HISTORY = ROOT / "benchmarks" / "pipeline_history.jsonl"
+# Fixed data and as-of date, so every run of a tier builds the same rows.
+SEED = 42
+AS_OF = dt.datetime(2026, 1, 1)
+TIERS = {
+    "small": {"orgs": 12, "min_employees": 120, "max_employees": 800, "months": 12},
+    "medium": {"orgs": 500, "min_employees": 120, "max_employees": 800, "months": 12},
+    "large": {"orgs": 5000, "min_employees": 40, "max_employees": 200, "months": 12},
+}
+STAGES = ["generate", "ingest", "dbt", "loaders"]
+# Landing-page loaders in ramp_data, timed uncached with every filter on "All".
+LOADERS = ["load_filter_options", "load_kpis", "load_app_overview", "load_utilization_trend"]
+
+
+def measure_generate(workdir: Path, tier: dict, engine: str, output_format: str) -> list[dict]:
+    from generate_synthetic_data import generate_data
+
+    started = time.perf_counter()
+    row_counts = generate_data(
+        out_dir=workdir / "raw",
+        seed=SEED,
+        orgs=tier["orgs"],
+        min_employees=tier["min_employees"],
+        max_employees=tier["max_employees"],
+        months=tier["months"],
+        engine=engine,
+        as_of=AS_OF,
+        output_format=output_format,
+    )
+    seconds = time.perf_counter() - started
+    return [{"step": "generate_data", "seconds": seconds, "rows": sum(row_counts.values())}]
+
+
+def measure_ingest(workdir: Path, workers: int) -> list[dict]:
+    from ingest_raw_to_duckdb import ingest_csvs
+
+    started = time.perf_counter()
+    results = ingest_csvs(workdir / "raw", workdir / "ramp.duckdb", "raw", workers=workers)
+    seconds = time.perf_counter() - started
+    steps = [
+        {"step": "ingest_csvs", "seconds": seconds, "rows": sum(r["rows"] for r in results)}
+    ]
+    steps += [
+        {"step": f"ingest_csvs.{r['table']}", "seconds": r["seconds"], "rows": r["rows"]}
+        for r in results
+    ]
+    return steps
+
+
+def measure_dbt(workdir: Path) -> list[dict]:
+    """`dbt build` once; one step per model and snapshot from its run results."""
+    import duckdb
+    from dbt.cli.main import dbtRunner
+
+    db_path = workdir / "ramp.duckdb"
+    os.environ["DBT_DUCKDB_PATH"] = str(db_path)
+    started = time.perf_counter()
+    result = dbtRunner().invoke(
+        [
+            "build",
+            "--project-dir",
+            str(PROJECT_DIR),
+            "--profiles-dir",
+            str(PROJECT_DIR),
+            "--target-path",
+            str(workdir / "target"),
+            "--vars",
+            json.dumps({"as_of_date": AS_OF.date().isoformat()}),
+            "--quiet",
+        ]
+    )
+    seconds = time.perf_counter() - started
+    if not result.success:
+        raise SystemExit(f"dbt build failed: {result.exception or ''}")
+
+    nodes = [
+        run.node
+        for run in result.result.results
+        if run.node.resource_type in ("model", "snapshot")
+    ]
+    timings = {run.node.unique_id: run.execution_time for run in result.result.results}
+    steps = [{"step": "dbt_build", "seconds": seconds, "rows": None}]
+    # dbt-duckdb keeps its read-write connection open; a read-only one would conflict.
+    conn = duckdb.connect(str(db_path))
+    try:
+        for node in nodes:
+            materialized = node.config.materialized
+            # Counting a view would time its query again; only stored relations are counted.
+            rows = (
+                None
+                if materialized in ("view", "ephemeral")
+                else conn.execute(
+                    f"select count(*) from {node.schema}.{node.alias}"
+                ).fetchone()[0]
+            )
+            steps.append(
+                {
+                    "step": f"dbt.{node.name}",
+                    "materialized": materialized,
+                    "seconds": timings[node.unique_id],
+                    "rows": rows,
+                }
+            )
+    finally:
+        conn.close()
+    return steps
+
+
+def measure_loaders(workdir: Path, repeats: int) -> list[dict]:
+    sys.path.insert(0, str(ROOT))
+    import ramp_data
+
+    db_path = workdir / "ramp.duckdb"
+    db_version = ramp_data.db_file_version(db_path)
+    steps = []
+    for name in LOADERS:
+        # __wrapped__ skips st.cache_data, so every repeat runs the query.
+        loader = getattr(ramp_data, name).__wrapped__
+        filters = () if name == "load_filter_options" else (ramp_data.ALL,) * 3
+        loader_args = (db_path, db_version, *filters)
+        loader(*loader_args)  # open the connection pool and warm the buffer pool
+        timings = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            result = loader(*loader_args)
+            timings.append(time.perf_counter() - started)
+        rows = result.num_rows if hasattr(result, "num_rows") else None
+        steps.append(
+            {"step": f"streamlit.{name}", "seconds": statistics.median(timings), "rows": rows}
+        )
+    return steps
+
+
+def measure_stage(stage: str, workdir: Path, args: argparse.Namespace) -> dict:
+    tier = TIERS[args.tier]
+    if stage == "generate":
+        steps = measure_generate(workdir, tier, args.engine, args.format)
+    elif stage == "ingest":
+        steps = measure_ingest(workdir, args.workers)
+    elif stage == "dbt":
+        steps = measure_dbt(workdir)
+    else:
+        steps = measure_loaders(workdir, args.repeats)
+    return {"stage": stage, "peak_rss_mb": peak_rss_mb(), "steps": steps}
+
+
+def stage_python(stage: str, frontend_python: Path | None) -> str:
+    """Loaders need streamlit, which lives in the frontend's own environment."""
+    if stage == "loaders" and frontend_python is not None:
+        return str(frontend_python)
+    return sys.executable
+
+
+def run_isolated(stage: str, workdir: Path, args: argparse.Namespace) -> dict:
+    """Run one stage in a fresh interpreter so its peak RSS is its own."""
+    command = [
+        stage_python(stage, args.frontend_python),
+        __file__,
+        "--measure",
+        stage,
+        "--workdir",
+        str(workdir),
+        "--tier",
+        args.tier,
+        "--engine",
+        args.engine,
+        "--format",
+        args.format,
+        "--workers",
+        str(args.workers),
+        "--repeats",
+        str(args.repeats),
+    ]
+    completed = subprocess.run(command, capture_output=True, text=True, check=False)
+    if completed.returncode != 0:
+        lines = (completed.stderr or completed.stdout).strip().splitlines() or ["no output"]
+        if completed.returncode < 0:
+            lines.append(f"killed by signal {-completed.returncode}")
+        raise SystemExit(f"{stage} stage failed: {lines[-1]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def git_revision() -> dict:
+    def git(*command: str) -> str:
+        completed = subprocess.run(
+            ["git", *command], cwd=ROOT, capture_output=True, text=True, check=False
+        )
+        return completed.stdout.strip()
+
+    return {
+        "git_commit": git("rev-parse", "HEAD") or None,
+        "git_dirty": bool(git("status", "--porcelain")),
+    }
+
+
+def benchmark_tier(args: argparse.Namespace) -> list[dict]:
+    """Run every stage of one tier and flatten the results to one record per step."""
+    run = {
+        "run_id": uuid.uuid4().hex[:12],
+        "recorded_at": dt.datetime.now(dt.UTC).isoformat(timespec="seconds"),
+        **git_revision(),
+        "tier": args.tier,
+        **TIERS[args.tier],
+        "engine": args.engine,
+        "format": args.format,
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+    }
+    records = []
+    workdir = Path(tempfile.mkdtemp(prefix=f"ramp_bench_{args.tier}_"))
+    try:
+        for stage in STAGES:
+            result = run_isolated(stage, workdir, args)
+            for step in result["steps"]:
+                rows = step.get("rows")
+                records.append(
+                    run
+                    | {"stage": stage, "stage_peak_rss_mb": result["peak_rss_mb"]}
+                    | step
+                    | {
+                        "rows_per_second": rows / step["seconds"]
+                        if rows is not None and step["seconds"]
+                        else None
+                    }
+                )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return records
+
+
+def append_history(history: Path, records: list[dict]) -> None:
+    history.parent.mkdir(parents=True, exist_ok=True)
+    with history.open("a") as sink:
+        for record in records:
+            sink.write(json.dumps(record, sort_keys=True) + "\n")
+
+
+def baseline_records(history: Path, tier: str, commit: str | None) -> list[dict]:
+    """Latest recorded run of `tier`, optionally restricted to commits starting with `commit`."""
+    if not history.exists():
+        return []
+    with history.open() as source:
+        records = [json.loads(line) for line in source if line.strip()]
+    records = [
+        record
+        for record in records
+        if record["tier"] == tier
+        and (commit is None or (record.get("git_commit") or "").startswith(commit))
+    ]
+    if not records:
+        return []
+    latest = max(records, key=lambda record: record["recorded_at"])["run_id"]
+    return [record for record in records if record["run_id"] == latest]
+
+
+def print_pipeline_report(records: list[dict], baseline: list[dict]) -> None:
+    before = {record["step"]: record["seconds"] for record in baseline}
+    if baseline:
+        print(
+            f"baseline: run {baseline[0]['run_id']} "
+            f"({(baseline[0].get('git_commit') or 'unknown')[:10]}, {baseline[0]['recorded_at']})"
+        )
+    print(
+        f"{'step':<48} {'seconds':>9} {'rows':>12} {'rows/s':>12} "
+        f"{'stage RSS MB':>13} {'vs base':>8}"
+    )
+    for record in records:
+        rows = f"{record['rows']:,}" if record["rows"] is not None else "-"
+        rate = f"{record['rows_per_second']:,.0f}" if record["rows_per_second"] else "-"
+        change = (
+            f"{record['seconds'] / before[record['step']]:>7.2f}x"
+            if before.get(record["step"])
+            else f"{'-':>8}"
+        )
+        print(
+            f"{record['step']:<48} {record['seconds']:>9.3f} {rows:>12} {rate:>12} "
+            f"{record['stage_peak_rss_mb']:>13,.0f} {change}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Time the pipeline end to end at a fixed scale tier: synthetic data "
+            "generation, ingest, every dbt model, and the dashboard's loader queries. "
+            "Each stage runs in its own process for a clean peak RSS; results are "
+            "appended to a JSONL history and compared with an earlier run."
+        )
+    )
+    parser.add_argument("--tier", choices=list(TIERS), default="small")
+    parser.add_argument("--engine", choices=["loop", "vectorized"], default="vectorized")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--workers", type=int, default=4, help="Ingest worker threads.")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per loader.")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY)
+    parser.add_argument(
+        "--compare",
+        metavar="COMMIT",
+        help="Compare with the latest run of this tier at this commit (default: latest run).",
+    )
+    parser.add_argument(
+        "--frontend-python",
+        type=Path,
+        default=ROOT / "frontend" / ".venv" / "bin" / "python",
+        help="Interpreter with streamlit installed, for the loaders stage.",
+    )
+    parser.add_argument("--no-record", action="store_true", help="Do not append to the history.")
+    parser.add_argument("--measure", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure_stage(args.measure, args.workdir, args)))
+        return
+
+    if not args.frontend_python.exists():
+        args.frontend_python = None
+    baseline = baseline_records(args.history, args.tier, args.compare)
+    records = benchmark_tier(args)
+    print_pipeline_report(records, baseline)
+    if not args.no_record:
+        append_history(args.history, records)
+        print(f"\nappended {len(records)} records to {args.history}")
+
+
+if __name__ == "__main__":
+    main()
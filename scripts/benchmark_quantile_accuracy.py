@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+import duckdb
+
+METRICS = ["utilization", "cost_per_active_seat"]
+QUANTILES = [0.25, 0.5, 0.75]
+# Cohort levels the benchmarks are published at, finest first. Each coarser level is
+# answered three ways: exact and approx rescan the rows, sketch merges the cohort buckets.
+LEVELS = {
+    "cohort": ["industry", "employee_band", "region"],
+    "industry_band": ["industry", "employee_band"],
+    "industry": ["industry"],
+    "region": ["region"],
+    "global": [],
+}
+
+
+def load_cohort_values(conn: duckdb.DuckDBPyConnection, db_path: Path, scale: int) -> int:
+    """(cohort, utilization, cost_per_active_seat) rows as mart_benchmarks reads them.
+
+    `scale` > 1 repeats every row with +/-10% jitter so a small warehouse can stand in
+    for a network of many more orgs without collapsing onto the same values.
+    """
+    # Attach under the file's stem: dbt-duckdb views reference that catalog name.
+    conn.execute(f"attach '{db_path}' as {db_path.stem} (read_only)")
+    conn.execute("select setseed(0.42)")
+    conn.execute(
+        f"""
+        create table cohort_values as
+        select
+            orgs.industry,
+            orgs.employee_band,
+            orgs.region,
+            case
+                when copy.range = 0 then app_metrics.utilization_rate
+                else least(app_metrics.utilization_rate * (0.9 + 0.2 * random()), 1)
+            end as utilization,
+            case
+                when copy.range = 0 then app_metrics.cost_per_active_seat
+                else app_metrics.cost_per_active_seat * (0.9 + 0.2 * random())
+            end as cost_per_active_seat
+        from {db_path.stem}.analytics.int_app_metrics as app_metrics
+        left join {db_path.stem}.analytics.stg_orgs as orgs
+            on app_metrics.org_id = orgs.org_id
+        cross join range({scale}) as copy
+        where app_metrics.utilization_rate is not null
+        """
+    )
+    conn.execute(f"detach {db_path.stem}")
+    return conn.execute("select count(*) from cohort_values").fetchone()[0]
+
+
+def build_sketches(conn: duckdb.DuckDBPyConnection, relative_accuracy: float) -> int:
+    """Same buckets as int_benchmark_sketches: ceil(log_gamma(value)), null for zero."""
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+    bucket = f"case when metric_value > 0 then cast(ceil(ln(metric_value) / ln({gamma})) as integer) end"
+    conn.execute(
+        f"""
+        create table sketches as
+        with metric_values as (
+            select industry, employee_band, region, 'utilization' as metric,
+                utilization as metric_value
+            from cohort_values
+            union all
+            select industry, employee_band, region, 'cost_per_active_seat',
+                cost_per_active_seat
+            from cohort_values
+            where cost_per_active_seat is not null
+        )
+        select
+            industry,
+            employee_band,
+            region,
+            metric,
+            coalesce(2 * pow({gamma}, {bucket}) / ({gamma} + 1), 0) as bucket_value,
+            count(*) as bucket_count
+        from metric_values
+        group by all
+        """
+    )
+    return conn.execute("select count(*) from sketches").fetchone()[0]
+
+
+def quantile_columns(function: str) -> str:
+    return ", ".join(
+        f"{function}({metric}, {q}) as {metric}_p{int(q * 100)}"
+        for metric in METRICS
+        for q in QUANTILES
+    )
+
+
+def rescan_sql(function: str, columns: list[str]) -> str:
+    keys = ", ".join(columns)
+    return (
+        f"select {keys + ', ' if columns else ''}{quantile_columns(function)} "
+        f"from cohort_values {'group by ' + keys if columns else ''}"
+    )
+
+
+def sketch_sql(columns: list[str]) -> str:
+    """Merge the cohort sketches up to `columns`, then interpolate like quantile_cont."""
+    partition = ", ".join(columns + ["metric"])
+    quantiles = []
+    for metric in METRICS:
+        for q in QUANTILES:
+            position = f"{q} * (total_count - 1)"
+            in_metric = f"metric = '{metric}'"
+            lower = f"min(bucket_value) filter (where {in_metric} and cumulative_count > floor({position}))"
+            upper = f"min(bucket_value) filter (where {in_metric} and cumulative_count > ceil({position}))"
+            fraction = f"max({position} - floor({position})) filter (where {in_metric})"
+            quantiles.append(
+                f"{lower} + {fraction} * ({upper} - {lower}) as {metric}_p{int(q * 100)}"
+            )
+    keys = ", ".join(columns)
+    return f"""
+        with merged as (
+            select {partition}, bucket_value, sum(bucket_count) as bucket_count
+            from sketches
+            group by {partition}, bucket_value
+        ),
+        cumulative as (
+            select
+                *,
+                sum(bucket_count) over (
+                    partition by {partition} order by bucket_value
+                    rows between unbounded preceding and current row
+                ) as cumulative_count,
+                sum(bucket_count) over (partition by {partition}) as total_count
+            from merged
+        )
+        select {keys + ', ' if columns else ''}{', '.join(quantiles)}
+        from cumulative
+        {'group by ' + keys if columns else ''}
+    """
+
+
+def timed_table(conn: duckdb.DuckDBPyConnection, name: str, sql: str) -> float:
+    started = time.perf_counter()
+    conn.execute(f"create or replace table {name} as {sql}")
+    return time.perf_counter() - started
+
+
+def compare(conn: duckdb.DuckDBPyConnection, estimate: str, columns: list[str]) -> dict:
+    """Worst relative error over all cohorts and quantiles of each metric."""
+    errors = ", ".join(
+        f"max(abs(estimate.{metric}_p{int(q * 100)} - reference.{metric}_p{int(q * 100)})"
+        f" / nullif(abs(reference.{metric}_p{int(q * 100)}), 0))"
+        for metric in METRICS
+        for q in QUANTILES
+    )
+    join = f"using ({', '.join(columns)})" if columns else "on true"
+    row = conn.execute(
+        f"select count(*), {errors} from exact as reference "
+        f"inner join {estimate} as estimate {join}"
+    ).fetchone()
+    per_metric = len(QUANTILES)
+    return {
+        "cohorts": row[0],
+        **{
+            f"{metric}_max_rel_error": max(
+                (value for value in row[1 + i * per_metric : 1 + (i + 1) * per_metric] if value is not None),
+                default=0.0,
+            )
+            for i, metric in enumerate(METRICS)
+        },
+    }
+
+
+def benchmark_accuracy(db_path: Path, scale: int, relative_accuracy: float) -> tuple[dict, list[dict]]:
+    conn = duckdb.connect()
+    try:
+        rows = load_cohort_values(conn, db_path, scale)
+        started = time.perf_counter()
+        sketch_rows = build_sketches(conn, relative_accuracy)
+        build = {
+            "rows": rows,
+            "sketch_rows": sketch_rows,
+            "sketch_build_seconds": time.perf_counter() - started,
+        }
+        results = []
+        for level, columns in LEVELS.items():
+            exact_seconds = timed_table(conn, "exact", rescan_sql("quantile_cont", columns))
+            approx_seconds = timed_table(conn, "approx", rescan_sql("approx_quantile", columns))
+            sketch_seconds = timed_table(conn, "sketch", sketch_sql(columns))
+            for method, seconds in [
+                ("exact", exact_seconds),
+                ("approx", approx_seconds),
+                ("sketch", sketch_seconds),
+            ]:
+                results.append(
+                    {"level": level, "method": method, "seconds": seconds}
+                    | compare(conn, method, columns)
+                )
+        return build, results
+    finally:
+        conn.close()
+
+
+def print_accuracy_report(build: dict, results: list[dict], relative_accuracy: float) -> None:
+    print(
+        f"{build['rows']:,} (org, app) rows -> {build['sketch_rows']:,} sketch buckets "
+        f"in {build['sketch_build_seconds']:.2f}s (bound: {relative_accuracy:.2%} relative)"
+    )
+    print(
+        f"{'level':<14} {'method':<7} {'cohorts':>8} {'seconds':>8} "
+        f"{'utilization err':>16} {'cost/seat err':>14}"
+    )
+    for result in results:
+        print(
+            f"{result['level']:<14} {result['method']:<7} {result['cohorts']:>8,} "
+            f"{result['seconds']:>8.3f} {result['utilization_max_rel_error']:>16.3%} "
+            f"{result['cost_per_active_seat_max_rel_error']:>14.3%}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare exact, approx_quantile and merged-sketch benchmark quantiles "
+            "(max relative error vs exact, and time) at each cohort level."
+        )
+    )
+    parser.add_argument("--db-path", default="warehouse/ramp.duckdb")
+    parser.add_argument(
+        "--scale", type=int, default=1, help="Repeat each (org, app) row this many times."
+    )
+    parser.add_argument(
+        "--relative-accuracy",
+        type=float,
+        default=0.01,
+        help="Sketch accuracy; match the benchmark_sketch_relative_accuracy dbt var.",
+    )
+    args = parser.parse_args()
+
+    build, results = benchmark_accuracy(Path(args.db_path), args.scale, args.relative_accuracy)
+    print_accuracy_report(build, results, args.relative_accuracy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import argparse
+import json
+import pickle
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import duckdb
+
+ROOT = Path(__file__).resolve().parents[1]
+FORMATS = ["pandas", "arrow"]
+OVERVIEW_SQL = "select * from analytics.mart_app_overview"
+
+
+def build_scaled_mart(source_db: Path, target_db: Path, rows: int) -> int:
+    """Repeat mart_app_overview until it holds `rows` rows, renaming orgs per copy."""
+    conn = duckdb.connect(str(target_db))
+    try:
+        conn.execute(f"attach '{source_db}' as source (read_only)")
+        source_rows = conn.execute(
+            "select count(*) from source.analytics.mart_app_overview"
+        ).fetchone()[0]
+        copies = -(-rows // source_rows)
+        conn.execute("create schema analytics")
+        conn.execute(
+            f"""
+            create table analytics.mart_app_overview as
+            select overview.* replace (
+                overview.org_id || '_' || copy.range as org_id,
+                overview.org_name || ' ' || (copy.range % 500) as org_name
+            )
+            from source.analytics.mart_app_overview as overview
+            cross join range({copies}) as copy
+            order by org_id, app_id
+            limit {rows}
+            """
+        )
+        return conn.execute("select count(*) from analytics.mart_app_overview").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def peak_rss_mb() -> float:
+    """High-water RSS of this process image; ru_maxrss would include the parent's pre-exec peak."""
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(result_format: str, db_path: Path) -> dict:
+    """Load the overview the way the dashboard does and report time, size and pickle cost."""
+    sys.path.insert(0, str(ROOT))
+    import ramp_data
+
+    baseline_rss_mb = peak_rss_mb()
+    started = time.perf_counter()
+    if result_format == "arrow":
+        result = ramp_data.query_arrow(db_path, OVERVIEW_SQL)
+        result_bytes = result.nbytes
+    else:
+        result = ramp_data.query_df(db_path, OVERVIEW_SQL)
+        result_bytes = int(result.memory_usage(deep=True).sum())
+    load_seconds = time.perf_counter() - started
+
+    # st.cache_data pickles every value it stores.
+    started = time.perf_counter()
+    pickled = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+    pickle_seconds = time.perf_counter() - started
+
+    return {
+        "format": result_format,
+        "rows": len(result),
+        "load_seconds": load_seconds,
+        "result_mb": result_bytes / 1_000_000,
+        "pickle_seconds": pickle_seconds,
+        "pickle_mb": len(pickled) / 1_000_000,
+        "peak_rss_mb": peak_rss_mb(),
+        "load_rss_mb": peak_rss_mb() - baseline_rss_mb,
+    }
+
+
+def run_isolated(result_format: str, db_path: Path) -> dict:
+    """Measure in a fresh interpreter so peak RSS belongs to one format only."""
+    completed = subprocess.run(
+        [sys.executable, __file__, "--measure", result_format, "--db-path", str(db_path)],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode < 0:
+        return {"format": result_format, "error": f"killed by signal {-completed.returncode}"}
+    if completed.returncode != 0:
+        return {"format": result_format, "error": completed.stderr.strip().splitlines()[-1]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def print_format_comparison(results: list[dict]) -> None:
+    print(
+        f"{'format':<8} {'rows':>12} {'load s':>8} {'result MB':>10} "
+        f"{'pickle s':>9} {'pickle MB':>10} {'peak RSS MB':>12} {'+RSS MB':>8}"
+    )
+    for result in results:
+        if "error" in result:
+            print(f"{result['format']:<8} failed: {result['error']}")
+            continue
+        print(
+            f"{result['format']:<8} {result['rows']:>12,} {result['load_seconds']:>8.2f} "
+            f"{result['result_mb']:>10,.1f} {result['pickle_seconds']:>9.2f} "
+            f"{result['pickle_mb']:>10,.1f} {result['peak_rss_mb']:>12,.0f} "
+            f"{result['load_rss_mb']:>8,.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare pandas (.df()) and Arrow results for the dashboard's overview "
+            "query on a scaled copy of mart_app_overview. Run from the frontend "
+            "project so ramp_data is importable."
+        )
+    )
+    parser.add_argument("--db-path", default=str(ROOT / "warehouse" / "ramp.duckdb"))
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument("--measure", choices=FORMATS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(args.measure, Path(args.db_path))))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        scaled_db = Path(tmp_dir) / "scaled.duckdb"
+        rows = build_scaled_mart(Path(args.db_path), scaled_db, args.rows)
+        print(f"scaled mart_app_overview: {rows:,} rows")
+        print_format_comparison([run_isolated(fmt, scaled_db) for fmt in args.formats])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import duckdb
+from dbt.cli.main import dbtRunner
+
+ROOT = Path(__file__).resolve().parents[1]
+PROJECT_DIR = ROOT / "ramp_analytics"
+# Everything that changes what dbt would build, besides the raw data and the as-of date.
+PROJECT_GLOBS = ["dbt_project.yml", "models/**/*", "macros/**/*", "snapshots/**/*"]
+AS_OF_MACROS = {"macro.ramp_analytics.as_of_date", "macro.ramp_analytics.as_of_timestamp"}
+
+
+def project_fingerprint() -> str:
+    digest = hashlib.sha256()
+    for pattern in PROJECT_GLOBS:
+        for path in sorted(PROJECT_DIR.glob(pattern)):
+            if path.is_file():
+                digest.update(path.relative_to(PROJECT_DIR).as_posix().encode())
+                digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def raw_fingerprint(conn: duckdb.DuckDBPyConnection, raw_schema: str) -> str:
+    """Row count and order-independent sum of row hashes per raw table."""
+    digest = hashlib.sha256()
+    tables = conn.execute(
+        "select table_name from information_schema.tables "
+        "where table_schema = ? order by table_name",
+        [raw_schema],
+    ).fetchall()
+    for (table_name,) in tables:
+        rows, row_hash = conn.execute(
+            f"select count(*), coalesce(sum(hash(t)), 0) from {raw_schema}.{table_name} as t"
+        ).fetchone()
+        digest.update(f"{table_name}:{rows}:{row_hash}".encode())
+    return digest.hexdigest()
+
+
+def inputs_fingerprint(db_path: Path, raw_schema: str) -> str:
+    """Raw data plus dbt project; dbt never writes to the raw schema, so one read suffices."""
+    conn = duckdb.connect(str(db_path))
+    try:
+        raw = raw_fingerprint(conn, raw_schema)
+    finally:
+        conn.close()
+    return hashlib.sha256(f"{raw}:{project_fingerprint()}".encode()).hexdigest()
+
+
+def build_fingerprint(inputs: str, as_of: dt.date) -> str:
+    return hashlib.sha256(f"{as_of}:{inputs}".encode()).hexdigest()
+
+
+def ensure_build_log(db_path: Path, meta_schema: str) -> None:
+    conn = duckdb.connect(str(db_path))
+    try:
+        conn.execute(f"create schema if not exists {meta_schema}")
+        conn.execute(
+            f"""
+            create table if not exists {meta_schema}.dbt_builds (
+                as_of_date date,
+                fingerprint varchar,
+                selection varchar,
+                seconds double,
+                built_at timestamp
+            )
+            """
+        )
+    finally:
+        conn.close()
+
+
+def recorded_builds(db_path: Path, meta_schema: str) -> list[tuple[dt.date, str]]:
+    """(as_of_date, fingerprint) of past builds, newest first."""
+    conn = duckdb.connect(str(db_path))
+    try:
+        return conn.execute(
+            f"select as_of_date, fingerprint from {meta_schema}.dbt_builds order by built_at desc"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+def record_build(
+    db_path: Path, meta_schema: str, as_of: dt.date, fingerprint: str, selection: str, seconds: float
+) -> None:
+    conn = duckdb.connect(str(db_path))
+    try:
+        conn.execute(
+            f"insert into {meta_schema}.dbt_builds values (?, ?, ?, ?, current_timestamp)",
+            [as_of, fingerprint, selection, seconds],
+        )
+    finally:
+        conn.close()
+
+
+def as_of_selection(manifest) -> list[str]:
+    """Nodes that call an as-of macro (directly or via another macro), plus descendants."""
+    as_of_macros = set(AS_OF_MACROS)
+    changed = True
+    while changed:
+        changed = False
+        for unique_id, macro in manifest.macros.items():
+            if unique_id not in as_of_macros and as_of_macros & set(macro.depends_on.macros):
+                as_of_macros.add(unique_id)
+                changed = True
+    return sorted(
+        f"{node.name}+"
+        for node in manifest.nodes.values()
+        if node.resource_type in ("model", "snapshot")
+        and node.package_name == "ramp_analytics"
+        and as_of_macros & set(node.depends_on.macros)
+    )
+
+
+def latest_snapshot_date(db_path: Path, manifest) -> dt.date | None:
+    """Date of the newest version in any snapshot; new versions must not predate it."""
+    conn = duckdb.connect(str(db_path))
+    try:
+        latest = None
+        for node in manifest.nodes.values():
+            if node.resource_type != "snapshot":
+                continue
+            exists = conn.execute(
+                "select count(*) from information_schema.tables "
+                "where table_schema = ? and table_name = ?",
+                [node.schema, node.alias],
+            ).fetchone()[0]
+            if not exists:
+                continue
+            value = conn.execute(
+                f"select max(dbt_valid_from)::date from {node.schema}.{node.alias}"
+            ).fetchone()[0]
+            if value is not None and (latest is None or value > latest):
+                latest = value
+        return latest
+    finally:
+        conn.close()
+
+
+def run_dbt(runner: dbtRunner, as_of: dt.date, selection: list[str] | None) -> None:
+    args = [
+        "build",
+        "--project-dir",
+        str(PROJECT_DIR),
+        "--profiles-dir",
+        str(PROJECT_DIR),
+        "--vars",
+        json.dumps({"as_of_date": as_of.isoformat()}),
+    ]
+    if selection:
+        args += ["--select", *selection]
+    result = runner.invoke(args)
+    if not result.success:
+        raise SystemExit(f"dbt build failed for as_of_date={as_of}: {result.exception or ''}")
+
+
+def build_as_of(
+    db_path: Path,
+    dates: list[dt.date],
+    raw_schema: str,
+    meta_schema: str,
+    force: bool,
+    backfill: bool,
+) -> list[dict]:
+    # dbt-duckdb keeps its connection open in this process; ours must match its path and
+    # (read-write) configuration to share the database instance.
+    db_path = db_path.resolve()
+    os.environ["DBT_DUCKDB_PATH"] = str(db_path)
+    ensure_build_log(db_path, meta_schema)
+
+    # Parse once; every date reuses the manifest (vars are applied when SQL is rendered).
+    parsed = dbtRunner().invoke(
+        ["parse", "--project-dir", str(PROJECT_DIR), "--profiles-dir", str(PROJECT_DIR)]
+    )
+    if not parsed.success:
+        raise SystemExit(f"dbt parse failed: {parsed.exception or ''}")
+    manifest = parsed.result
+    runner = dbtRunner(manifest=manifest)
+
+    inputs = inputs_fingerprint(db_path, raw_schema)
+    builds = recorded_builds(db_path, meta_schema)
+    pending = []
+    for as_of in dates:
+        fingerprint = build_fingerprint(inputs, as_of)
+        # The warehouse reflects the newest build; a backfill can also resume past dates.
+        up_to_date = builds[:1] == [(as_of, fingerprint)] or (
+            backfill and (as_of, fingerprint) in builds
+        )
+        if force or not up_to_date:
+            pending.append((as_of, fingerprint))
+
+    selection = as_of_selection(manifest) if backfill else None
+    if pending:
+        # The snapshot pre-hook refuses these too, but only after the models were rebuilt.
+        latest = latest_snapshot_date(db_path, manifest)
+        if latest is not None and pending[0][0] < latest:
+            raise SystemExit(
+                f"Snapshots already hold versions from {latest}; as-of dates must not be "
+                "earlier, or build into a fresh copy of the warehouse."
+            )
+
+    results = {as_of: {"as_of_date": as_of, "status": "unchanged", "seconds": 0.0} for as_of in dates}
+    for as_of, fingerprint in pending:
+        started = time.perf_counter()
+        run_dbt(runner, as_of, selection)
+        seconds = time.perf_counter() - started
+        record_build(
+            db_path, meta_schema, as_of, fingerprint, " ".join(selection or ["all"]), seconds
+        )
+        results[as_of] = {"as_of_date": as_of, "status": "built", "seconds": seconds}
+    return list(results.values())
+
+
+def date_range(start: dt.date, end: dt.date) -> list[dt.date]:
+    return [start + dt.timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run dbt build for an as-of date, skipping it when the raw data, the dbt "
+            "project and the date match the last build. --backfill-from builds a range "
+            "of past dates in one dbt session, limited to the as-of dependent models."
+        )
+    )
+    parser.add_argument("--db-path", type=Path, default=Path("warehouse/ramp.duckdb"))
+    parser.add_argument(
+        "--as-of",
+        type=dt.date.fromisoformat,
+        default=dt.datetime.now(dt.UTC).date(),
+        help="As-of date (default: today, UTC). With --backfill-from, the last date.",
+    )
+    parser.add_argument("--backfill-from", type=dt.date.fromisoformat)
+    parser.add_argument("--raw-schema", default="raw")
+    parser.add_argument("--meta-schema", default="meta")
+    parser.add_argument("--force", action="store_true", help="Build even if nothing changed.")
+    args = parser.parse_args()
+
+    backfill = args.backfill_from is not None
+    dates = date_range(args.backfill_from, args.as_of) if backfill else [args.as_of]
+    results = build_as_of(
+        args.db_path, dates, args.raw_schema, args.meta_schema, args.force, backfill
+    )
+    for result in results:
+        print(f"{result['as_of_date']}  {result['status']:<9} {result['seconds']:>7.2f}s")
+
+
+if __name__ == "__main__":
+    main()
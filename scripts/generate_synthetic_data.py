@@ -4,10 +4,16 @@ import argparse
 import datetime as dt
 import random
 import re
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
+from typing import Self
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from faker import Faker
 
 APP_CATALOG = [
@@ -215,6 +221,139 @@ ACTIVITY_TYPES = {
     "Security": ["policy_update", "login_audit", "app_assign"],
 }
 
+DEPARTMENT_WEIGHTS = [
+    0.22, 0.1, 0.14, 0.1, 0.08, 0.05, 0.07, 0.06, 0.06, 0.04, 0.03, 0.03, 0.01, 0.01
+]
+
+USER_STATUSES = ["active", "suspended", "deprovisioned"]
+USER_STATUS_WEIGHTS = [0.85, 0.1, 0.05]
+
+# Activity level weights conditioned on user status (deprovisioned users are always inactive).
+ACTIVITY_LEVEL_WEIGHTS = {
+    "active": {"active": 0.7, "dormant": 0.2, "inactive": 0.1},
+    "suspended": {"dormant": 0.6, "inactive": 0.4},
+    "deprovisioned": {"inactive": 1.0},
+}
+
+# (low, high) uniform bounds keyed by core app / targeted department / everyone else.
+ADOPTION_RATE_BOUNDS = {"core": (0.8, 0.95), "target": (0.45, 0.7), "other": (0.1, 0.3)}
+USAGE_PROBABILITY_BOUNDS = {"core": (0.7, 0.9), "target": (0.4, 0.7), "other": (0.15, 0.35)}
+
+# Column types per raw table; Parquet output is written with these types and
+# CSV output renders them in the same ISO formats the loop engine produces.
+TABLE_SCHEMAS: dict[str, dict[str, str]] = {
+    "raw_orgs": {
+        "org_id": "string",
+        "org_name": "string",
+        "industry": "string",
+        "employee_count": "int",
+        "employee_band": "string",
+        "region": "string",
+        "created_at": "timestamp",
+    },
+    "raw_okta_users": {
+        "org_id": "string",
+        "user_id": "string",
+        "first_name": "string",
+        "last_name": "string",
+        "email": "string",
+        "department": "string",
+        "title": "string",
+        "status": "string",
+        "is_admin": "bool",
+        "created_at": "timestamp",
+        "last_login_at": "timestamp",
+    },
+    "raw_okta_groups": {
+        "org_id": "string",
+        "group_id": "string",
+        "group_name": "string",
+        "department": "string",
+    },
+    "raw_okta_apps": {
+        "org_id": "string",
+        "app_id": "string",
+        "app_key": "string",
+        "app_name": "string",
+        "category": "string",
+        "vendor": "string",
+        "enabled_at": "timestamp",
+        "base_price": "double",
+        "target_departments": "string",
+        "core": "bool",
+        "core_app": "bool",
+    },
+    "raw_okta_assignments": {
+        "org_id": "string",
+        "assignment_id": "string",
+        "user_id": "string",
+        "app_id": "string",
+        "assigned_at": "timestamp",
+        "assigned_by": "string",
+    },
+    "raw_okta_logins": {
+        "org_id": "string",
+        "login_id": "string",
+        "user_id": "string",
+        "app_id": "string",
+        "login_ts": "timestamp",
+        "device": "string",
+        "ip_address": "string",
+    },
+    "raw_saas_usage": {
+        "org_id": "string",
+        "usage_id": "string",
+        "user_id": "string",
+        "app_id": "string",
+        "activity_ts": "timestamp",
+        "activity_type": "string",
+        "duration_minutes": "int",
+    },
+    "raw_saas_contracts": {
+        "org_id": "string",
+        "contract_id": "string",
+        "app_id": "string",
+        "app_key": "string",
+        "start_date": "date",
+        "end_date": "date",
+        "term_months": "int",
+        "price_per_seat": "double",
+        "min_seats": "int",
+        "billing_frequency": "string",
+        "currency": "string",
+    },
+    "raw_saas_invoices": {
+        "org_id": "string",
+        "invoice_id": "string",
+        "contract_id": "string",
+        "app_id": "string",
+        "invoice_date": "date",
+        "seats_billed": "int",
+        "total_amount": "double",
+        "currency": "string",
+    },
+}
+
+TABLE_NAMES = list(TABLE_SCHEMAS)
+
+ARROW_TYPES = {
+    "string": pa.string(),
+    "int": pa.int64(),
+    "double": pa.float64(),
+    "bool": pa.bool_(),
+    "timestamp": pa.timestamp("s"),
+    "date": pa.date32(),
+}
+
+ENGINES = ["loop", "vectorized"]
+OUTPUT_FORMATS = ["csv", "parquet"]
+DEFAULT_FLUSH_ROWS = 250_000
+MAX_BUFFERED_FRAMES = 64
+
+NAME_POOL_SIZE = 2_000
+JOB_POOL_SIZE = 500
+SECONDS_PER_DAY = 86_400
+
 
 def slugify(value: str) -> str:
     cleaned = re.sub(r"[^a-z0-9]+", "", value.lower())
@@ -233,6 +372,11 @@ def employee_band(employee_count: int) -> str:
     return "1000+"
 
 
+def org_seed(seed: int, org_index: int) -> int:
+    """Derive a stable per-org seed so any org can be generated independently of the others."""
+    return int(np.random.SeedSequence([seed, org_index]).generate_state(1)[0])
+
+
 def random_datetime(rng: random.Random, start: dt.datetime, end: dt.datetime) -> dt.datetime:
     if start >= end:
         return start
@@ -257,36 +401,36 @@ def choose_apps_for_org(rng: random.Random) -> list[dict]:
     return [catalog_by_key[key] for key in selected_keys]
 
 
-def adoption_rate(app: dict, department: str, rng: random.Random) -> float:
+def rate_segment(app: dict, department: str) -> str:
     if app["core"]:
-        return rng.uniform(0.8, 0.95)
+        return "core"
     if department in app["target_departments"]:
-        return rng.uniform(0.45, 0.7)
-    return rng.uniform(0.1, 0.3)
+        return "target"
+    return "other"
+
+
+def adoption_rate(app: dict, department: str, rng: random.Random) -> float:
+    return rng.uniform(*ADOPTION_RATE_BOUNDS[rate_segment(app, department)])
 
 
 def usage_probability(app: dict, department: str, rng: random.Random) -> float:
-    if app["core"]:
-        return rng.uniform(0.7, 0.9)
-    if department in app["target_departments"]:
-        return rng.uniform(0.4, 0.7)
-    return rng.uniform(0.15, 0.35)
+    return rng.uniform(*USAGE_PROBABILITY_BOUNDS[rate_segment(app, department)])
 
 
-def generate_data(
-    out_dir: Path,
+def generate_org_rows_loop(
+    org_index: int,
     seed: int,
-    orgs: int,
+    faker: Faker,
     min_employees: int,
     max_employees: int,
     months: int,
-) -> None:
-    rng = random.Random(seed)
-    np_rng = np.random.default_rng(seed)
-    faker = Faker()
-    faker.seed_instance(seed)
-
-    today = dt.datetime.now(dt.UTC).replace(tzinfo=None, microsecond=0)
+    today: dt.datetime,
+) -> dict[str, list[dict]]:
+    """Generate one org's rows into org-local buffers so per-org cost never depends on prior orgs."""
+    org_seed_value = org_seed(seed, org_index)
+    rng = random.Random(org_seed_value)
+    np_rng = np.random.default_rng(org_seed_value)
+    faker.seed_instance(org_seed_value)
 
     org_rows: list[dict] = []
     user_rows: list[dict] = []
@@ -298,272 +442,887 @@ def generate_data(
     contract_rows: list[dict] = []
     invoice_rows: list[dict] = []
 
-    for org_index in range(orgs):
-        org_id = f"org_{org_index:03d}"
-        org_name = faker.company()
-        industry = rng.choice(INDUSTRIES)
-        region = rng.choice(REGIONS)
-        employee_count = int(
-            np.clip(
-                np_rng.lognormal(mean=5.5, sigma=0.45),
-                min_employees,
-                max_employees,
-            )
-        )
-        org_created_at = random_datetime(
-            rng, today - dt.timedelta(days=365 * 5), today - dt.timedelta(days=30)
+    org_id = f"org_{org_index:03d}"
+    org_name = faker.company()
+    industry = rng.choice(INDUSTRIES)
+    region = rng.choice(REGIONS)
+    employee_count = int(
+        np.clip(
+            np_rng.lognormal(mean=5.5, sigma=0.45),
+            min_employees,
+            max_employees,
         )
-        org_rows.append(
+    )
+    org_created_at = random_datetime(
+        rng, today - dt.timedelta(days=365 * 5), today - dt.timedelta(days=30)
+    )
+    org_rows.append(
+        {
+            "org_id": org_id,
+            "org_name": org_name,
+            "industry": industry,
+            "employee_count": employee_count,
+            "employee_band": employee_band(employee_count),
+            "region": region,
+            "created_at": org_created_at.isoformat(),
+        }
+    )
+
+    domain = slugify(org_name)
+    department_weights = np.array(DEPARTMENT_WEIGHTS)
+    department_weights = department_weights / department_weights.sum()
+
+    admin_user_ids: list[str] = []
+    user_activity: dict[str, str] = {}
+
+    for user_index in range(employee_count):
+        user_id = f"{org_id}_user_{user_index:04d}"
+        first_name = faker.first_name()
+        last_name = faker.last_name()
+        email = f"{first_name}.{last_name}@{domain}.com".lower()
+        department = rng.choices(DEPARTMENTS, weights=department_weights, k=1)[0]
+        status = rng.choices(USER_STATUSES, weights=USER_STATUS_WEIGHTS, k=1)[0]
+        if status == "deprovisioned":
+            activity_level = "inactive"
+        else:
+            level_weights = ACTIVITY_LEVEL_WEIGHTS[status]
+            activity_level = rng.choices(
+                list(level_weights), weights=list(level_weights.values()), k=1
+            )[0]
+
+        created_at = random_datetime(rng, org_created_at, today - dt.timedelta(days=7))
+        if activity_level == "active":
+            last_login_at = random_datetime(rng, today - dt.timedelta(days=30), today)
+        elif activity_level == "dormant":
+            last_login_at = random_datetime(rng, today - dt.timedelta(days=90), today - dt.timedelta(days=31))
+        else:
+            if rng.random() < 0.15:
+                last_login_at = None
+            else:
+                last_login_at = random_datetime(
+                    rng, today - dt.timedelta(days=365), today - dt.timedelta(days=91)
+                )
+
+        is_admin = rng.random() < 0.05
+        if is_admin:
+            admin_user_ids.append(user_id)
+
+        user_activity[user_id] = activity_level
+        user_rows.append(
             {
                 "org_id": org_id,
-                "org_name": org_name,
-                "industry": industry,
-                "employee_count": employee_count,
-                "employee_band": employee_band(employee_count),
-                "region": region,
-                "created_at": org_created_at.isoformat(),
+                "user_id": user_id,
+                "first_name": first_name,
+                "last_name": last_name,
+                "email": email,
+                "department": department,
+                "title": faker.job(),
+                "status": status,
+                "is_admin": is_admin,
+                "created_at": created_at.isoformat(),
+                "last_login_at": last_login_at.isoformat() if last_login_at else None,
             }
         )
 
-        domain = slugify(org_name)
-        department_weights = np.array(
-            [0.22, 0.1, 0.14, 0.1, 0.08, 0.05, 0.07, 0.06, 0.06, 0.04, 0.03, 0.03, 0.01, 0.01]
+    for dept in DEPARTMENTS:
+        group_rows.append(
+            {
+                "org_id": org_id,
+                "group_id": f"{org_id}_group_{slugify(dept)}",
+                "group_name": f"{dept} Team",
+                "department": dept,
+            }
         )
-        department_weights = department_weights / department_weights.sum()
-
-        admin_user_ids: list[str] = []
-        user_activity: dict[str, str] = {}
-
-        for user_index in range(employee_count):
-            user_id = f"{org_id}_user_{user_index:04d}"
-            first_name = faker.first_name()
-            last_name = faker.last_name()
-            email = f"{first_name}.{last_name}@{domain}.com".lower()
-            department = rng.choices(DEPARTMENTS, weights=department_weights, k=1)[0]
-            status = rng.choices(
-                ["active", "suspended", "deprovisioned"], weights=[0.85, 0.1, 0.05], k=1
-            )[0]
-            if status == "deprovisioned":
-                activity_level = "inactive"
-            elif status == "suspended":
-                activity_level = rng.choices(["dormant", "inactive"], weights=[0.6, 0.4], k=1)[0]
-            else:
-                activity_level = rng.choices(
-                    ["active", "dormant", "inactive"], weights=[0.7, 0.2, 0.1], k=1
-                )[0]
 
-            created_at = random_datetime(rng, org_created_at, today - dt.timedelta(days=7))
-            if activity_level == "active":
-                last_login_at = random_datetime(rng, today - dt.timedelta(days=30), today)
-            elif activity_level == "dormant":
-                last_login_at = random_datetime(rng, today - dt.timedelta(days=90), today - dt.timedelta(days=31))
-            else:
-                if rng.random() < 0.15:
-                    last_login_at = None
-                else:
-                    last_login_at = random_datetime(
-                        rng, today - dt.timedelta(days=365), today - dt.timedelta(days=91)
-                    )
+    selected_apps = choose_apps_for_org(rng)
+    org_app_records: list[dict] = []
+    for app in selected_apps:
+        app_id = f"{org_id}_app_{app['app_key']}"
+        enabled_at = random_datetime(rng, org_created_at, today - dt.timedelta(days=15))
+        app_record = {
+            "org_id": org_id,
+            "app_id": app_id,
+            "app_key": app["app_key"],
+            "app_name": app["app_name"],
+            "category": app["category"],
+            "vendor": app["vendor"],
+            "enabled_at": enabled_at.isoformat(),
+            "base_price": app["base_price"],
+            "target_departments": app["target_departments"],
+            "core": app["core"],
+            "core_app": app["core"],
+        }
+        app_rows.append(app_record)
+        org_app_records.append(app_record)
 
-            is_admin = rng.random() < 0.05
-            if is_admin:
-                admin_user_ids.append(user_id)
+    admins = admin_user_ids or ["system"]
+    # One assignment per (user, app), so a running count equals distinct assigned users.
+    assigned_counts: dict[str, int] = {}
+    for user in user_rows:
+        dept = user["department"]
+        activity_level = user_activity[user["user_id"]]
+        last_login_at = (
+            dt.datetime.fromisoformat(user["last_login_at"])
+            if user["last_login_at"]
+            else None
+        )
 
-            user_activity[user_id] = activity_level
-            user_rows.append(
-                {
-                    "org_id": org_id,
-                    "user_id": user_id,
-                    "first_name": first_name,
-                    "last_name": last_name,
-                    "email": email,
-                    "department": department,
-                    "title": faker.job(),
-                    "status": status,
-                    "is_admin": is_admin,
-                    "created_at": created_at.isoformat(),
-                    "last_login_at": last_login_at.isoformat() if last_login_at else None,
-                }
-            )
+        for app in org_app_records:
+            rate = adoption_rate(app, dept, rng)
+            if rng.random() > rate:
+                continue
 
-        for dept in DEPARTMENTS:
-            group_rows.append(
+            assigned_at = random_datetime(
+                rng, dt.datetime.fromisoformat(user["created_at"]), today - dt.timedelta(days=1)
+            )
+            assignment_rows.append(
                 {
                     "org_id": org_id,
-                    "group_id": f"{org_id}_group_{slugify(dept)}",
-                    "group_name": f"{dept} Team",
-                    "department": dept,
+                    "assignment_id": f"{user['user_id']}_{app['app_id']}",
+                    "user_id": user["user_id"],
+                    "app_id": app["app_id"],
+                    "assigned_at": assigned_at.isoformat(),
+                    "assigned_by": rng.choice(admins),
                 }
             )
+            assigned_counts[app["app_id"]] = assigned_counts.get(app["app_id"], 0) + 1
 
-        selected_apps = choose_apps_for_org(rng)
-        org_app_records: list[dict] = []
-        for app in selected_apps:
-            app_id = f"{org_id}_app_{app['app_key']}"
-            enabled_at = random_datetime(rng, org_created_at, today - dt.timedelta(days=15))
-            app_record = {
-                "org_id": org_id,
-                "app_id": app_id,
-                "app_key": app["app_key"],
-                "app_name": app["app_name"],
-                "category": app["category"],
-                "vendor": app["vendor"],
-                "enabled_at": enabled_at.isoformat(),
-                "base_price": app["base_price"],
-                "target_departments": app["target_departments"],
-                "core": app["core"],
-                "core_app": app["core"],
-            }
-            app_rows.append(app_record)
-            org_app_records.append(app_record)
-
-        admins = admin_user_ids or ["system"]
-        user_lookup = [row for row in user_rows if row["org_id"] == org_id]
-
-        for user in user_lookup:
-            dept = user["department"]
-            activity_level = user_activity[user["user_id"]]
-            last_login_at = (
-                dt.datetime.fromisoformat(user["last_login_at"])
-                if user["last_login_at"]
-                else None
-            )
+            if not last_login_at:
+                continue
+            if last_login_at < today - dt.timedelta(days=90):
+                continue
 
-            for app in org_app_records:
-                rate = adoption_rate(app, dept, rng)
-                if rng.random() > rate:
-                    continue
+            if activity_level == "active":
+                login_count = rng.randint(6, 20)
+            elif activity_level == "dormant":
+                login_count = rng.randint(1, 3)
+            else:
+                login_count = 0
 
-                assigned_at = random_datetime(
-                    rng, dt.datetime.fromisoformat(user["created_at"]), today - dt.timedelta(days=1)
-                )
-                assignment_rows.append(
+            if login_count == 0:
+                continue
+            if rng.random() > usage_probability(app, dept, rng):
+                continue
+
+            window_start = max(last_login_at - dt.timedelta(days=30), today - dt.timedelta(days=90))
+            for login_index in range(login_count):
+                login_ts = random_datetime(rng, window_start, last_login_at)
+                login_rows.append(
                     {
                         "org_id": org_id,
-                        "assignment_id": f"{user['user_id']}_{app['app_id']}",
+                        "login_id": f"{user['user_id']}_{app['app_id']}_{login_index}",
                         "user_id": user["user_id"],
                         "app_id": app["app_id"],
-                        "assigned_at": assigned_at.isoformat(),
-                        "assigned_by": rng.choice(admins),
+                        "login_ts": login_ts.isoformat(),
+                        "device": rng.choice(DEVICES),
+                        "ip_address": faker.ipv4(),
                     }
                 )
-
-                if not last_login_at:
-                    continue
-                if last_login_at < today - dt.timedelta(days=90):
-                    continue
-
-                if activity_level == "active":
-                    login_count = rng.randint(6, 20)
-                elif activity_level == "dormant":
-                    login_count = rng.randint(1, 3)
-                else:
-                    login_count = 0
-
-                if login_count == 0:
-                    continue
-                if rng.random() > usage_probability(app, dept, rng):
-                    continue
-
-                window_start = max(last_login_at - dt.timedelta(days=30), today - dt.timedelta(days=90))
-                for login_index in range(login_count):
-                    login_ts = random_datetime(rng, window_start, last_login_at)
-                    login_rows.append(
+                if rng.random() < 0.7:
+                    activity_choices = ACTIVITY_TYPES.get(app["category"], ["activity"])
+                    usage_rows.append(
                         {
                             "org_id": org_id,
-                            "login_id": f"{user['user_id']}_{app['app_id']}_{login_index}",
+                            "usage_id": f"{user['user_id']}_{app['app_id']}_{login_index}",
                             "user_id": user["user_id"],
                             "app_id": app["app_id"],
-                            "login_ts": login_ts.isoformat(),
-                            "device": rng.choice(DEVICES),
-                            "ip_address": faker.ipv4(),
+                            "activity_ts": (login_ts + dt.timedelta(minutes=rng.randint(1, 90))).isoformat(),
+                            "activity_type": rng.choice(activity_choices),
+                            "duration_minutes": rng.randint(5, 180),
                         }
                     )
-                    if rng.random() < 0.7:
-                        activity_choices = ACTIVITY_TYPES.get(app["category"], ["activity"])
-                        usage_rows.append(
-                            {
-                                "org_id": org_id,
-                                "usage_id": f"{user['user_id']}_{app['app_id']}_{login_index}",
-                                "user_id": user["user_id"],
-                                "app_id": app["app_id"],
-                                "activity_ts": (login_ts + dt.timedelta(minutes=rng.randint(1, 90))).isoformat(),
-                                "activity_type": rng.choice(activity_choices),
-                                "duration_minutes": rng.randint(5, 180),
-                            }
-                        )
-
-        assignment_df = pd.DataFrame(assignment_rows)
-        if assignment_df.empty:
+
+    for app in org_app_records:
+        assigned_seats = assigned_counts.get(app["app_id"], 0)
+        if assigned_seats == 0:
             continue
-        assigned_counts = (
-            assignment_df[assignment_df["org_id"] == org_id]
-            .groupby("app_id")["user_id"]
-            .nunique()
-            .to_dict()
-        )
 
-        for app in org_app_records:
-            assigned_seats = assigned_counts.get(app["app_id"], 0)
-            if assigned_seats == 0:
-                continue
+        term_months = 12
+        start_date = today - dt.timedelta(days=rng.randint(365, 365 * 2))
+        end_date = start_date + dt.timedelta(days=30 * term_months)
+        size_discount = 0.9 if employee_count >= 1000 else 1.0
+        price_per_seat = round(app["base_price"] * rng.uniform(0.85, 1.15) * size_discount, 2)
+        buffer = max(1, int(assigned_seats * rng.uniform(0.05, 0.25)))
+        min_seats = assigned_seats + buffer
 
-            term_months = 12
-            start_date = today - dt.timedelta(days=rng.randint(365, 365 * 2))
-            end_date = start_date + dt.timedelta(days=30 * term_months)
-            size_discount = 0.9 if employee_count >= 1000 else 1.0
-            price_per_seat = round(app["base_price"] * rng.uniform(0.85, 1.15) * size_discount, 2)
-            buffer = max(1, int(assigned_seats * rng.uniform(0.05, 0.25)))
-            min_seats = assigned_seats + buffer
+        contract_id = f"{org_id}_{app['app_id']}_contract"
+        contract_rows.append(
+            {
+                "org_id": org_id,
+                "contract_id": contract_id,
+                "app_id": app["app_id"],
+                "app_key": app["app_key"],
+                "start_date": start_date.date().isoformat(),
+                "end_date": end_date.date().isoformat(),
+                "term_months": term_months,
+                "price_per_seat": price_per_seat,
+                "min_seats": min_seats,
+                "billing_frequency": "monthly",
+                "currency": "USD",
+            }
+        )
 
-            contract_id = f"{org_id}_{app['app_id']}_contract"
-            contract_rows.append(
+        for month_index in range(months):
+            invoice_date = (today - dt.timedelta(days=30 * month_index)).date().replace(day=1)
+            seats_billed = max(
+                min_seats,
+                int(assigned_seats * rng.uniform(0.95, 1.1)),
+            )
+            total_amount = round(seats_billed * price_per_seat, 2)
+            invoice_rows.append(
                 {
                     "org_id": org_id,
+                    "invoice_id": f"{org_id}_{app['app_id']}_{invoice_date.isoformat()}",
                     "contract_id": contract_id,
                     "app_id": app["app_id"],
-                    "app_key": app["app_key"],
-                    "start_date": start_date.date().isoformat(),
-                    "end_date": end_date.date().isoformat(),
-                    "term_months": term_months,
-                    "price_per_seat": price_per_seat,
-                    "min_seats": min_seats,
-                    "billing_frequency": "monthly",
+                    "invoice_date": invoice_date.isoformat(),
+                    "seats_billed": seats_billed,
+                    "total_amount": total_amount,
                     "currency": "USD",
                 }
             )
 
-            for month_index in range(months):
-                invoice_date = (today - dt.timedelta(days=30 * month_index)).date().replace(day=1)
-                seats_billed = max(
-                    min_seats,
-                    int(assigned_seats * rng.uniform(0.95, 1.1)),
-                )
-                total_amount = round(seats_billed * price_per_seat, 2)
-                invoice_rows.append(
-                    {
-                        "org_id": org_id,
-                        "invoice_id": f"{org_id}_{app['app_id']}_{invoice_date.isoformat()}",
-                        "contract_id": contract_id,
-                        "app_id": app["app_id"],
-                        "invoice_date": invoice_date.isoformat(),
-                        "seats_billed": seats_billed,
-                        "total_amount": total_amount,
-                        "currency": "USD",
-                    }
-                )
+    return {
+        "raw_orgs": org_rows,
+        "raw_okta_users": user_rows,
+        "raw_okta_groups": group_rows,
+        "raw_okta_apps": app_rows,
+        "raw_okta_assignments": assignment_rows,
+        "raw_okta_logins": login_rows,
+        "raw_saas_usage": usage_rows,
+        "raw_saas_contracts": contract_rows,
+        "raw_saas_invoices": invoice_rows,
+    }
+
+
+def iter_org_tables_loop(
+    seed: int,
+    org_indices: range,
+    min_employees: int,
+    max_employees: int,
+    months: int,
+    today: dt.datetime,
+) -> Iterator[dict[str, pd.DataFrame]]:
+    faker = Faker()
+    for org_index in org_indices:
+        org_rows = generate_org_rows_loop(
+            org_index=org_index,
+            seed=seed,
+            faker=faker,
+            min_employees=min_employees,
+            max_employees=max_employees,
+            months=months,
+            today=today,
+        )
+        yield {table_name: pd.DataFrame(rows) for table_name, rows in org_rows.items()}
+
+
+@lru_cache(maxsize=4)
+def build_name_pools(seed: int, size: int = NAME_POOL_SIZE) -> dict[str, np.ndarray]:
+    """Pre-generate Faker values so per-user draws become integer indexing (cached per process)."""
+    faker = Faker()
+    faker.seed_instance(seed)
+    first_names = np.array([faker.first_name() for _ in range(size)])
+    last_names = np.array([faker.last_name() for _ in range(size)])
+    return {
+        "first_name": first_names,
+        "last_name": last_names,
+        "email_first": np.char.lower(first_names),
+        "email_last": np.char.lower(last_names),
+        "title": np.array([faker.job() for _ in range(JOB_POOL_SIZE)]),
+    }
+
+
+def uniform_seconds(np_rng: np.random.Generator, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Vectorized `random_datetime` over epoch seconds (returns `start` when start >= end)."""
+    span = np.maximum(np.asarray(end) - np.asarray(start), 0)
+    return np.asarray(start) + np_rng.integers(0, span + 1)
+
+
+def segment_bounds(
+    bounds: dict[str, tuple[float, float]], core: np.ndarray, target: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    low = np.where(
+        core, bounds["core"][0], np.where(target, bounds["target"][0], bounds["other"][0])
+    )
+    high = np.where(
+        core, bounds["core"][1], np.where(target, bounds["target"][1], bounds["other"][1])
+    )
+    return low, high
+
+
+def as_timestamps(seconds: np.ndarray, valid: np.ndarray | None = None) -> np.ndarray:
+    values = np.asarray(seconds, dtype="datetime64[s]")
+    if valid is not None:
+        values = np.where(valid, values, np.datetime64("NaT", "s"))
+    return values
 
+
+def as_dates(seconds: np.ndarray) -> np.ndarray:
+    return np.asarray(seconds, dtype="datetime64[s]").astype("datetime64[D]")
+
+
+def padded_ids(prefix: np.ndarray | str, index: np.ndarray, width: int) -> np.ndarray:
+    return np.char.add(prefix, np.char.zfill(index.astype(str), width))
+
+
+def generate_org_tables_vectorized(
+    org_index: int,
+    np_rng: np.random.Generator,
+    faker: Faker,
+    pools: dict[str, np.ndarray],
+    min_employees: int,
+    max_employees: int,
+    months: int,
+    today: dt.datetime,
+) -> dict[str, pd.DataFrame]:
+    today_s = int(np.datetime64(today, "s").astype(np.int64))
+    day = SECONDS_PER_DAY
+
+    org_id = f"org_{org_index:03d}"
+    org_name = faker.company()
+    industry = INDUSTRIES[np_rng.integers(len(INDUSTRIES))]
+    region = REGIONS[np_rng.integers(len(REGIONS))]
+    employee_count = int(
+        np.clip(np_rng.lognormal(mean=5.5, sigma=0.45), min_employees, max_employees)
+    )
+    org_created_s = int(uniform_seconds(np_rng, today_s - 365 * 5 * day, today_s - 30 * day))
+    org_df = pd.DataFrame(
+        {
+            "org_id": [org_id],
+            "org_name": [org_name],
+            "industry": [industry],
+            "employee_count": [employee_count],
+            "employee_band": [employee_band(employee_count)],
+            "region": [region],
+            "created_at": as_timestamps(np.array([org_created_s])),
+        }
+    )
+    domain = slugify(org_name)
+
+    # Users: one draw per column instead of one Faker/random call per field.
+    n_users = employee_count
+    user_ids = padded_ids(f"{org_id}_user_", np.arange(n_users), 4)
+    first_idx = np_rng.integers(len(pools["first_name"]), size=n_users)
+    last_idx = np_rng.integers(len(pools["last_name"]), size=n_users)
+    emails = np.char.add(
+        np.char.add(
+            np.char.add(pools["email_first"][first_idx], "."), pools["email_last"][last_idx]
+        ),
+        f"@{domain}.com".lower(),
+    )
+    department_p = np.array(DEPARTMENT_WEIGHTS) / np.sum(DEPARTMENT_WEIGHTS)
+    department_idx = np_rng.choice(len(DEPARTMENTS), size=n_users, p=department_p)
+    status_idx = np_rng.choice(len(USER_STATUSES), size=n_users, p=USER_STATUS_WEIGHTS)
+
+    # Levels: 0 = active, 1 = dormant, 2 = inactive, drawn from the status-conditional weights.
+    level_cdf = np.array(
+        [
+            np.cumsum(
+                [
+                    ACTIVITY_LEVEL_WEIGHTS[status].get(level, 0.0)
+                    for level in ("active", "dormant", "inactive")
+                ]
+            )
+            for status in USER_STATUSES
+        ]
+    )
+    level_draw = np_rng.random(n_users)
+    activity_level = (level_draw[:, None] >= level_cdf[status_idx][:, :2]).sum(axis=1)
+
+    created_s = uniform_seconds(
+        np_rng, np.full(n_users, org_created_s), np.full(n_users, today_s - 7 * day)
+    )
+    login_low = np.select(
+        [activity_level == 0, activity_level == 1],
+        [today_s - 30 * day, today_s - 90 * day],
+        today_s - 365 * day,
+    )
+    login_high = np.select(
+        [activity_level == 0, activity_level == 1],
+        [today_s, today_s - 31 * day],
+        today_s - 91 * day,
+    )
+    last_login_s = uniform_seconds(np_rng, login_low, login_high)
+    has_login = ~((activity_level == 2) & (np_rng.random(n_users) < 0.15))
+    is_admin = np_rng.random(n_users) < 0.05
+
+    users_df = pd.DataFrame(
+        {
+            "org_id": org_id,
+            "user_id": user_ids,
+            "first_name": pools["first_name"][first_idx],
+            "last_name": pools["last_name"][last_idx],
+            "email": emails,
+            "department": np.array(DEPARTMENTS)[department_idx],
+            "title": pools["title"][np_rng.integers(len(pools["title"]), size=n_users)],
+            "status": np.array(USER_STATUSES)[status_idx],
+            "is_admin": is_admin,
+            "created_at": as_timestamps(created_s),
+            "last_login_at": as_timestamps(last_login_s, has_login),
+        }
+    )
+
+    groups_df = pd.DataFrame(
+        {
+            "org_id": org_id,
+            "group_id": [f"{org_id}_group_{slugify(dept)}" for dept in DEPARTMENTS],
+            "group_name": [f"{dept} Team" for dept in DEPARTMENTS],
+            "department": DEPARTMENTS,
+        }
+    )
+
+    # Apps: same selection rules as `choose_apps_for_org`.
+    catalog_by_key = {app["app_key"]: app for app in APP_CATALOG}
+    suite_key = ["google_workspace", "microsoft_365"][np_rng.integers(2)]
+    core_keys = ["slack", "okta", "zoom", suite_key]
+    optional_keys = [
+        app["app_key"]
+        for app in APP_CATALOG
+        if app["app_key"] not in core_keys
+        and app["app_key"] not in {"google_workspace", "microsoft_365"}
+    ]
+    optional_count = min(int(np_rng.integers(6, 10)), len(optional_keys))
+    selected_optional = [
+        optional_keys[i]
+        for i in np_rng.choice(len(optional_keys), size=optional_count, replace=False)
+    ]
+    apps = [catalog_by_key[key] for key in core_keys + selected_optional]
+    n_apps = len(apps)
+    app_ids = np.array([f"{org_id}_app_{app['app_key']}" for app in apps])
+    enabled_s = uniform_seconds(
+        np_rng, np.full(n_apps, org_created_s), np.full(n_apps, today_s - 15 * day)
+    )
+    apps_df = pd.DataFrame(
+        {
+            "org_id": org_id,
+            "app_id": app_ids,
+            "app_key": [app["app_key"] for app in apps],
+            "app_name": [app["app_name"] for app in apps],
+            "category": [app["category"] for app in apps],
+            "vendor": [app["vendor"] for app in apps],
+            "enabled_at": as_timestamps(enabled_s),
+            "base_price": [app["base_price"] for app in apps],
+            "target_departments": [str(app["target_departments"]) for app in apps],
+            "core": [app["core"] for app in apps],
+            "core_app": [app["core"] for app in apps],
+        }
+    )
+
+    # Assignments: a users x apps adoption matrix, kept in user-major order like the loop engine.
+    core = np.array([app["core"] for app in apps])
+    targeted = np.array(
+        [[dept in app["target_departments"] for app in apps] for dept in DEPARTMENTS]
+    )[department_idx]
+    adoption_low, adoption_high = segment_bounds(ADOPTION_RATE_BOUNDS, core[None, :], targeted)
+    adoption = np_rng.uniform(adoption_low, adoption_high)
+    user_pos, app_pos = np.nonzero(np_rng.random((n_users, n_apps)) <= adoption)
+    n_assignments = len(user_pos)
+
+    assigned_s = uniform_seconds(np_rng, created_s[user_pos], np.full(n_assignments, today_s - day))
+    admin_ids = user_ids[is_admin] if is_admin.any() else np.array(["system"])
+    assignment_ids = np.char.add(np.char.add(user_ids[user_pos], "_"), app_ids[app_pos])
+    assignments_df = pd.DataFrame(
+        {
+            "org_id": org_id,
+            "assignment_id": assignment_ids,
+            "user_id": user_ids[user_pos],
+            "app_id": app_ids[app_pos],
+            "assigned_at": as_timestamps(assigned_s),
+            "assigned_by": admin_ids[np_rng.integers(len(admin_ids), size=n_assignments)],
+        }
+    )
+
+    # Logins: only active/dormant users seen in the last 90 days who pass the usage draw.
+    user_level = activity_level[user_pos]
+    user_last_login = last_login_s[user_pos]
+    usage_low, usage_high = segment_bounds(
+        USAGE_PROBABILITY_BOUNDS, core[app_pos], targeted[user_pos, app_pos]
+    )
+    eligible = (
+        has_login[user_pos]
+        & (user_last_login >= today_s - 90 * day)
+        & (user_level < 2)
+        & (np_rng.random(n_assignments) <= np_rng.uniform(usage_low, usage_high))
+    )
+    eligible_pos = np.flatnonzero(eligible)
+    login_counts = np.where(
+        user_level[eligible_pos] == 0,
+        np_rng.integers(6, 21, size=len(eligible_pos)),
+        np_rng.integers(1, 4, size=len(eligible_pos)),
+    )
+    login_parent = np.repeat(eligible_pos, login_counts)
+    n_logins = len(login_parent)
+    login_index = np.arange(n_logins) - np.repeat(
+        np.cumsum(login_counts) - login_counts, login_counts
+    )
+
+    login_end = user_last_login[login_parent]
+    login_start = np.maximum(login_end - 30 * day, today_s - 90 * day)
+    login_s = uniform_seconds(np_rng, login_start, login_end)
+    event_ids = np.char.add(
+        np.char.add(assignment_ids[login_parent], "_"), login_index.astype(str)
+    )
+    octets = np_rng.integers(1, 255, size=(n_logins, 4)).astype(str)
+    ip_addresses = np.char.add(
+        np.char.add(np.char.add(octets[:, 0], "."), np.char.add(octets[:, 1], ".")),
+        np.char.add(np.char.add(octets[:, 2], "."), octets[:, 3]),
+    )
+    login_users = user_ids[user_pos][login_parent]
+    login_apps = app_ids[app_pos][login_parent]
+    logins_df = pd.DataFrame(
+        {
+            "org_id": org_id,
+            "login_id": event_ids,
+            "user_id": login_users,
+            "app_id": login_apps,
+            "login_ts": as_timestamps(login_s),
+            "device": np.array(DEVICES)[np_rng.integers(len(DEVICES), size=n_logins)],
+            "ip_address": ip_addresses,
+        }
+    )
+
+    # Usage: ~70% of logins emit an activity event of a category-specific type.
+    usage_pos = np.flatnonzero(np_rng.random(n_logins) < 0.7)
+    n_usage = len(usage_pos)
+    activity_choices = [ACTIVITY_TYPES.get(app["category"], ["activity"]) for app in apps]
+    choice_width = max(len(choices) for choices in activity_choices)
+    activity_table = np.array(
+        [choices + [choices[-1]] * (choice_width - len(choices)) for choices in activity_choices]
+    )
+    choice_counts = np.array([len(choices) for choices in activity_choices])
+    usage_app_pos = app_pos[login_parent[usage_pos]]
+    activity_idx = (np_rng.random(n_usage) * choice_counts[usage_app_pos]).astype(np.int64)
+    usage_df = pd.DataFrame(
+        {
+            "org_id": org_id,
+            "usage_id": event_ids[usage_pos],
+            "user_id": login_users[usage_pos],
+            "app_id": login_apps[usage_pos],
+            "activity_ts": as_timestamps(
+                login_s[usage_pos] + 60 * np_rng.integers(1, 91, size=n_usage)
+            ),
+            "activity_type": activity_table[usage_app_pos, activity_idx],
+            "duration_minutes": np_rng.integers(5, 181, size=n_usage),
+        }
+    )
+
+    # Contracts and invoices for every app with at least one assigned seat.
+    assigned_seats = np.bincount(app_pos, minlength=n_apps)
+    contract_pos = np.flatnonzero(assigned_seats > 0)
+    n_contracts = len(contract_pos)
+    seats = assigned_seats[contract_pos]
+    term_months = 12
+    start_s = today_s - day * np_rng.integers(365, 365 * 2 + 1, size=n_contracts)
+    end_s = start_s + day * 30 * term_months
+    size_discount = 0.9 if employee_count >= 1000 else 1.0
+    base_price = np.array([apps[i]["base_price"] for i in contract_pos])
+    price_per_seat = np.round(
+        base_price * np_rng.uniform(0.85, 1.15, size=n_contracts) * size_discount, 2
+    )
+    buffer = np.maximum(1, (seats * np_rng.uniform(0.05, 0.25, size=n_contracts)).astype(np.int64))
+    min_seats = seats + buffer
+    contract_app_ids = app_ids[contract_pos]
+    contract_ids = np.char.add(np.char.add(f"{org_id}_", contract_app_ids), "_contract")
+    contracts_df = pd.DataFrame(
+        {
+            "org_id": org_id,
+            "contract_id": contract_ids,
+            "app_id": contract_app_ids,
+            "app_key": [apps[i]["app_key"] for i in contract_pos],
+            "start_date": as_dates(start_s),
+            "end_date": as_dates(end_s),
+            "term_months": term_months,
+            "price_per_seat": price_per_seat,
+            "min_seats": min_seats,
+            "billing_frequency": "monthly",
+            "currency": "USD",
+        }
+    )
+
+    invoice_dates = np.array(
+        [
+            (today - dt.timedelta(days=30 * month_index)).date().replace(day=1).isoformat()
+            for month_index in range(months)
+        ]
+    )
+    invoice_days = invoice_dates.astype("datetime64[D]")
+    invoice_contract = np.repeat(np.arange(n_contracts), months)
+    invoice_month = np.tile(np.arange(months), n_contracts)
+    seats_billed = np.maximum(
+        min_seats[invoice_contract],
+        (
+            seats[invoice_contract] * np_rng.uniform(0.95, 1.1, size=len(invoice_contract))
+        ).astype(np.int64),
+    )
+    invoice_app_ids = contract_app_ids[invoice_contract]
+    invoices_df = pd.DataFrame(
+        {
+            "org_id": org_id,
+            "invoice_id": np.char.add(
+                np.char.add(np.char.add(f"{org_id}_", invoice_app_ids), "_"),
+                invoice_dates[invoice_month],
+            ),
+            "contract_id": contract_ids[invoice_contract],
+            "app_id": invoice_app_ids,
+            "invoice_date": invoice_days[invoice_month],
+            "seats_billed": seats_billed,
+            "total_amount": np.round(seats_billed * price_per_seat[invoice_contract], 2),
+            "currency": "USD",
+        }
+    )
+
+    return {
+        "raw_orgs": org_df,
+        "raw_okta_users": users_df,
+        "raw_okta_groups": groups_df,
+        "raw_okta_apps": apps_df,
+        "raw_okta_assignments": assignments_df,
+        "raw_okta_logins": logins_df,
+        "raw_saas_usage": usage_df,
+        "raw_saas_contracts": contracts_df,
+        "raw_saas_invoices": invoices_df if n_contracts else invoices_df.iloc[0:0],
+    }
+
+
+def iter_org_tables_vectorized(
+    seed: int,
+    org_indices: range,
+    min_employees: int,
+    max_employees: int,
+    months: int,
+    today: dt.datetime,
+) -> Iterator[dict[str, pd.DataFrame]]:
+    faker = Faker()
+    pools = build_name_pools(seed)
+    for org_index in org_indices:
+        org_seed_value = org_seed(seed, org_index)
+        faker.seed_instance(org_seed_value)
+        yield generate_org_tables_vectorized(
+            org_index=org_index,
+            np_rng=np.random.default_rng(org_seed_value),
+            faker=faker,
+            pools=pools,
+            min_employees=min_employees,
+            max_employees=max_employees,
+            months=months,
+            today=today,
+        )
+
+
+def shard_org_ranges(orgs: int, shard_orgs: int) -> list[range]:
+    if shard_orgs <= 0:
+        return [range(orgs)]
+    return [range(start, min(start + shard_orgs, orgs)) for start in range(0, orgs, shard_orgs)]
+
+
+def frame_to_text(frame: pd.DataFrame, schema: dict[str, str]) -> pd.DataFrame:
+    """Render typed columns as the ISO strings written by the loop engine (CSV output)."""
+    text = {}
+    for column, kind in schema.items():
+        values = frame[column]
+        if kind in {"timestamp", "date"} and pd.api.types.is_datetime64_any_dtype(values):
+            unit = "s" if kind == "timestamp" else "D"
+            raw = values.to_numpy(dtype=f"datetime64[{unit}]")
+            rendered = np.datetime_as_string(raw, unit=unit).astype(object)
+            rendered[np.isnat(raw)] = None
+            text[column] = rendered
+        elif column == "target_departments":
+            text[column] = values.map(str)
+        else:
+            text[column] = values
+    return pd.DataFrame(text, index=frame.index)
+
+
+def frame_to_arrow(frame: pd.DataFrame, schema: dict[str, str]) -> pa.Table:
+    """Coerce ISO strings or typed columns to the declared Arrow types (Parquet output)."""
+    arrays = []
+    for column, kind in schema.items():
+        values = frame[column]
+        if kind == "timestamp":
+            values = pd.to_datetime(values, format="ISO8601").astype("datetime64[s]")
+        elif kind == "date":
+            values = pd.to_datetime(values, format="ISO8601").dt.date
+        elif kind == "int":
+            values = values.astype("int64")
+        elif kind == "double":
+            values = values.astype("float64")
+        elif kind == "bool":
+            values = values.astype(bool)
+        elif column == "target_departments":
+            values = values.map(str)
+        arrays.append(pa.array(values, type=ARROW_TYPES[kind], from_pandas=True))
+    return pa.Table.from_arrays(arrays, names=list(schema))
+
+
+class TableWriter:
+    """Buffers one table's per-org frames and flushes them as CSV chunks or Parquet row groups.
+
+    `flush_rows <= 0` flushes after every org; otherwise rows are flushed once the
+    buffer reaches `flush_rows`, so memory is bounded by the flush size, not the dataset.
+    """
+
+    def __init__(self, path: Path, table_name: str, output_format: str, flush_rows: int) -> None:
+        self.path = path
+        self.schema = TABLE_SCHEMAS[table_name]
+        self.output_format = output_format
+        self.flush_rows = flush_rows
+        self.rows_written = 0
+        self._buffer: list[pd.DataFrame] = []
+        self._buffered_rows = 0
+        self._started = False
+        self._parquet_writer: pq.ParquetWriter | None = None
+
+    def append(self, frame: pd.DataFrame) -> None:
+        if frame.empty:
+            return
+        self._buffer.append(frame)
+        self._buffered_rows += len(frame)
+        if self.flush_rows <= 0 or self._buffered_rows >= self.flush_rows:
+            self.flush()
+        elif len(self._buffer) >= MAX_BUFFERED_FRAMES:
+            # Small tables (orgs, apps, contracts) take thousands of orgs to reach
+            # flush_rows; one frame per org would make memory grow with --orgs.
+            self._buffer = [pd.concat(self._buffer, ignore_index=True)]
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        frame = pd.concat(self._buffer, ignore_index=True)
+        self._buffer = []
+        self._buffered_rows = 0
+
+        if self.output_format == "parquet":
+            self._parquet_file().write_table(frame_to_arrow(frame, self.schema))
+        else:
+            frame_to_text(frame, self.schema).to_csv(
+                self.path, mode="a" if self._started else "w", header=not self._started, index=False
+            )
+        self._started = True
+        self.rows_written += len(frame)
+
+    def close(self) -> None:
+        self.flush()
+        if self.output_format == "parquet":
+            self._parquet_file().close()
+        elif not self._started:
+            pd.DataFrame(columns=list(self.schema)).to_csv(self.path, index=False)
+
+    def _parquet_file(self) -> pq.ParquetWriter:
+        if self._parquet_writer is None:
+            arrow_schema = pa.schema([(name, ARROW_TYPES[kind]) for name, kind in self.schema.items()])
+            self._parquet_writer = pq.ParquetWriter(self.path, arrow_schema, compression="zstd")
+        return self._parquet_writer
+
+
+class ShardWriter:
+    """Streams every raw table of one shard to `<table><suffix>.<format>` files."""
+
+    def __init__(self, out_dir: Path, suffix: str, output_format: str, flush_rows: int) -> None:
+        self.writers = {
+            table_name: TableWriter(
+                out_dir / f"{table_name}{suffix}.{output_format}",
+                table_name,
+                output_format,
+                flush_rows,
+            )
+            for table_name in TABLE_NAMES
+        }
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        for writer in self.writers.values():
+            writer.close()
+
+    def write_org(self, tables: dict[str, pd.DataFrame]) -> None:
+        for table_name, writer in self.writers.items():
+            writer.append(tables[table_name])
+
+    def row_counts(self) -> dict[str, int]:
+        return {table_name: writer.rows_written for table_name, writer in self.writers.items()}
+
+
+def generate_shard(
+    shard: tuple[int | None, range],
+    out_dir: Path,
+    seed: int,
+    min_employees: int,
+    max_employees: int,
+    months: int,
+    engine: str,
+    today: dt.datetime,
+    output_format: str,
+    flush_rows: int,
+) -> dict[str, int]:
+    """Generate one shard of orgs, streaming each org's rows to its files as it goes."""
+    shard_index, org_indices = shard
+    iter_org_tables = iter_org_tables_vectorized if engine == "vectorized" else iter_org_tables_loop
+    suffix = "" if shard_index is None else f"_{shard_index:05d}"
+
+    with ShardWriter(out_dir, suffix, output_format, flush_rows) as writer:
+        for tables in iter_org_tables(
+            seed=seed,
+            org_indices=org_indices,
+            min_employees=min_employees,
+            max_employees=max_employees,
+            months=months,
+            today=today,
+        ):
+            writer.write_org(tables)
+
+    return writer.row_counts()
+
+
+def generate_data(
+    out_dir: Path,
+    seed: int,
+    orgs: int,
+    min_employees: int,
+    max_employees: int,
+    months: int,
+    engine: str = "loop",
+    workers: int = 1,
+    shard_orgs: int = 0,
+    as_of: dt.datetime | None = None,
+    output_format: str = "csv",
+    flush_rows: int = DEFAULT_FLUSH_ROWS,
+) -> dict[str, int]:
+    today = as_of or dt.datetime.now(dt.UTC).replace(tzinfo=None, microsecond=0)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    pd.DataFrame(org_rows).to_csv(out_dir / "raw_orgs.csv", index=False)
-    pd.DataFrame(user_rows).to_csv(out_dir / "raw_okta_users.csv", index=False)
-    pd.DataFrame(group_rows).to_csv(out_dir / "raw_okta_groups.csv", index=False)
-    pd.DataFrame(app_rows).to_csv(out_dir / "raw_okta_apps.csv", index=False)
-    pd.DataFrame(assignment_rows).to_csv(out_dir / "raw_okta_assignments.csv", index=False)
-    pd.DataFrame(login_rows).to_csv(out_dir / "raw_okta_logins.csv", index=False)
-    pd.DataFrame(usage_rows).to_csv(out_dir / "raw_saas_usage.csv", index=False)
-    pd.DataFrame(contract_rows).to_csv(out_dir / "raw_saas_contracts.csv", index=False)
-    pd.DataFrame(invoice_rows).to_csv(out_dir / "raw_saas_invoices.csv", index=False)
+    # Shard files depend only on the org ranges (never on the worker count), so a
+    # given --seed/--shard-orgs produces identical files however many workers run.
+    org_ranges = shard_org_ranges(orgs, shard_orgs)
+    shards = (
+        [(None, org_ranges[0])]
+        if shard_orgs <= 0
+        else [(shard_index, org_range) for shard_index, org_range in enumerate(org_ranges)]
+    )
+    run_shard = partial(
+        generate_shard,
+        out_dir=out_dir,
+        seed=seed,
+        min_employees=min_employees,
+        max_employees=max_employees,
+        months=months,
+        engine=engine,
+        today=today,
+        output_format=output_format,
+        flush_rows=flush_rows,
+    )
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            shard_counts = list(executor.map(run_shard, shards))
+    else:
+        shard_counts = [run_shard(shard) for shard in shards]
+
+    return {
+        table_name: sum(counts[table_name] for counts in shard_counts)
+        for table_name in TABLE_NAMES
+    }
 
 
 def main() -> None:
@@ -574,7 +1333,40 @@ def main() -> None:
     parser.add_argument("--min-employees", type=int, default=120)
     parser.add_argument("--max-employees", type=int, default=800)
     parser.add_argument("--months", type=int, default=12)
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="loop",
+        help="loop builds rows one at a time; vectorized samples whole NumPy columns per org.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes used to generate shards in parallel (requires --shard-orgs when > 1).",
+    )
+    parser.add_argument(
+        "--shard-orgs",
+        type=int,
+        default=0,
+        help="Orgs per shard; each shard writes its own <table>_<shard> files (0 = unsharded).",
+    )
+    parser.add_argument(
+        "--as-of",
+        type=dt.datetime.fromisoformat,
+        default=None,
+        help="Reference 'now' for generated timestamps (ISO format, UTC); defaults to the current time.",
+    )
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="csv")
+    parser.add_argument(
+        "--flush-rows",
+        type=int,
+        default=DEFAULT_FLUSH_ROWS,
+        help="Rows buffered per table before writing a chunk/row group (0 = flush after each org).",
+    )
     args = parser.parse_args()
+    if args.workers > 1 and args.shard_orgs <= 0:
+        parser.error("--workers > 1 requires --shard-orgs so each worker writes its own shards")
 
     generate_data(
         out_dir=args.out_dir,
@@ -583,6 +1375,12 @@ def main() -> None:
         min_employees=args.min_employees,
         max_employees=args.max_employees,
         months=args.months,
+        engine=args.engine,
+        workers=args.workers,
+        shard_orgs=args.shard_orgs,
+        as_of=args.as_of,
+        output_format=args.format,
+        flush_rows=args.flush_rows,
     )
 
 
@@ -1,42 +1,487 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import duckdb
 
+# Declared DuckDB types per raw table, matching the casts in the stg_* models so
+# loads skip type inference and timestamps/dates land typed instead of as strings.
+RAW_TABLE_COLUMNS: dict[str, dict[str, str]] = {
+    "raw_orgs": {
+        "org_id": "VARCHAR",
+        "org_name": "VARCHAR",
+        "industry": "VARCHAR",
+        "employee_count": "INTEGER",
+        "employee_band": "VARCHAR",
+        "region": "VARCHAR",
+        "created_at": "TIMESTAMP",
+    },
+    "raw_okta_users": {
+        "org_id": "VARCHAR",
+        "user_id": "VARCHAR",
+        "first_name": "VARCHAR",
+        "last_name": "VARCHAR",
+        "email": "VARCHAR",
+        "department": "VARCHAR",
+        "title": "VARCHAR",
+        "status": "VARCHAR",
+        "is_admin": "BOOLEAN",
+        "created_at": "TIMESTAMP",
+        "last_login_at": "TIMESTAMP",
+    },
+    "raw_okta_groups": {
+        "org_id": "VARCHAR",
+        "group_id": "VARCHAR",
+        "group_name": "VARCHAR",
+        "department": "VARCHAR",
+    },
+    "raw_okta_apps": {
+        "org_id": "VARCHAR",
+        "app_id": "VARCHAR",
+        "app_key": "VARCHAR",
+        "app_name": "VARCHAR",
+        "category": "VARCHAR",
+        "vendor": "VARCHAR",
+        "enabled_at": "TIMESTAMP",
+        "base_price": "DOUBLE",
+        "target_departments": "VARCHAR",
+        "core": "BOOLEAN",
+        "core_app": "BOOLEAN",
+    },
+    "raw_okta_assignments": {
+        "org_id": "VARCHAR",
+        "assignment_id": "VARCHAR",
+        "user_id": "VARCHAR",
+        "app_id": "VARCHAR",
+        "assigned_at": "TIMESTAMP",
+        "assigned_by": "VARCHAR",
+    },
+    "raw_okta_logins": {
+        "org_id": "VARCHAR",
+        "login_id": "VARCHAR",
+        "user_id": "VARCHAR",
+        "app_id": "VARCHAR",
+        "login_ts": "TIMESTAMP",
+        "device": "VARCHAR",
+        "ip_address": "VARCHAR",
+    },
+    "raw_saas_usage": {
+        "org_id": "VARCHAR",
+        "usage_id": "VARCHAR",
+        "user_id": "VARCHAR",
+        "app_id": "VARCHAR",
+        "activity_ts": "TIMESTAMP",
+        "activity_type": "VARCHAR",
+        "duration_minutes": "INTEGER",
+    },
+    "raw_saas_contracts": {
+        "org_id": "VARCHAR",
+        "contract_id": "VARCHAR",
+        "app_id": "VARCHAR",
+        "app_key": "VARCHAR",
+        "start_date": "DATE",
+        "end_date": "DATE",
+        "term_months": "INTEGER",
+        "price_per_seat": "DOUBLE",
+        "min_seats": "INTEGER",
+        "billing_frequency": "VARCHAR",
+        "currency": "VARCHAR",
+    },
+    "raw_saas_invoices": {
+        "org_id": "VARCHAR",
+        "invoice_id": "VARCHAR",
+        "contract_id": "VARCHAR",
+        "app_id": "VARCHAR",
+        "invoice_date": "DATE",
+        "seats_billed": "INTEGER",
+        "total_amount": "DOUBLE",
+        "currency": "VARCHAR",
+    },
+}
 
-def ingest_csvs(raw_dir: Path, db_path: Path, schema: str) -> None:
+# Natural key per raw table; incremental loads replace existing rows with the same key.
+RAW_TABLE_KEYS = {
+    "raw_orgs": "org_id",
+    "raw_okta_users": "user_id",
+    "raw_okta_groups": "group_id",
+    "raw_okta_apps": "app_id",
+    "raw_okta_assignments": "assignment_id",
+    "raw_okta_logins": "login_id",
+    "raw_saas_usage": "usage_id",
+    "raw_saas_contracts": "contract_id",
+    "raw_saas_invoices": "invoice_id",
+}
+
+# High-water mark column per raw table (the source `loaded_at_field`s in sources.yml).
+RAW_TABLE_WATERMARKS = {
+    "raw_orgs": "created_at",
+    "raw_okta_users": "created_at",
+    "raw_okta_apps": "enabled_at",
+    "raw_okta_assignments": "assigned_at",
+    "raw_okta_logins": "login_ts",
+    "raw_saas_usage": "activity_ts",
+    "raw_saas_contracts": "start_date",
+    "raw_saas_invoices": "invoice_date",
+}
+
+RAW_FILE_SUFFIXES = {".csv": "csv", ".parquet": "parquet"}
+
+LOAD_MODES = ["full", "incremental"]
+
+# Sharded generator output is named <table>_<shard>.<ext>, e.g. raw_okta_logins_00003.parquet.
+SHARD_SUFFIX = re.compile(r"_\d+$")
+
+
+def discover_raw_files(raw_dir: Path, pattern: str) -> dict[str, list[Path]]:
+    """Group raw files matching `pattern` by target table, folding shards into one table."""
+    files_by_table: dict[str, list[Path]] = {}
+    for path in sorted(raw_dir.glob(pattern)):
+        if path.suffix not in RAW_FILE_SUFFIXES:
+            continue
+        table_name = SHARD_SUFFIX.sub("", path.stem)
+        files_by_table.setdefault(table_name, []).append(path)
+
+    for table_name, paths in files_by_table.items():
+        formats = {RAW_FILE_SUFFIXES[path.suffix] for path in paths}
+        if len(formats) > 1:
+            raise ValueError(f"Mixed file formats for {table_name}: {sorted(formats)}")
+    return files_by_table
+
+
+def sql_list(values: list[str]) -> str:
+    return "[" + ", ".join("'" + value.replace("'", "''") + "'" for value in values) + "]"
+
+
+def raw_select_sql(table_name: str, paths: list[Path], file_order: bool = False) -> str:
+    """Build a SELECT that reads all files for a table with its declared column types.
+
+    With `file_order`, each row also carries the 1-based position of its file in `paths`.
+    """
+    files = sql_list([path.as_posix() for path in paths])
+    columns = RAW_TABLE_COLUMNS.get(table_name)
+    file_format = RAW_FILE_SUFFIXES[paths[0].suffix]
+
+    if file_format == "parquet":
+        reader = f"read_parquet({files}{', filename=true' if file_order else ''})"
+        if columns is None:
+            select_list = ["* EXCLUDE (filename)" if file_order else "*"]
+        else:
+            select_list = [
+                f"CAST({column} AS {column_type}) AS {column}"
+                for column, column_type in columns.items()
+            ]
+    else:
+        # The sniffer only inspects the first file, so a shard whose first values happen
+        # to need no quoting would hide the quote character from every later shard.
+        # Pin the generator's dialect and match columns by header name, not position.
+        csv_options = "header=true, delim=',', quote='\"', escape='\"', union_by_name=true"
+        if file_order:
+            csv_options += ", filename=true"
+        if columns is None:
+            reader = f"read_csv({files}, {csv_options})"
+            select_list = ["* EXCLUDE (filename)" if file_order else "*"]
+        else:
+            type_spec = "{" + ", ".join(
+                f"'{column}': '{column_type}'" for column, column_type in columns.items()
+            ) + "}"
+            reader = f"read_csv({files}, {csv_options}, types={type_spec})"
+            select_list = list(columns)
+
+    if file_order:
+        select_list.append(f"list_position({files}, filename) AS file_order")
+    return "SELECT\n    " + ",\n    ".join(select_list) + f"\nFROM {reader}"
+
+
+def file_hash(path: Path) -> str:
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, "blake2b").hexdigest()
+
+
+def ensure_meta_tables(conn: duckdb.DuckDBPyConnection, meta_schema: str) -> None:
+    conn.execute(f"CREATE SCHEMA IF NOT EXISTS {meta_schema}")
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {meta_schema}.ingest_files (
+            table_name VARCHAR,
+            file_path VARCHAR,
+            file_hash VARCHAR,
+            file_bytes BIGINT,
+            loaded_at TIMESTAMP
+        )
+        """
+    )
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {meta_schema}.ingest_watermarks (
+            table_name VARCHAR,
+            watermark_column VARCHAR,
+            high_water_mark TIMESTAMP,
+            updated_at TIMESTAMP
+        )
+        """
+    )
+
+
+def table_exists(cursor: duckdb.DuckDBPyConnection, schema: str, table_name: str) -> bool:
+    return (
+        cursor.execute(
+            """
+            SELECT count(*) FROM information_schema.tables
+            WHERE table_schema = ? AND table_name = ?
+            """,
+            [schema, table_name],
+        ).fetchone()[0]
+        > 0
+    )
+
+
+def load_table(
+    conn: duckdb.DuckDBPyConnection,
+    schema: str,
+    table_name: str,
+    paths: list[Path],
+    mode: str = "full",
+) -> dict:
+    # Each table loads on its own cursor so several tables can load concurrently.
+    cursor = conn.cursor()
+    try:
+        started = time.perf_counter()
+        key = RAW_TABLE_KEYS.get(table_name)
+
+        if mode == "incremental" and table_exists(cursor, schema, table_name):
+            load_mode = "upsert"
+            cursor.execute("BEGIN TRANSACTION")
+            if key:
+                # A key re-exported in several new files keeps only its row from the
+                # last file (in `paths` order), so the insert cannot duplicate it.
+                cursor.execute(
+                    f"""
+                    CREATE TEMP TABLE staged AS
+                    SELECT * EXCLUDE (file_order)
+                    FROM ({raw_select_sql(table_name, paths, file_order=True)})
+                    QUALIFY row_number() OVER (PARTITION BY {key} ORDER BY file_order DESC) = 1
+                    """
+                )
+            else:
+                cursor.execute(f"CREATE TEMP TABLE staged AS\n{raw_select_sql(table_name, paths)}")
+            if key:
+                cursor.execute(
+                    f"DELETE FROM {schema}.{table_name} WHERE {key} IN (SELECT {key} FROM staged)"
+                )
+            cursor.execute(f"INSERT INTO {schema}.{table_name} BY NAME SELECT * FROM staged")
+            rows = cursor.execute("SELECT count(*) FROM staged").fetchone()[0]
+            cursor.execute("DROP TABLE staged")
+            cursor.execute("COMMIT")
+        else:
+            load_mode = "replace"
+            select_sql = raw_select_sql(table_name, paths)
+            cursor.execute(f"CREATE OR REPLACE TABLE {schema}.{table_name} AS\n{select_sql}")
+            rows = cursor.execute(f"SELECT count(*) FROM {schema}.{table_name}").fetchone()[0]
+
+        watermark_column = RAW_TABLE_WATERMARKS.get(table_name)
+        high_water_mark = (
+            cursor.execute(
+                f"SELECT max(CAST({watermark_column} AS TIMESTAMP)) FROM {schema}.{table_name}"
+            ).fetchone()[0]
+            if watermark_column
+            else None
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        cursor.close()
+
+    file_bytes = sum(path.stat().st_size for path in paths)
+    return {
+        "table": table_name,
+        "mode": load_mode,
+        "files": len(paths),
+        "rows": rows,
+        "bytes": file_bytes,
+        "seconds": elapsed,
+        "rows_per_second": rows / elapsed if elapsed else float("inf"),
+        "bytes_per_second": file_bytes / elapsed if elapsed else float("inf"),
+        "high_water_mark": high_water_mark,
+    }
+
+
+def record_loads(
+    conn: duckdb.DuckDBPyConnection,
+    meta_schema: str,
+    loaded: dict[str, list[Path]],
+    hashes: dict[Path, str],
+    results: list[dict],
+    mode: str,
+) -> None:
+    """Record loaded file hashes and per-table high-water marks (serially, after the loads)."""
+    for table_name, paths in loaded.items():
+        if mode == "full":
+            conn.execute(
+                f"DELETE FROM {meta_schema}.ingest_files WHERE table_name = ?", [table_name]
+            )
+        conn.executemany(
+            f"INSERT INTO {meta_schema}.ingest_files VALUES (?, ?, ?, ?, current_timestamp)",
+            [
+                [table_name, path.as_posix(), hashes[path], path.stat().st_size]
+                for path in paths
+            ],
+        )
+
+    for result in results:
+        watermark_column = RAW_TABLE_WATERMARKS.get(result["table"])
+        if not watermark_column or result["mode"] == "unchanged":
+            continue
+        conn.execute(
+            f"DELETE FROM {meta_schema}.ingest_watermarks WHERE table_name = ?", [result["table"]]
+        )
+        conn.execute(
+            f"INSERT INTO {meta_schema}.ingest_watermarks VALUES (?, ?, ?, current_timestamp)",
+            [result["table"], watermark_column, result["high_water_mark"]],
+        )
+
+
+def print_load_report(results: list[dict]) -> None:
+    print(
+        f"{'table':<24} {'mode':<9} {'files':>5} {'skipped':>7} {'rows':>12} {'MB':>9} "
+        f"{'seconds':>8} {'rows/s':>12} {'MB/s':>8}  high-water mark"
+    )
+    for result in results:
+        print(
+            f"{result['table']:<24} {result['mode']:<9} {result['files']:>5} "
+            f"{result['skipped_files']:>7} {result['rows']:>12,} {result['bytes'] / 1e6:>9.1f} "
+            f"{result['seconds']:>8.2f} {result['rows_per_second']:>12,.0f} "
+            f"{result['bytes_per_second'] / 1e6:>8.1f}  {result['high_water_mark'] or ''}"
+        )
+
+
+def ingest_csvs(
+    raw_dir: Path,
+    db_path: Path,
+    schema: str,
+    pattern: str = "*",
+    workers: int = 4,
+    mode: str = "full",
+    meta_schema: str = "meta",
+) -> list[dict]:
+    """Load raw CSV or Parquet files (sharded or not) into `schema`, one table per raw table.
+
+    `full` rebuilds every table; `incremental` skips files whose content hash was
+    already loaded and upserts the rest on each table's natural key.
+    """
     if not raw_dir.exists():
         raise FileNotFoundError(f"Raw data directory not found: {raw_dir}")
 
-    csv_paths = sorted(raw_dir.glob("*.csv"))
-    if not csv_paths:
-        raise FileNotFoundError(f"No CSV files found in: {raw_dir}")
+    files_by_table = discover_raw_files(raw_dir, pattern)
+    if not files_by_table:
+        raise FileNotFoundError(f"No CSV or Parquet files found in: {raw_dir}")
 
     db_path.parent.mkdir(parents=True, exist_ok=True)
+    hashes = {path: file_hash(path) for paths in files_by_table.values() for path in paths}
 
     with duckdb.connect(str(db_path)) as conn:
         conn.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        ensure_meta_tables(conn, meta_schema)
 
-        for csv_path in csv_paths:
-            table_name = csv_path.stem
+        stored_watermarks = dict(
             conn.execute(
-                f"""
-                CREATE OR REPLACE TABLE {schema}.{table_name} AS
-                SELECT * FROM read_csv_auto('{csv_path.as_posix()}', header=true)
-                """
+                f"SELECT table_name, high_water_mark FROM {meta_schema}.ingest_watermarks"
+            ).fetchall()
+        )
+        already_loaded: set[tuple[str, str]] = set()
+        if mode == "incremental":
+            already_loaded = set(
+                conn.execute(
+                    f"SELECT table_name, file_hash FROM {meta_schema}.ingest_files"
+                ).fetchall()
+            )
+        to_load = {
+            table_name: [path for path in paths if (table_name, hashes[path]) not in already_loaded]
+            for table_name, paths in files_by_table.items()
+        }
+        skipped = {
+            table_name: len(files_by_table[table_name]) - len(paths)
+            for table_name, paths in to_load.items()
+        }
+        to_load = {table_name: paths for table_name, paths in to_load.items() if paths}
+
+        # Largest tables first so the longest loads start immediately.
+        ordered = sorted(
+            to_load.items(),
+            key=lambda item: sum(path.stat().st_size for path in item[1]),
+            reverse=True,
+        )
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            results = list(
+                executor.map(
+                    lambda item: load_table(conn, schema, item[0], item[1], mode),
+                    ordered,
+                )
+            )
+
+        for table_name in files_by_table.keys() - to_load.keys():
+            results.append(
+                {
+                    "table": table_name,
+                    "mode": "unchanged",
+                    "files": 0,
+                    "rows": 0,
+                    "bytes": 0,
+                    "seconds": 0.0,
+                    "rows_per_second": 0.0,
+                    "bytes_per_second": 0.0,
+                    "high_water_mark": stored_watermarks.get(table_name),
+                }
             )
+        for result in results:
+            result["skipped_files"] = skipped[result["table"]]
+
+        record_loads(conn, meta_schema, to_load, hashes, results, mode)
+
+    return sorted(results, key=lambda result: result["table"])
 
 
 def main() -> None:
-    parser = argparse.ArgumentParser(description="Load raw CSVs into DuckDB.")
+    parser = argparse.ArgumentParser(description="Load raw CSV/Parquet files into DuckDB.")
     parser.add_argument("--raw-dir", type=Path, default=Path("data/raw"))
     parser.add_argument("--db-path", type=Path, default=Path("warehouse/ramp.duckdb"))
     parser.add_argument("--schema", type=str, default="raw")
+    parser.add_argument(
+        "--pattern",
+        type=str,
+        default="*",
+        help="Glob of raw files to load, e.g. 'raw_okta_logins_*.parquet'.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Tables loaded concurrently."
+    )
+    parser.add_argument(
+        "--mode",
+        choices=LOAD_MODES,
+        default="full",
+        help="full rebuilds every table; incremental upserts only files not loaded before.",
+    )
+    parser.add_argument(
+        "--meta-schema",
+        type=str,
+        default="meta",
+        help="Schema holding ingest_files (loaded file hashes) and ingest_watermarks.",
+    )
     args = parser.parse_args()
 
-    ingest_csvs(raw_dir=args.raw_dir, db_path=args.db_path, schema=args.schema)
+    results = ingest_csvs(
+        raw_dir=args.raw_dir,
+        db_path=args.db_path,
+        schema=args.schema,
+        pattern=args.pattern,
+        workers=args.workers,
+        mode=args.mode,
+        meta_schema=args.meta_schema,
+    )
+    print_load_report(results)
 
 
 if __name__ == "__main__":
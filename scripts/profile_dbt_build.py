@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
+
+ROOT = Path(__file__).resolve().parents[1]
+PROJECT_DIR = ROOT / "ramp_analytics"
+PROFILED_RESOURCES = ("model", "snapshot", "test")
+# The profiles.yml target that turns on JSON profiling for dbt's own connection.
+PROFILE_TARGET = "profile"
+PROFILE_COLUMNS = {
+    "build_id": pa.string(),
+    "built_at": pa.timestamp("us"),
+    "unique_id": pa.string(),
+    "node_name": pa.string(),
+    "resource_type": pa.string(),
+    "materialized": pa.string(),
+    "run_status": pa.string(),
+    "run_seconds": pa.float64(),
+    "profile_seconds": pa.float64(),
+    "peak_buffer_memory_bytes": pa.int64(),
+    "spill_bytes": pa.int64(),
+    "operator_id": pa.int32(),
+    "parent_operator_id": pa.int32(),
+    "depth": pa.int32(),
+    "operator_name": pa.string(),
+    "operator_type": pa.string(),
+    "cte_name": pa.string(),
+    "operator_seconds": pa.float64(),
+    "operator_cardinality": pa.int64(),
+    "operator_rows_scanned": pa.int64(),
+    "operator_bytes_written": pa.int64(),
+    "extra_info": pa.string(),
+}
+
+
+def run_dbt_build(select: list[str], profile_dir: Path, full_refresh: bool = False) -> None:
+    """Build with the profiling target; DuckDB writes each node's profile into profile_dir."""
+    from dbt.cli.main import dbtRunner
+
+    os.environ["DBT_PROFILING_DIR"] = str(profile_dir)
+    args = [
+        "build",
+        "--project-dir",
+        str(PROJECT_DIR),
+        "--profiles-dir",
+        str(PROJECT_DIR),
+        "--target",
+        PROFILE_TARGET,
+    ]
+    if select:
+        args += ["--select", *select]
+    if full_refresh:
+        args.append("--full-refresh")
+    result = dbtRunner().invoke(args)
+    if result.exception is not None:
+        raise SystemExit(f"dbt build failed: {result.exception}")
+
+
+def load_artifacts(target_dir: Path) -> tuple[dict, dict]:
+    run_results = json.loads((target_dir / "run_results.json").read_text())
+    manifest = json.loads((target_dir / "manifest.json").read_text())
+    return run_results, manifest
+
+
+def flatten_operators(profile: dict) -> list[dict]:
+    """Pre-order walk of a JSON profile. Operators under a materialized CTE's definition
+    carry its name; inlined CTEs leave no trace in the plan."""
+    operators = []
+
+    def walk(node: dict, parent_id: int | None, depth: int, cte_name: str | None) -> None:
+        operator_id = len(operators)
+        operators.append(
+            {
+                "operator_id": operator_id,
+                "parent_operator_id": parent_id,
+                "depth": depth,
+                "operator_name": node["operator_name"].strip(),
+                "operator_type": node["operator_type"],
+                "cte_name": cte_name,
+                "operator_seconds": node.get("operator_timing"),
+                "operator_cardinality": node.get("operator_cardinality"),
+                "operator_rows_scanned": node.get("operator_rows_scanned"),
+                "operator_bytes_written": node.get("total_bytes_written"),
+                "extra_info": json.dumps(node.get("extra_info") or {}),
+            }
+        )
+        children = node.get("children", [])
+        for index, child in enumerate(children):
+            # A CTE operator's first child computes the CTE; the second consumes it.
+            child_cte = (
+                node["extra_info"].get("CTE Name", cte_name)
+                if node["operator_type"] == "CTE" and index == 0
+                else cte_name
+            )
+            walk(child, operator_id, depth + 1, child_cte)
+
+    for child in profile.get("children", []):
+        walk(child, None, 0, None)
+    return operators
+
+
+def profile_build(run_results: dict, manifest: dict, profile_dir: Path) -> pa.Table:
+    """One row per plan operator of every model, snapshot and test in run_results.
+
+    The operators are those of the statement that built the node during the build:
+    a table's CREATE TABLE AS, or the staging table holding an incremental model's
+    delta or a snapshot's changes. Views and tests run nothing worth profiling, and
+    merges are not broken down, so those nodes get a single row with their dbt
+    run_seconds and no operator.
+    """
+    metadata = run_results["metadata"]
+    rows = []
+    for result in run_results["results"]:
+        node = manifest["nodes"].get(result["unique_id"])
+        if node is None or node["resource_type"] not in PROFILED_RESOURCES:
+            continue
+        node_row = {
+            "build_id": metadata["invocation_id"],
+            "built_at": dt.datetime.fromisoformat(metadata["generated_at"].rstrip("Z")),
+            "unique_id": result["unique_id"],
+            "node_name": node["name"],
+            "resource_type": node["resource_type"],
+            "materialized": node["config"].get("materialized"),
+            "run_status": result["status"],
+            "run_seconds": result["execution_time"],
+        }
+        output = profile_dir / f"{result['unique_id']}.json"
+        if result["status"] in ("error", "skipped") or not output.exists():
+            rows.append(node_row)
+            continue
+        profile = json.loads(output.read_text())
+        node_row |= {
+            "profile_seconds": profile.get("latency"),
+            "peak_buffer_memory_bytes": profile.get("system_peak_buffer_memory"),
+            "spill_bytes": profile.get("system_peak_temp_dir_size"),
+        }
+        rows += [node_row | operator for operator in flatten_operators(profile)]
+    return pa.Table.from_pylist(rows, schema=pa.schema(PROFILE_COLUMNS))
+
+
+def store_profiles(db_path: Path, meta_schema: str, profiles: pa.Table) -> None:
+    conn = duckdb.connect(str(db_path))
+    try:
+        conn.execute(f"create schema if not exists {meta_schema}")
+        conn.execute(
+            f"create table if not exists {meta_schema}.model_profiles as "
+            "select * replace (extra_info::json as extra_info) from profiles limit 0"
+        )
+        # Re-profiling the same build replaces it instead of double counting.
+        build_ids = profiles["build_id"].unique().to_pylist()
+        conn.execute(
+            f"delete from {meta_schema}.model_profiles where build_id in (select unnest(?))",
+            [build_ids],
+        )
+        conn.execute(f"insert into {meta_schema}.model_profiles by name select * from profiles")
+    finally:
+        conn.close()
+
+
+def hottest_operators(conn: duckdb.DuckDBPyConnection, meta_schema: str, top: int) -> list[tuple]:
+    return conn.execute(
+        f"""
+        select
+          node_name,
+          coalesce(cte_name, '') as cte_name,
+          operator_name,
+          coalesce(
+            extra_info->>'Table', extra_info->>'Conditions', extra_info->>'Groups', ''
+          ) as detail,
+          count(distinct build_id) as builds,
+          avg(operator_seconds) as avg_seconds,
+          max(operator_seconds) as max_seconds,
+          avg(operator_cardinality) as avg_rows,
+          max(spill_bytes) as max_spill_bytes
+        from {meta_schema}.model_profiles
+        where operator_name is not null
+        group by all
+        order by avg_seconds desc
+        limit ?
+        """,
+        [top],
+    ).fetchall()
+
+
+def model_trends(
+    conn: duckdb.DuckDBPyConnection, meta_schema: str, builds: int, top: int
+) -> tuple[list, list[tuple]]:
+    """dbt run seconds of the slowest nodes in the latest build, over the last `builds` builds."""
+    recent = conn.execute(
+        f"""
+        select build_id, min(built_at) as built_at
+        from {meta_schema}.model_profiles
+        group by build_id
+        order by built_at desc
+        limit ?
+        """,
+        [builds],
+    ).fetchall()[::-1]
+    if not recent:
+        return [], []
+    rows = conn.execute(
+        f"""
+        with runs as (
+            select distinct build_id, node_name, resource_type, run_seconds
+            from {meta_schema}.model_profiles
+            where build_id in (select unnest(?))
+        )
+        select
+          node_name,
+          resource_type,
+          list(run_seconds order by list_position(?, build_id)) as seconds,
+          list(build_id order by list_position(?, build_id)) as build_ids
+        from runs
+        group by node_name, resource_type
+        order by max(run_seconds) filter (where build_id = ?) desc nulls last
+        limit ?
+        """,
+        [
+            [build_id for build_id, _ in recent],
+            [build_id for build_id, _ in recent],
+            [build_id for build_id, _ in recent],
+            recent[-1][0],
+            top,
+        ],
+    ).fetchall()
+    return recent, rows
+
+
+def print_profile_report(db_path: Path, meta_schema: str, top: int, builds: int) -> None:
+    # Read-write like every other connection here: after a build, dbt-duckdb's
+    # connection is still open in this process and a read-only one would conflict.
+    conn = duckdb.connect(str(db_path))
+    try:
+        operators = hottest_operators(conn, meta_schema, top)
+        recent, trends = model_trends(conn, meta_schema, builds, top)
+    finally:
+        conn.close()
+
+    print("Hottest operators (average over profiled builds)")
+    print(
+        f"{'node':<42} {'cte':<18} {'operator':<16} {'detail':<28} {'builds':>6} "
+        f"{'avg s':>8} {'max s':>8} {'avg rows':>12} {'spill MB':>9}"
+    )
+    for node, cte, operator, detail, count, avg_s, max_s, avg_rows, spill in operators:
+        print(
+            f"{node[:42]:<42} {cte[:18]:<18} {operator[:16]:<16} {detail[:28]:<28} "
+            f"{count:>6} {avg_s:>8.3f} {max_s:>8.3f} {avg_rows or 0:>12,.0f} "
+            f"{(spill or 0) / 1e6:>9.1f}"
+        )
+
+    print(f"\nSlowest nodes in the latest build, dbt seconds over the last {len(recent)} builds")
+    header = " ".join(f"{str(built_at)[5:16]:>12}" for _, built_at in recent)
+    print(f"{'node':<42} {'type':<9} {header}")
+    for node, resource_type, seconds, build_ids in trends:
+        by_build = dict(zip(build_ids, seconds))
+        cells = " ".join(
+            f"{by_build[build_id]:>12.3f}" if build_id in by_build else f"{'-':>12}"
+            for build_id, _ in recent
+        )
+        print(f"{node[:42]:<42} {resource_type:<9} {cells}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Opt-in dbt profiling: run `dbt build` with DuckDB JSON profiling on dbt's own "
+            "connection, load each node's operator timings, cardinalities and spill next "
+            "to the run_results.json timings into meta.model_profiles, and report the "
+            "hottest operators and per-model trends."
+        )
+    )
+    parser.add_argument("--db-path", type=Path, default=Path("warehouse/ramp.duckdb"))
+    parser.add_argument("--select", nargs="*", default=[], help="dbt selection to build.")
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="Build with --full-refresh, so incremental models are profiled as full rebuilds.",
+    )
+    parser.add_argument("--report", action="store_true", help="Only print the report.")
+    parser.add_argument("--meta-schema", default="meta")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--builds", type=int, default=5, help="Builds shown in the trend.")
+    args = parser.parse_args()
+
+    db_path = args.db_path.resolve()
+    if not args.report:
+        os.environ["DBT_DUCKDB_PATH"] = str(db_path)
+        with tempfile.TemporaryDirectory(prefix="dbt_profiles_") as profile_dir:
+            run_dbt_build(args.select, Path(profile_dir), args.full_refresh)
+            run_results, manifest = load_artifacts(PROJECT_DIR / "target")
+            profiles = profile_build(run_results, manifest, Path(profile_dir))
+        store_profiles(db_path, args.meta_schema, profiles)
+        profiled = profiles.filter(pc.is_valid(profiles["operator_name"]))
+        print(
+            f"profiled {len(set(profiled['unique_id'].to_pylist()))} of "
+            f"{len(set(profiles['unique_id'].to_pylist()))} nodes ({profiled.num_rows} operators) "
+            f"into {args.meta_schema}.model_profiles\n"
+        )
+    print_profile_report(db_path, args.meta_schema, args.top, args.builds)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,84 +1,51 @@
 from __future__ import annotations
 
+import hmac
+import json
 import os
-from pathlib import Path
 
 import altair as alt
-import duckdb
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import streamlit as st
 
-DEFAULT_DB_PATH = Path("../warehouse/ramp.duckdb")
-
-
-def get_db_path() -> Path:
-    env_path = os.getenv("RAMP_DUCKDB_PATH")
-    if env_path:
-        return Path(env_path)
-    return DEFAULT_DB_PATH
-
-
-@st.cache_data(ttl=300)
-def load_app_overview(db_path: Path) -> pd.DataFrame:
-    with duckdb.connect(str(db_path)) as conn:
-        return conn.execute(
-            """
-            select
-              org_id,
-              org_name,
-              industry,
-              employee_band,
-              region,
-              app_id,
-              app_name,
-              category,
-              vendor,
-              assigned_seats,
-              active_seats,
-              inactive_seats,
-              utilization_rate,
-              total_spend_12m,
-              avg_monthly_spend_12m,
-              cost_per_active_seat,
-              cohort_utilization_p25,
-              rightsizing_opportunity,
-              over_licensed_flag
-            from analytics.mart_app_overview
-            """
-        ).df()
-
-
-@st.cache_data(ttl=300)
-def load_spend_vs_usage(db_path: Path) -> pd.DataFrame:
-    with duckdb.connect(str(db_path)) as conn:
-        return conn.execute(
-            """
-            select
-              month,
-              org_id,
-              org_name,
-              app_id,
-              app_name,
-              category,
-              total_amount,
-              active_users
-            from analytics.mart_spend_vs_usage
-            """
-        ).df()
-
-
-def apply_filters(df: pd.DataFrame, org: str, app: str, category: str) -> pd.DataFrame:
-    filtered = df
-    if org != "All":
-        filtered = filtered[filtered["org_name"] == org]
-    if app != "All":
-        filtered = filtered[filtered["app_name"] == app]
-    if category != "All":
-        filtered = filtered[filtered["category"] == category]
-    return filtered
-
-
-def main() -> None:
+from ramp_data import (
+    ALL,
+    CURRENCY_COLUMN,
+    EMPTY_KPIS,
+    PERCENT_COLUMN,
+    TRACE_HISTORY_RENDERS,
+    annotate_span,
+    db_file_version,
+    get_db_path,
+    get_trace_log,
+    load_app_overview,
+    load_filter_options,
+    load_in_parallel,
+    load_kpis,
+    load_utilization_trend,
+    render_trace,
+    span,
+)
+
+# Peer groups for the benchmark scatter -> column prefix in mart_app_overview.
+PEER_GROUPS = {
+    "Cohort (all apps)": "cohort",
+    "Same category": "category",
+    "Same app": "app",
+}
+
+
+def drop_nulls(table: pa.Table, columns: list[str]) -> pa.Table:
+    """Arrow counterpart of DataFrame.dropna(subset=columns)."""
+    mask = pc.is_valid(table[columns[0]])
+    for name in columns[1:]:
+        mask = pc.and_(mask, pc.is_valid(table[name]))
+    return table.filter(mask)
+
+
+def render_dashboard() -> None:
     st.set_page_config(page_title="Seat Intelligence", layout="wide")
     st.title("Seat Intelligence Overview")
 
@@ -91,33 +58,58 @@ def main() -> None:
         return
 
     try:
-        app_overview = load_app_overview(db_path)
-        spend_vs_usage = load_spend_vs_usage(db_path)
+        filter_options = load_filter_options(db_path, db_file_version(db_path))
     except Exception as exc:  # pragma: no cover - surface to UI
         st.error(f"Failed to load data: {exc}")
         return
 
-    if app_overview.empty:
+    if filter_options["row_count"] == 0:
         st.warning("No rows found in analytics.mart_app_overview.")
         return
 
     st.sidebar.header("Filters")
-    org_options = ["All"] + sorted(app_overview["org_name"].dropna().unique().tolist())
-    app_options = ["All"] + sorted(app_overview["app_name"].dropna().unique().tolist())
-    category_options = ["All"] + sorted(
-        app_overview["category"].dropna().unique().tolist()
-    )
+    org_options = [ALL] + filter_options["org_name"]
+    app_options = [ALL] + filter_options["app_name"]
+    category_options = [ALL] + filter_options["category"]
 
     selected_org = st.sidebar.selectbox("Organization", org_options)
     selected_app = st.sidebar.selectbox("Application", app_options)
     selected_category = st.sidebar.selectbox("Category", category_options)
+    active_days = filter_options["active_days"]
+    selected_active_days = st.sidebar.selectbox(
+        "Active within",
+        active_days,
+        index=active_days.index(filter_options["default_active_days"]),
+        format_func=lambda days: f"{days} days",
+        help="KPIs and the threshold comparison only; charts use the dbt default.",
+    )
+    annotate_span(
+        org=selected_org,
+        app=selected_app,
+        category=selected_category,
+        active_days=selected_active_days,
+    )
+
+    try:
+        threshold_kpis, filtered_overview, utilization_trend = load_in_parallel(
+            db_path,
+            [load_kpis, load_app_overview, load_utilization_trend],
+            selected_org,
+            selected_app,
+            selected_category,
+        )
+    except Exception as exc:  # pragma: no cover - surface to UI
+        st.error(f"Failed to load data: {exc}")
+        return
 
     with st.expander("How metrics are calculated"):
         st.markdown(
             """
             **Utilization rate** = active seats / assigned seats. A seat is **active**
             when the user has a login or usage event in the last `active_user_days`
-            (defaults to 60 days in dbt).
+            (defaults to 60 days in dbt). The KPIs follow the sidebar's "Active
+            within" threshold (`activity_threshold_days` in dbt); the charts and
+            tables below use `active_user_days`.
 
             **Active seats** = distinct assigned users with recent activity.
 
@@ -133,70 +125,90 @@ def main() -> None:
             × price per seat (requires contract pricing).
 
             **Over‑licensed flag** = utilization below the 25th percentile of the
-            org’s cohort (industry + employee band + region).
+            org’s peer group: its cohort (industry + employee band + region), or the
+            closest of industry + band, industry, or all orgs when the cohort has
+            too few orgs to benchmark against.
             """
         )
 
-    filtered_overview = apply_filters(
-        app_overview, selected_org, selected_app, selected_category
-    )
-    filtered_spend = apply_filters(
-        spend_vs_usage, selected_org, selected_app, selected_category
-    )
-
-    total_spend = filtered_overview["total_spend_12m"].sum()
-    avg_utilization = filtered_overview["utilization_rate"].mean()
-    inactive_seats = filtered_overview["inactive_seats"].sum()
-    rightsizing = filtered_overview["rightsizing_opportunity"].sum()
-
-    kpi_cols = st.columns(4)
-    kpi_cols[0].metric("Total Spend (12m)", f"${total_spend:,.0f}")
-    kpi_cols[1].metric(
-        "Avg Utilization",
-        f"{avg_utilization:.1%}" if pd.notna(avg_utilization) else "—",
-    )
-    kpi_cols[2].metric("Inactive Seats", f"{inactive_seats:,.0f}")
-    kpi_cols[3].metric("Rightsizing Opportunity", f"${rightsizing:,.0f}")
+    kpis = threshold_kpis.get(selected_active_days, EMPTY_KPIS)
+    total_spend = kpis["total_spend"]
+    avg_utilization = kpis["avg_utilization"]
+    inactive_seats = kpis["inactive_seats"]
+    rightsizing = kpis["rightsizing"]
+
+    with span("render.kpis"):
+        kpi_cols = st.columns(4)
+        kpi_cols[0].metric("Total Spend (12m)", f"${total_spend:,.0f}")
+        kpi_cols[1].metric(
+            "Avg Utilization",
+            f"{avg_utilization:.1%}" if pd.notna(avg_utilization) else "—",
+        )
+        kpi_cols[2].metric("Inactive Seats", f"{inactive_seats:,.0f}")
+        kpi_cols[3].metric("Rightsizing Opportunity", f"${rightsizing:,.0f}")
 
-    st.subheader("Top Rightsizing Opportunities")
-    top_rightsizing = (
-        filtered_overview.dropna(subset=["rightsizing_opportunity"])
-        .sort_values("rightsizing_opportunity", ascending=False)
-        .head(10)
-    )
-    top_rightsizing_display = top_rightsizing.copy()
-    top_rightsizing_display["utilization_rate"] = (
-        top_rightsizing_display["utilization_rate"] * 100
-    ).round(1).astype(str) + "%"
-    top_rightsizing_display["rightsizing_opportunity"] = (
-        top_rightsizing_display["rightsizing_opportunity"]
-        .fillna(0)
-        .map(lambda value: f"${value:,.0f}")
-    )
-    st.dataframe(
-        top_rightsizing_display[
+    st.subheader("Activity Threshold Comparison")
+    with span("render.threshold_comparison"):
+        threshold_table = pd.DataFrame(
             [
-                "org_name",
-                "app_name",
-                "category",
-                "inactive_seats",
-                "utilization_rate",
-                "rightsizing_opportunity",
+                {
+                    "active_within_days": days,
+                    "active_seats": row["active_seats"],
+                    "inactive_seats": row["inactive_seats"],
+                    "avg_utilization": row["avg_utilization"],
+                    "rightsizing_opportunity": row["rightsizing"],
+                }
+                for days, row in threshold_kpis.items()
             ]
-        ],
-        use_container_width=True,
-    )
+        )
+        st.dataframe(
+            threshold_table,
+            column_config={
+                "avg_utilization": PERCENT_COLUMN,
+                "rightsizing_opportunity": CURRENCY_COLUMN,
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
+
+    st.subheader("Top Rightsizing Opportunities")
+    with span("transform.top_rightsizing"):
+        top_rightsizing = (
+            drop_nulls(filtered_overview, ["rightsizing_opportunity"])
+            .sort_by([("rightsizing_opportunity", "descending")])
+            .slice(0, 10)
+        )
+    with span("render.top_rightsizing"):
+        st.dataframe(
+            top_rightsizing.select(
+                [
+                    "org_name",
+                    "app_name",
+                    "category",
+                    "inactive_seats",
+                    "utilization_rate",
+                    "rightsizing_opportunity",
+                ]
+            ),
+            column_config={
+                "utilization_rate": PERCENT_COLUMN,
+                "rightsizing_opportunity": CURRENCY_COLUMN,
+            },
+            use_container_width=True,
+        )
 
     st.subheader("Utilization vs Cost per Active Seat")
-    scatter_source = filtered_overview.dropna(
-        subset=[
-            "utilization_rate",
-            "cost_per_active_seat",
-            "total_spend_12m",
-            "category",
-        ]
-    )
-    if scatter_source.empty:
+    with span("transform.scatter"):
+        scatter_source = drop_nulls(
+            filtered_overview,
+            [
+                "utilization_rate",
+                "cost_per_active_seat",
+                "total_spend_12m",
+                "category",
+            ],
+        )
+    if scatter_source.num_rows == 0:
         st.info("No utilization data available for the selected filters.")
     else:
         scatter = (
@@ -229,6 +241,16 @@ def main() -> None:
                         title="Cost per Active Seat",
                         format="$,.0f",
                     ),
+                    alt.Tooltip(
+                        "app_cost_per_active_seat_p50:Q",
+                        title="Peer Median (Same App)",
+                        format="$,.0f",
+                    ),
+                    alt.Tooltip(
+                        "category_cost_per_active_seat_p50:Q",
+                        title="Peer Median (Same Category)",
+                        format="$,.0f",
+                    ),
                     alt.Tooltip(
                         "total_spend_12m:Q",
                         title="Total Spend (12m)",
@@ -238,11 +260,13 @@ def main() -> None:
             )
             .properties(height=380)
         )
-        st.altair_chart(scatter, use_container_width=True)
+        with span("render.scatter", rows=scatter_source.num_rows):
+            st.altair_chart(scatter, use_container_width=True)
 
     st.subheader("Utilization Distribution")
-    utilization_source = filtered_overview.dropna(subset=["utilization_rate"])
-    if utilization_source.empty:
+    with span("transform.utilization_distribution"):
+        utilization_source = drop_nulls(filtered_overview, ["utilization_rate"])
+    if utilization_source.num_rows == 0:
         st.info("No utilization data available for the selected filters.")
     else:
         hist = (
@@ -262,21 +286,28 @@ def main() -> None:
             )
             .properties(height=320)
         )
-        st.altair_chart(hist, use_container_width=True)
+        with span("render.utilization_distribution", rows=utilization_source.num_rows):
+            st.altair_chart(hist, use_container_width=True)
 
     st.subheader("Utilization vs Peer Benchmark (P25)")
-    benchmark_source = filtered_overview.dropna(
-        subset=["utilization_rate", "cohort_utilization_p25", "total_spend_12m"]
-    )
-    if benchmark_source.empty:
+    peer_group = st.radio("Peer group", list(PEER_GROUPS), horizontal=True)
+    peer_p25 = f"{PEER_GROUPS[peer_group]}_utilization_p25"
+    peer_level = f"{PEER_GROUPS[peer_group]}_benchmark_level"
+    with span("transform.peer_benchmark"):
+        benchmark_source = drop_nulls(
+            filtered_overview,
+            ["utilization_rate", peer_p25, "total_spend_12m"],
+        )
+    if benchmark_source.num_rows == 0:
         st.info("No peer benchmark data available for the selected filters.")
     else:
         benchmark = (
             alt.Chart(benchmark_source)
+            .transform_calculate(below_peer_p25=f"datum.utilization_rate < datum.{peer_p25}")
             .mark_circle(opacity=0.75)
             .encode(
                 x=alt.X(
-                    "cohort_utilization_p25:Q",
+                    f"{peer_p25}:Q",
                     title="Peer Utilization (P25)",
                     axis=alt.Axis(format=".0%"),
                 ),
@@ -291,14 +322,15 @@ def main() -> None:
                     scale=alt.Scale(range=[40, 800]),
                 ),
                 color=alt.Color(
-                    "over_licensed_flag:N", title="Over-Licensed", scale=alt.Scale(domain=[False, True], range=["#4C78A8", "#E45756"])
+                    "below_peer_p25:N", title="Over-Licensed", scale=alt.Scale(domain=[False, True], range=["#4C78A8", "#E45756"])
                 ),
                 tooltip=[
                     alt.Tooltip("org_name:N", title="Org"),
                     alt.Tooltip("app_name:N", title="App"),
                     alt.Tooltip("utilization_rate:Q", title="Your Utilization", format=".1%"),
-                    alt.Tooltip("cohort_utilization_p25:Q", title="Peer P25", format=".1%"),
-                    alt.Tooltip("over_licensed_flag:N", title="Over-Licensed"),
+                    alt.Tooltip(f"{peer_p25}:Q", title="Peer P25", format=".1%"),
+                    alt.Tooltip(f"{peer_level}:N", title="Benchmark Level"),
+                    alt.Tooltip("below_peer_p25:N", title="Over-Licensed"),
                     alt.Tooltip("total_spend_12m:Q", title="Total Spend (12m)", format="$,.0f"),
                 ],
             )
@@ -307,41 +339,153 @@ def main() -> None:
         diagonal = alt.Chart(
             pd.DataFrame({"x": [0, 1], "y": [0, 1]})
         ).mark_line(strokeDash=[4, 4], color="#9A9A9A").encode(x="x:Q", y="y:Q")
-        st.altair_chart(benchmark + diagonal, use_container_width=True)
+        with span("render.peer_benchmark", rows=benchmark_source.num_rows):
+            st.altair_chart(benchmark + diagonal, use_container_width=True)
+
+    st.subheader("Utilization Trend")
+    if utilization_trend.num_rows < 2:
+        st.info("The trend fills in as daily snapshots accumulate (`dbt snapshot` or `dbt build`).")
+    else:
+        trend = (
+            alt.Chart(utilization_trend)
+            .mark_line(point=True, color="#4C78A8")
+            .encode(
+                x=alt.X("snapshot_date:T", title="Date"),
+                y=alt.Y(
+                    "utilization_rate:Q",
+                    title="Utilization Rate",
+                    axis=alt.Axis(format=".0%"),
+                ),
+                tooltip=[
+                    alt.Tooltip("snapshot_date:T", title="Date"),
+                    alt.Tooltip("utilization_rate:Q", title="Utilization", format=".1%"),
+                    alt.Tooltip("active_seats:Q", title="Active Seats", format=",.0f"),
+                    alt.Tooltip("assigned_seats:Q", title="Assigned Seats", format=",.0f"),
+                ],
+            )
+            .properties(height=320)
+        )
+        with span("render.utilization_trend", rows=utilization_trend.num_rows):
+            st.altair_chart(trend, use_container_width=True)
 
     st.subheader("App Overview (Filtered)")
-    overview_display = filtered_overview.copy()
-    overview_display["utilization_rate"] = (
-        overview_display["utilization_rate"] * 100
-    ).round(1).astype(str) + "%"
-    overview_display["total_spend_12m"] = (
-        overview_display["total_spend_12m"]
-        .fillna(0)
-        .map(lambda value: f"${value:,.0f}")
+    with span("render.app_overview", rows=filtered_overview.num_rows):
+        st.dataframe(
+            filtered_overview.select(
+                [
+                    "org_name",
+                    "app_name",
+                    "category",
+                    "assigned_seats",
+                    "active_seats",
+                    "inactive_seats",
+                    "utilization_rate",
+                    "total_spend_12m",
+                    "cost_per_active_seat",
+                    "over_licensed_flag",
+                ]
+            ),
+            column_config={
+                "utilization_rate": PERCENT_COLUMN,
+                "total_spend_12m": CURRENCY_COLUMN,
+                "cost_per_active_seat": CURRENCY_COLUMN,
+            },
+            use_container_width=True,
+        )
+
+
+def timing_panel_enabled() -> bool:
+    """Admins open the app with ?admin=<RAMP_ADMIN_TOKEN>; without the env var nobody can."""
+    token = os.getenv("RAMP_ADMIN_TOKEN")
+    supplied = st.query_params.get("admin")
+    return bool(token) and supplied is not None and hmac.compare_digest(supplied, token)
+
+
+def span_depths(spans: list[dict]) -> dict[str, int]:
+    parents = {record["span_id"]: record["parent_span_id"] for record in spans}
+    depths = {}
+    for span_id, parent in parents.items():
+        depth = 0
+        while parent is not None:
+            depth, parent = depth + 1, parents.get(parent)
+        depths[span_id] = depth
+    return depths
+
+
+def render_timing_panel() -> None:
+    renders = [spans for spans in get_trace_log().renders() if spans]
+    st.subheader("Render Timings (admin)")
+    st.caption(
+        f"Spans of the last {len(renders)} renders in this process "
+        f"(up to {TRACE_HISTORY_RENDERS}). Set RAMP_TRACE_PATH to export them as JSON lines."
     )
-    overview_display["cost_per_active_seat"] = (
-        overview_display["cost_per_active_seat"]
-        .fillna(0)
-        .map(lambda value: f"${value:,.0f}")
+    if not renders:
+        return
+    spans = pd.DataFrame(
+        [
+            {
+                "name": record["name"],
+                "duration_ms": record["duration_ms"],
+                "cache_hit": record["attributes"].get("cache_hit"),
+            }
+            for render in renders
+            for record in render
+        ]
     )
+    durations = spans.groupby("name")["duration_ms"]
+    summary = pd.DataFrame(
+        {
+            "calls": durations.size(),
+            "p50_ms": durations.quantile(0.5),
+            "p95_ms": durations.quantile(0.95),
+            "p99_ms": durations.quantile(0.99),
+            "max_ms": durations.max(),
+            "cache_hit_rate": spans.dropna(subset=["cache_hit"])
+            .astype({"cache_hit": float})
+            .groupby("name")["cache_hit"]
+            .mean(),
+        }
+    ).sort_values("p99_ms", ascending=False)
     st.dataframe(
-        overview_display[
+        summary,
+        column_config={"cache_hit_rate": PERCENT_COLUMN},
+        use_container_width=True,
+    )
+
+    # Waterfall of the slowest render: where did the p99 outlier spend its time?
+    slowest = max(
+        renders,
+        key=lambda render: max(
+            record["duration_ms"] for record in render if record["parent_span_id"] is None
+        ),
+    )
+    started = min(record["start_time_unix_nano"] for record in slowest)
+    depths = span_depths(slowest)
+    st.markdown("**Slowest render**")
+    st.dataframe(
+        pd.DataFrame(
             [
-                "org_name",
-                "app_name",
-                "category",
-                "assigned_seats",
-                "active_seats",
-                "inactive_seats",
-                "utilization_rate",
-                "total_spend_12m",
-                "cost_per_active_seat",
-                "over_licensed_flag",
+                {
+                    "span": "    " * depths[record["span_id"]] + record["name"],
+                    "offset_ms": (record["start_time_unix_nano"] - started) / 1e6,
+                    "duration_ms": record["duration_ms"],
+                    "status": record["status"]["code"],
+                    "attributes": json.dumps(record["attributes"], default=str),
+                }
+                for record in sorted(slowest, key=lambda record: record["start_time_unix_nano"])
             ]
-        ],
+        ),
+        hide_index=True,
         use_container_width=True,
     )
 
 
+def main() -> None:
+    with render_trace("streamlit_app.main"):
+        render_dashboard()
+    if timing_panel_enabled():
+        render_timing_panel()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import duckdb
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts"))
+
+from ingest_raw_to_duckdb import ingest_csvs
+
+ORGS_HEADER = "org_id,org_name,industry,employee_count,employee_band,region,created_at\n"
+
+
+class ShardedCsvIngestTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.raw_dir = self.tmp / "raw"
+        self.raw_dir.mkdir()
+        self.db_path = self.tmp / "ramp.duckdb"
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def load_orgs(self, mode: str = "full") -> list[tuple]:
+        ingest_csvs(
+            raw_dir=self.raw_dir, db_path=self.db_path, schema="raw", workers=1, mode=mode
+        )
+        with duckdb.connect(str(self.db_path), read_only=True) as conn:
+            return conn.execute(
+                "SELECT org_id, org_name, industry, employee_count FROM raw.raw_orgs ORDER BY org_id"
+            ).fetchall()
+
+    def test_quoted_commas_only_in_later_shard(self) -> None:
+        (self.raw_dir / "raw_orgs_00000.csv").write_text(
+            ORGS_HEADER + "org_0001,Acme Corp,Media,120,51-200,NA,2024-01-05 09:00:00\n"
+        )
+        (self.raw_dir / "raw_orgs_00001.csv").write_text(
+            ORGS_HEADER
+            + 'org_0002,"Boone, Green and Jones",Media,40,1-50,EMEA,2024-02-01 10:30:00\n'
+            + 'org_0003,"Lee ""Labs"", Inc",Fintech,800,501-1000,APAC,2024-03-01 08:00:00\n'
+        )
+
+        self.assertEqual(
+            self.load_orgs(),
+            [
+                ("org_0001", "Acme Corp", "Media", 120),
+                ("org_0002", "Boone, Green and Jones", "Media", 40),
+                ("org_0003", 'Lee "Labs", Inc', "Fintech", 800),
+            ],
+        )
+
+    def test_columns_follow_header_names(self) -> None:
+        (self.raw_dir / "raw_orgs_00000.csv").write_text(
+            ORGS_HEADER + "org_0001,Acme Corp,Media,120,51-200,NA,2024-01-05 09:00:00\n"
+        )
+        (self.raw_dir / "raw_orgs_00001.csv").write_text(
+            "industry,org_id,employee_count,org_name,employee_band,region,created_at\n"
+            "Retail,org_0002,75,Bolt,51-200,NA,2024-02-01 10:30:00\n"
+        )
+
+        self.assertEqual(
+            self.load_orgs(),
+            [
+                ("org_0001", "Acme Corp", "Media", 120),
+                ("org_0002", "Bolt", "Retail", 75),
+            ],
+        )
+
+    def test_incremental_keeps_last_file_row_per_key(self) -> None:
+        (self.raw_dir / "raw_orgs_00000.csv").write_text(
+            ORGS_HEADER + "org_0001,Acme Corp,Media,120,51-200,NA,2024-01-05 09:00:00\n"
+        )
+        self.load_orgs(mode="incremental")
+
+        (self.raw_dir / "raw_orgs_00001.csv").write_text(
+            ORGS_HEADER + "org_0002,Bolt,Retail,75,51-200,NA,2024-02-01 10:30:00\n"
+        )
+        (self.raw_dir / "raw_orgs_00002.csv").write_text(
+            ORGS_HEADER + "org_0002,Bolt Inc,Retail,90,51-200,NA,2024-02-01 10:30:00\n"
+        )
+
+        self.assertEqual(
+            self.load_orgs(mode="incremental"),
+            [
+                ("org_0001", "Acme Corp", "Media", 120),
+                ("org_0002", "Bolt Inc", "Retail", 90),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()